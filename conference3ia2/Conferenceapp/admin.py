@@ -1,20 +1,54 @@
-from django.contrib import admin
-from .models import Conference, Submission, Organizingcommitee
+import io
 
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.template.loader import render_to_string
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
+from .models import Conference, Submission, Organizingcommitee, SubmissionHistory
+from .admin_tools import AutocompleteListFilter, FastChangelistMixin
+from .pagination import KeysetPaginator, InvalidCursor
+from .forms import CsvImportForm
+from .stats import get_stats
+from . import exports
+from . import imports
+from . import search
+from . import transitions
 
-# --- Inline pour afficher les soumissions liées à une conférence ---
-class SubmissionStackedInline(admin.StackedInline):
-    model = Submission
-    extra = 0  # ne pas afficher de lignes vides supplémentaires
-    fields = ("submission_id", "title", "abstract", "user", "status", "payed", "submission_date")
-    readonly_fields = ("submission_id", "submission_date")  # champs en lecture seule
+# Erreurs d'import affichées dans la page (toutes restent dans le message de la commande import_csv)
+ADMIN_IMPORT_MAX_ERRORS = 200
+
+
+# --- Inline (lecture seule) pour l'historique des changements d'une soumission ---
+class SubmissionHistoryInline(admin.TabularInline):
+    model = SubmissionHistory
+    extra = 0
+    fields = ("changed_at", "field", "old_value", "new_value", "changed_by")
+    readonly_fields = fields
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+# --- Filtre par conférence en saisie semi-automatique (pas de liste de toutes les conférences) ---
+class ConferenceFilter(AutocompleteListFilter):
+    title = "conference"
+    field_name = "conference"
 
 
 # --- Admin pour le modèle Conference ---
 @admin.register(Conference)
-class ConferenceAdmin(admin.ModelAdmin):
+class ConferenceAdmin(FastChangelistMixin, admin.ModelAdmin):
     # Colonnes affichées dans la liste
-    list_display = ("name", "theme", "location", "start_date", "end_date", "duration")
+    list_display = ("name", "theme", "location", "start_date", "end_date", "duration", "submission_count", "paid_ratio")
+    list_select_related = ("stats",)
+    list_only_fields = (
+        "conference_id", "name", "theme", "location", "start_date", "end_date", "stats__submissions", "stats__payed",
+    )
 
     # Méthode pour calculer la durée (en jours)
     def duration(self, obj):
@@ -23,12 +57,35 @@ class ConferenceAdmin(admin.ModelAdmin):
         return "-"
     duration.short_description = "Durée (jours)"
 
+    # Statistiques précalculées (voir stats.py) : une ligne jointe, pas d'agrégat
+    def submission_count(self, obj):
+        return get_stats(obj).submissions
+    submission_count.short_description = "Soumissions"
+
+    def paid_ratio(self, obj):
+        return f"{get_stats(obj).paid_ratio:.0%}"
+    paid_ratio.short_description = "Payées"
+
+    def statistics(self, obj):
+        if obj is None or obj.pk is None:
+            return "-"
+        return render_to_string("admin/Conferenceapp/conference/statistics.html", {
+            "stats": get_stats(obj),
+            "sessions_per_day": obj.day_stats.filter(sessions__gt=0),
+        })
+    statistics.short_description = "Statistiques"
+
     # Filtres
     list_filter = ("theme", "location", "start_date")
 
-    # Recherche
+    # Recherche (index FTS5 si disponible, sinon LIKE sur search_fields)
     search_fields = ("name", "description", "location")
 
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and search.fts_available() and search.build_match_query(search_term):
+            return search.filter_conferences(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
     # Organisation du formulaire
     fieldsets = (
         ("Informations générales", {
@@ -37,19 +94,106 @@ class ConferenceAdmin(admin.ModelAdmin):
         ("Logistique", {
             "fields": ("location", "start_date", "end_date")
         }),
+        ("Soumissions", {
+            "fields": ("daily_submission_limit", "statistics", "submissions_panel")
+        }),
     )
+    readonly_fields = ("statistics", "submissions_panel")
 
     # Ordre et navigation par date
     ordering = ("start_date",)
     date_hierarchy = "start_date"
 
-    # Ajout de l'inline pour les soumissions
-    inlines = [SubmissionStackedInline]
+    # Construction du programme (voir Sessionapp/scheduler.py)
+    actions = ["schedule_program"]
+
+    def schedule_program(self, request, queryset):
+        from Sessionapp.scheduler import schedule_conference
+        for conference in queryset.order_by("start_date"):
+            plan = schedule_conference(conference)
+            level = messages.WARNING if plan.unscheduled else messages.SUCCESS
+            self.message_user(request, f"{conference.name} : {plan}.", level)
+    schedule_program.short_description = "Construire le programme (sessions) à partir des soumissions acceptées"
+
+    # Soumissions de la conférence : au lieu d'un inline qui affichait toutes les
+    # soumissions en formulaires, un tableau en lecture seule chargé page par page
+    # après l'ouverture de la fiche (coût constant quel que soit leur nombre).
+    def submissions_panel(self, obj):
+        if obj is None or obj.pk is None:
+            return "-"
+        url = reverse("admin:Conferenceapp_conference_submissions", args=[obj.pk])
+        return render_to_string("admin/Conferenceapp/conference/submissions_panel.html", {"url": url})
+    submissions_panel.short_description = "Soumissions"
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<path:object_id>/submissions/",
+                self.admin_site.admin_view(self.submissions_view),
+                name="Conferenceapp_conference_submissions",
+            ),
+            path("import/", self.admin_site.admin_view(self.import_view), name="Conferenceapp_conference_import"),
+        ]
+        return urls + super().get_urls()
+
+    # Import CSV de conférences, sessions ou utilisateurs (voir imports.py)
+    def import_view(self, request):
+        report = None
+        form = CsvImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            kind = form.cleaned_data["kind"]
+            opts = imports.IMPORTERS[kind].model._meta
+            if not request.user.has_perm(f"{opts.app_label}.add_{opts.model_name}"):
+                raise PermissionDenied
+            stream = io.TextIOWrapper(form.cleaned_data["file"].file, encoding="utf-8-sig", newline="")
+            try:
+                report = imports.import_csv(
+                    stream, kind, partial=form.cleaned_data["partial"], dry_run=form.cleaned_data["dry_run"]
+                )
+            except UnicodeDecodeError:
+                form.add_error("file", "Le fichier doit être encodé en UTF-8.")
+            else:
+                self.message_user(
+                    request, f"Import : {report}.", messages.WARNING if report.errors else messages.SUCCESS
+                )
+        return TemplateResponse(request, "admin/Conferenceapp/conference/import.html", {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Importer un fichier CSV",
+            "form": form,
+            "report": report,
+            "errors": report.errors[:ADMIN_IMPORT_MAX_ERRORS] if report else [],
+            "hidden_errors": max(len(report.errors) - ADMIN_IMPORT_MAX_ERRORS, 0) if report else 0,
+        })
+
+    def submissions_view(self, request, object_id):
+        conference = self.get_object(request, object_id)
+        if conference is None:
+            raise Http404("Conférence introuvable.")
+        if not self.has_view_or_change_permission(request, conference):
+            raise PermissionDenied
+        # Uniquement les colonnes affichées, auteur joint, une page à la fois
+        queryset = (
+            Submission.objects.filter(conference=conference)
+            .select_related("user")
+            .only("submission_id", "title", "status", "payed", "submission_date", "user__username")
+        )
+        paginator = KeysetPaginator(
+            queryset, getattr(settings, "ADMIN_INLINE_PAGE_SIZE", 25), ordering=("submission_date", "submission_id")
+        )
+        try:
+            page = paginator.get_page(after=request.GET.get("after"), before=request.GET.get("before"))
+        except InvalidCursor:
+            raise Http404("Page invalide.")
+        return TemplateResponse(request, "admin/Conferenceapp/conference/submissions_page.html", {
+            "page": page,
+            "base_url": request.path,
+        })
 
 
 # --- Admin pour le modèle Submission ---
 @admin.register(Submission)
-class SubmissionAdmin(admin.ModelAdmin):
+class SubmissionAdmin(FastChangelistMixin, admin.ModelAdmin):
     list_display = (
         "title",
         "status",
@@ -60,12 +204,28 @@ class SubmissionAdmin(admin.ModelAdmin):
         "short_abstract",
     )
 
+    # Auteur et conférence joints, seules les colonnes affichées sont chargées
+    list_select_related = ("user", "conference")
+    list_only_fields = (
+        "submission_id", "title", "status", "submission_date", "payed", "abstract",
+        "user__username", "conference__name",
+    )
+
     # Filtres et recherche
-    list_filter = ("status", "payed", "conference", "submission_date")
+    list_filter = ("status", "payed", ConferenceFilter, "submission_date")
     search_fields = ("title", "keywords", "user__username")
 
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and search.fts_available() and search.build_match_query(search_term):
+            return search.filter_submissions(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
+    # Listes déroulantes remplacées par la saisie semi-automatique
+    autocomplete_fields = ("user", "conference")
+    raw_id_fields = ("session",)
+
     # Lecture seule pour certains champs
-    readonly_fields = ("submission_id", "submission_date", "created_at", "updated_at")
+    readonly_fields = ("submission_id", "submission_date", "created_at", "updated_at", "paper_pages", "paper_thumbnail")
 
     # Organisation du formulaire par sections
     fieldsets = (
@@ -73,25 +233,75 @@ class SubmissionAdmin(admin.ModelAdmin):
             "fields": ("submission_id", "title", "abstract", "keywords")
         }),
         ("Fichier et conférence", {
-            "fields": ("paper", "conference")
+            "fields": ("paper", "paper_pages", "paper_thumbnail", "conference", "session")
         }),
         ("Suivi", {
             "fields": ("status", "payed", "submission_date", "user")
         }),
     )
 
+    # Historique des changements d'état
+    inlines = [SubmissionHistoryInline]
+
     # Actions personnalisées
-    actions = ["mark_as_payed", "accept_submissions"]
+    actions = [
+        "mark_as_payed", "mark_under_review", "accept_submissions", "reject_submissions", "export_csv", "export_jsonl",
+    ]
+
+    # Le comité n'est pas soumis au quota journalier (le compteur est tout de même tenu à jour)
+    def save_model(self, request, obj, form, change):
+        obj.save(check_quota=False)
+
+    # Méthodes d'action : traitement par lots, historisé (voir transitions.py)
+    def _report(self, request, report, label):
+        level = messages.SUCCESS if report.changed else messages.WARNING
+        text = f"{label} : {report}."
+        if report.skipped:
+            text += " Les soumissions ignorées n'étaient pas dans un état permettant ce changement."
+        self.message_user(request, text, level)
 
-    # Méthodes d'action
     def mark_as_payed(self, request, queryset):
-        queryset.update(payed=True)
+        self._report(request, transitions.mark_payed(queryset, user=request.user), "Paiement")
     mark_as_payed.short_description = "Marquer les soumissions sélectionnées comme payées"
 
+    def mark_under_review(self, request, queryset):
+        self._report(request, transitions.transition_status(queryset, "under review", user=request.user), "Mise en évaluation")
+    mark_under_review.short_description = "Passer les soumissions sélectionnées en évaluation"
+
     def accept_submissions(self, request, queryset):
-        queryset.update(status="accepted")
+        self._report(request, transitions.transition_status(queryset, "accepted", user=request.user), "Acceptation")
     accept_submissions.short_description = "Accepter les soumissions sélectionnées"
 
+    def reject_submissions(self, request, queryset):
+        self._report(request, transitions.transition_status(queryset, "rejected", user=request.user), "Refus")
+    reject_submissions.short_description = "Refuser les soumissions sélectionnées"
+
+    # Export en flux de la sélection (voir exports.py)
+    def export_csv(self, request, queryset):
+        return exports.export_response(queryset, "csv")
+    export_csv.short_description = "Exporter les soumissions sélectionnées (CSV)"
+
+    def export_jsonl(self, request, queryset):
+        return exports.export_response(queryset, "jsonl")
+    export_jsonl.short_description = "Exporter les soumissions sélectionnées (JSON lines)"
+
+    # Résultats de l'analyse de l'article (calculés en tâche de fond)
+    def paper_pages(self, obj):
+        analysis = getattr(obj, "analysis", None)
+        if analysis is None or analysis.status == "pending":
+            return "En cours d'analyse"
+        if analysis.status == "failed":
+            return f"Échec : {analysis.error}"
+        return analysis.pages
+    paper_pages.short_description = "Pages"
+
+    def paper_thumbnail(self, obj):
+        analysis = getattr(obj, "analysis", None)
+        if analysis is None or not analysis.thumbnail:
+            return "-"
+        return format_html('<img src="{}" width="150">', reverse("submission_thumbnail", args=[obj.pk]))
+    paper_thumbnail.short_description = "Première page"
+
     # Méthode pour tronquer l'abstract
     def short_abstract(self, obj):
         return obj.abstract[:50] + "..." if len(obj.abstract) > 50 else obj.abstract
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+# -----------------------------
+# Listes de l'administration à coût constant
+# -----------------------------
+# - comptage exact plafonné à ADMIN_EXACT_COUNT_LIMIT lignes, estimation au-delà
+# - pas de second COUNT(*) pour le total non filtré (show_full_result_count)
+# - uniquement les colonnes affichées (list_only_fields) et clés étrangères jointes
+# - filtres sur clé étrangère en saisie semi-automatique : la barre latérale ne
+#   charge plus toutes les lignes de la table liée
+
+
+def estimate_row_count(model, using="default"):
+    """
+    Nombre approximatif de lignes d'une table, lu dans les statistiques du
+    SGBD (None si indisponible). Sous SQLite, MAX(rowid) : une lecture d'index.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    quoted = connection.ops.quote_name(table)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [quoted])
+        elif connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            cursor.execute(f"SELECT MAX(rowid) FROM {quoted}")
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Compte exactement jusqu'au seuil (COUNT sur une sous-requête limitée, donc
+    borné), puis se contente d'une estimation : le numéro des dernières pages
+    peut être approximatif sur une très grande table, jamais le contenu d'une page.
+    """
+
+    @cached_property
+    def count(self):
+        threshold = getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10_000)
+        queryset = self.object_list
+        capped = queryset[: threshold + 1].count()
+        if capped <= threshold:
+            return capped
+        estimate = None
+        if not queryset.query.where:
+            # Liste non filtrée : les statistiques de la table font l'affaire
+            estimate = estimate_row_count(queryset.model, queryset.db)
+        return max(estimate or 0, capped)
+
+
+class FastChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        only = self.model_admin.get_list_only_fields(request)
+        return queryset.only(*only) if only else queryset
+
+
+class FastChangelistMixin:
+    """
+    Réglages communs aux listes volumineuses de l'administration.
+    ``list_only_fields`` : colonnes chargées pour la liste (la fiche détaillée
+    charge toujours l'objet complet).
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_only_fields = ()
+
+    def get_list_only_fields(self, request):
+        return self.list_only_fields
+
+    def get_changelist(self, request, **kwargs):
+        return FastChangeList
+
+
+class AutocompleteListFilter(admin.SimpleListFilter):
+    """
+    Filtre sur clé étrangère sans liste de choix : seule la valeur sélectionnée
+    est chargée, les autres sont proposées à la saisie via la vue
+    d'autocomplétion de l'administration (le ModelAdmin lié doit définir
+    search_fields). Sous-classer en renseignant ``title`` et ``field_name``.
+    """
+
+    template = "admin/Conferenceapp/autocomplete_filter.html"
+    field_name = None
+
+    def __init__(self, request, params, model, model_admin):
+        self.parameter_name = f"{self.field_name}__pk__exact"
+        self.field = model._meta.get_field(self.field_name)
+        self.app_label = model._meta.app_label
+        self.model_name = model._meta.model_name
+        super().__init__(request, params, model, model_admin)
+
+    def has_output(self):
+        return True
+
+    def lookups(self, request, model_admin):
+        value = self.value()
+        if not value:
+            return []
+        remote = self.field.remote_field.model._default_manager.filter(pk=value).first()
+        return [(value, str(remote) if remote is not None else value)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
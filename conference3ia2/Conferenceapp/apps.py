@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ConferenceappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Conferenceapp'
+
+    def ready(self):
+        # Enregistrement des signaux (index de recherche, ...)
+        from . import signals  # noqa: F401
@@ -0,0 +1,168 @@
+import hashlib
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+# -----------------------------
+# Requêtes conditionnelles (ETag / Last-Modified)
+# -----------------------------
+# Les validateurs sont calculés par une seule requête d'agrégat sur les lignes
+# affichées : MAX(updated_at) (et des tables jointes dont dépend la page) et
+# COUNT(*), qui change quand une ligne d'une liste est supprimée. Si le client
+# a déjà cette version (If-None-Match / If-Modified-Since), la réponse est un
+# 304 sans rendu ni autre requête. L'ETag dépend aussi de l'utilisateur : les
+# pages affichent son nom et ses droits.
+# Listes paginées de l'API : pas d'agrégat sur toute la sélection à chaque
+# page ; les validateurs viennent des lignes de la page, lues de toute façon
+# (identifiants, horodatages et liens vers les pages voisines).
+
+
+def compute_validators(queryset, fields, *extra):
+    """
+    (etag, last_modified en secondes) pour les lignes de ``queryset`` ;
+    (None, None) si aucune ligne (la vue répondra normalement, 404 compris).
+    """
+    aggregates = {f"last_{index}": Max(field) for index, field in enumerate(fields)}
+    row = queryset.order_by().aggregate(count=Count("pk"), **aggregates)
+    count = row.pop("count")
+    stamps = [value for value in row.values() if value is not None]
+    if not count and not stamps:
+        return None, None
+    last_modified = max(stamps) if stamps else None
+    parts = [count, *(value.isoformat() if value else "-" for value in row.values()), *extra]
+    return _etag(parts), int(last_modified.timestamp()) if last_modified else None
+
+
+def _path_value(obj, path):
+    # "conference__updated_at" : l'objet joint doit avoir été chargé (select_related)
+    return reduce(lambda value, name: getattr(value, name, None), path.split("__"), obj)
+
+
+def compute_row_validators(rows, fields, *extra):
+    """Comme compute_validators, pour des objets déjà chargés (aucune requête)."""
+    if not rows:
+        return None, None
+    values = [[_path_value(row, field) for field in fields] for row in rows]
+    stamps = [value for row in values for value in row if value is not None]
+    last_modified = max(stamps) if stamps else None
+    parts = [
+        [(row.pk, *(value.isoformat() if value else "-" for value in row_values)) for row, row_values in zip(rows, values)],
+        *extra,
+    ]
+    return _etag(parts), int(last_modified.timestamp()) if last_modified else None
+
+
+def validators_from_stamp(stamp_ns, *extra):
+    """Validateurs tirés d'un numéro de version horodaté (fragments.py) : aucune requête."""
+    return _etag([stamp_ns, *extra]), stamp_ns // 1_000_000_000
+
+
+def _etag(parts):
+    return quote_etag(hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest())
+
+
+class ValidatorsMixin:
+    # Champs dont le maximum date la page (chemins ORM acceptés : "conference__updated_at")
+    conditional_fields = ("updated_at",)
+
+    def get_etag_extra(self):
+        return [self.request.user.pk, self.request.get_full_path()]
+
+    def get_validators(self, queryset):
+        return compute_validators(queryset, self.conditional_fields, *self.get_etag_extra())
+
+    def not_modified_response(self, request, validators):
+        """Réponse 304 si le client est à jour ; mémorise sinon les validateurs à émettre."""
+        self._etag, self._last_modified = validators
+        if self._etag is None:
+            return None
+        return get_conditional_response(request, etag=self._etag, last_modified=self._last_modified)
+
+    def add_validators(self, response):
+        if getattr(self, "_etag", None) and response.status_code == 200:
+            response.headers.setdefault("ETag", self._etag)
+            if self._last_modified and not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(self._last_modified)
+            # Le client garde la page mais revalide à chaque affichage
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ConditionalGetMixin(ValidatorsMixin):
+    """
+    Pour les vues génériques de Django (DetailView par défaut : la ligne
+    désignée par l'URL, filtrée par get_queryset, donc par les droits de la vue).
+    """
+
+    def get_conditional_validators(self):
+        return self.get_validators(self.get_conditional_queryset())
+
+    def get_conditional_queryset(self):
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        if pk is not None:
+            return queryset.filter(pk=pk)
+        return queryset.filter(**{self.get_slug_field(): self.kwargs.get(self.slug_url_kwarg)})
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        not_modified = self.not_modified_response(request, self.get_conditional_validators())
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(super().dispatch(request, *args, **kwargs))
+
+
+class ConditionalViewSetMixin(ValidatorsMixin):
+    """
+    Pour les ModelViewSet de DRF : list (lignes de la page si la liste est
+    paginée, MAX sur la sélection filtrée sinon) et retrieve. Le contrôle a
+    lieu après l'authentification et les permissions.
+    """
+
+    def get_etag_extra(self):
+        # Même ressource, représentations différentes (JSON, API navigable)
+        return [*super().get_etag_extra(), self.request.accepted_renderer.format]
+
+    def get_page_validators(self, page):
+        # Les liens changent si une page voisine apparaît ou disparaît
+        links = [self.paginator.get_next_link(), self.paginator.get_previous_link()]
+        return compute_row_validators(page, self.conditional_fields, *links, *self.get_etag_extra())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is None:
+            not_modified = self.not_modified_response(request, self.get_validators(queryset))
+            if not_modified is not None:
+                return not_modified
+            return self.add_validators(super().list(request, *args, **kwargs))
+
+        page = self.paginate_queryset(queryset)
+        not_modified = self.not_modified_response(request, self.get_page_validators(page))
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(page, many=True)
+        return self.add_validators(self.get_paginated_response(serializer.data))
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+            not_modified = self.not_modified_response(request, self.get_validators(queryset))
+        except (TypeError, ValueError, ValidationError):
+            # Identifiant mal formé : get_object() répondra 404
+            not_modified = None
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(super().retrieve(request, *args, **kwargs))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ("Authorization",))
+        return response
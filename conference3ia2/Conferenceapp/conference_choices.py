@@ -0,0 +1,64 @@
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .fragments import list_version
+from .models import Conference
+from . import search
+
+
+# -----------------------------
+# Conférences ouvertes aux soumissions
+# -----------------------------
+# Les choix du champ "conférence" du formulaire de soumission sont mis en
+# cache sous une clé qui contient la date du jour (une conférence terminée
+# disparaît au changement de jour) et la version de la liste des conférences
+# (changée à chaque enregistrement/suppression, voir fragments.py).
+# Au-delà de OPEN_CONFERENCES_SELECT_LIMIT conférences, le formulaire affiche
+# une saisie semi-automatique alimentée par open_conferences_lookup().
+
+def open_conferences():
+    return Conference.objects.filter(end_date__gte=date.today())
+
+
+def _seconds_until_midnight():
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def _select_limit():
+    return getattr(settings, "OPEN_CONFERENCES_SELECT_LIMIT", 200)
+
+
+def open_conference_choices():
+    """
+    Couples (conference_id, nom) des conférences ouvertes, triés par date de début.
+
+    Au plus OPEN_CONFERENCES_SELECT_LIMIT + 1 couples : une conférence de trop
+    suffit à savoir que la liste déroulante est abandonnée (use_autocomplete),
+    ni la requête ni l'entrée du cache ne grossissent avec le nombre de conférences.
+    """
+    limit = _select_limit()
+    key = f"conferences:open:{date.today().isoformat()}:{limit}:{list_version()}"
+    choices = cache.get(key)
+    if choices is None:
+        queryset = open_conferences().order_by("start_date", "conference_id").values_list("pk", "name")
+        choices = list(queryset[:limit + 1])
+        cache.set(key, choices, _seconds_until_midnight())
+    return choices
+
+
+def use_autocomplete(choices):
+    return len(choices) > _select_limit()
+
+
+def open_conferences_lookup(terms, limit=20):
+    """Conférences ouvertes correspondant à ``terms`` (les premières à venir si vide)."""
+    queryset = open_conferences()
+    if search.build_match_query(terms):
+        queryset = search.search_conferences(terms, queryset=queryset, limit=limit)
+    else:
+        queryset = queryset.order_by("start_date", "conference_id")[:limit]
+    return [{"id": pk, "text": name} for pk, name in queryset.values_list("pk", "name")]
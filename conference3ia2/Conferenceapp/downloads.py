@@ -0,0 +1,120 @@
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+from .storage import digest_from_name
+
+
+# -----------------------------
+# Téléchargement des articles
+# -----------------------------
+# Réponse conditionnelle (ETag / If-None-Match), requêtes partielles (Range)
+# et, en production, délégation de l'envoi au serveur web frontal :
+#   PAPER_SENDFILE = "x-sendfile"       -> en-tête X-Sendfile (Apache mod_xsendfile)
+#   PAPER_SENDFILE = "x-accel-redirect" -> en-tête X-Accel-Redirect (nginx),
+#       chemin interne PAPER_SENDFILE_PREFIX + nom du fichier
+# Dans tous les cas le fichier n'est jamais chargé entier en mémoire.
+# Les vignettes (PaperAnalysis.thumbnail) passent par le même chemin.
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOCK_SIZE = 64 * 1024
+
+
+def paper_etag(fieldfile, stat):
+    # Stockage adressé par contenu : l'empreinte est un ETag fort tout trouvé
+    digest = digest_from_name(fieldfile.name)
+    if digest:
+        return quote_etag(digest)
+    return quote_etag(f"{stat.st_size:x}-{int(stat.st_mtime):x}")
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def parse_range(header, size):
+    """(début, fin incluse) pour un en-tête ``Range`` simple, None s'il est absent ou ignoré."""
+    match = RANGE_RE.match(header or "")
+    if not match or size == 0:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-500 : les 500 derniers octets
+        length = int(end)
+        if length == 0:
+            raise ValueError("Plage vide")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError("Plage hors du fichier")
+    return start, end
+
+
+def _iter_range(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = f.read(min(BLOCK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def serve_paper(request, fieldfile, filename=None, content_type="application/pdf"):
+    path = fieldfile.path
+    stat = os.stat(path)
+    etag = paper_etag(fieldfile, stat)
+    filename = filename or os.path.basename(fieldfile.name)
+
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    offload = getattr(settings, "PAPER_SENDFILE", None)
+    if offload:
+        # Le serveur frontal envoie le fichier et gère lui-même les Range
+        response = HttpResponse(content_type=content_type)
+        if offload == "x-accel-redirect":
+            prefix = getattr(settings, "PAPER_SENDFILE_PREFIX", "/protected-media/")
+            response["X-Accel-Redirect"] = prefix + fieldfile.name
+        else:
+            response["X-Sendfile"] = path
+    else:
+        byte_range = None
+        if_range = request.headers.get("If-Range")
+        if not if_range or if_range == etag:
+            try:
+                byte_range = parse_range(request.headers.get("Range"), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.st_size}"
+                return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(_iter_range(path, start, end), status=206, content_type=content_type)
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = "private, max-age=0, must-revalidate"
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    return response
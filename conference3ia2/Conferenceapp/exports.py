@@ -0,0 +1,98 @@
+import csv
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+
+# -----------------------------
+# Export des soumissions (CSV / JSON lines)
+# -----------------------------
+# Les lignes sont lues par paquets (QuerySet.iterator) en une seule requête
+# jointe sur la conférence et l'auteur, puis écrites au fil de l'eau : la
+# mémoire utilisée ne dépend pas du nombre de soumissions et le premier
+# octet part dès le premier paquet lu.
+
+EXPORT_FIELDS = [
+    ("submission_id", "submission_id"),
+    ("title", "title"),
+    ("status", "status"),
+    ("payed", "payed"),
+    ("submission_date", "submission_date"),
+    ("keywords", "keywords"),
+    ("abstract", "abstract"),
+    ("conference_id", "conference_id"),
+    ("conference", "conference__name"),
+    ("conference_start_date", "conference__start_date"),
+    ("username", "user__username"),
+    ("first_name", "user__first_name"),
+    ("last_name", "user__last_name"),
+    ("email", "user__email"),
+    ("affiliation", "user__affiliation"),
+]
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+}
+
+
+class Echo:
+    """Pseudo-fichier pour csv.writer : renvoie la ligne au lieu de l'écrire."""
+
+    def write(self, value):
+        return value
+
+
+def _chunk_size():
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def export_rows(queryset):
+    """Tuples des colonnes EXPORT_FIELDS, lus par paquets."""
+    return (
+        queryset.order_by("conference_id", "submission_date", "submission_id")
+        .values_list(*(path for _, path in EXPORT_FIELDS))
+        .iterator(chunk_size=_chunk_size())
+    )
+
+
+# Une cellule commençant par = + - @ serait interprétée comme formule par les
+# tableurs ; tabulation et retour chariot en tête aussi (ignorés avant le =)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _safe_cell(value):
+    if isinstance(value, str) and value[:1] in FORMULA_PREFIXES:
+        return "'" + value
+    return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield "\ufeff" + writer.writerow([header for header, _ in EXPORT_FIELDS])  # BOM pour Excel
+    for row in rows:
+        yield writer.writerow([_safe_cell(value) for value in row])
+
+
+def iter_jsonl(rows):
+    headers = [header for header, _ in EXPORT_FIELDS]
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), default=str, ensure_ascii=False) + "\n"
+
+
+def iter_export(queryset, fmt="csv"):
+    if fmt not in FORMATS:
+        raise ValueError(f"Format d'export inconnu : {fmt}")
+    rows = export_rows(queryset)
+    return iter_csv(rows) if fmt == "csv" else iter_jsonl(rows)
+
+
+def export_response(queryset, fmt="csv", filename="submissions"):
+    """Réponse HTTP diffusée en flux (StreamingHttpResponse)."""
+    content_type, extension = FORMATS[fmt]
+    response = StreamingHttpResponse(iter_export(queryset, fmt), content_type=content_type)
+    response["Content-Disposition"] = content_disposition_header(True, f"{filename}.{extension}")
+    # Pas de mise en tampon par nginx : les lignes partent au fil de l'eau
+    response["X-Accel-Buffering"] = "no"
+    return response
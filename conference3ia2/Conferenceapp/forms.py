@@ -1,5 +1,8 @@
 from django import forms
-from .models import Conference, Submission
+from django.urls import reverse_lazy
+from .models import Conference, Submission, ChunkedUpload
+from .conference_choices import open_conference_choices, open_conferences, use_autocomplete
+from . import uploads
 
 class ConferenceForm(forms.ModelForm):
     class Meta:
@@ -31,7 +34,51 @@ class ConferenceForm(forms.ModelForm):
             ),
         }
 
-class SubmissionForm(forms.ModelForm):
+class ConferenceAutocompleteWidget(forms.Widget):
+    # Saisie semi-automatique : l'identifiant choisi est envoyé dans un champ caché
+    template_name = "conferences/widgets/conference_autocomplete.html"
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        label = ""
+        if value not in (None, ""):
+            label = Conference.objects.filter(pk=value).values_list("name", flat=True).first() or ""
+        context["widget"].update({"label": label, "lookup_url": reverse_lazy("open_conferences")})
+        return context
+
+
+class ChunkedUploadFormMixin(forms.Form):
+    # Identifiant d'un article envoyé par morceaux (remplace le champ fichier)
+    upload_id = forms.UUIDField(required=False, widget=forms.HiddenInput)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunked_upload = None
+        self.fields['paper'].required = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload_id = cleaned_data.get('upload_id')
+        if upload_id:
+            self.chunked_upload = ChunkedUpload.objects.filter(
+                upload_id=upload_id, user=self.user, completed=True
+            ).first()
+            if self.chunked_upload is None:
+                self.add_error('upload_id', "Envoi introuvable ou non finalisé.")
+            else:
+                cleaned_data['paper'] = uploads.open_upload(self.chunked_upload)
+        elif not cleaned_data.get('paper') and not self.instance.paper:
+            self.add_error('paper', "Ce champ est obligatoire.")
+        return cleaned_data
+
+    def discard_chunked_upload(self):
+        # Après enregistrement : le fichier a été copié dans le stockage des articles
+        if self.chunked_upload is not None:
+            self.cleaned_data['paper'].close()
+            uploads.discard_upload(self.chunked_upload)
+
+
+class SubmissionForm(ChunkedUploadFormMixin, forms.ModelForm):
     class Meta:
         model = Submission
         fields = ['title', 'abstract', 'keywords', 'paper', 'conference']
@@ -64,9 +111,16 @@ class SubmissionForm(forms.ModelForm):
         # Extraire l'utilisateur des kwargs s'il est passé
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
-        # Filtrer les conférences pour n'afficher que celles non encore terminées
-        from datetime import date
-        self.fields['conference'].queryset = Conference.objects.filter(end_date__gte=date.today())
+        # Filtrer les conférences pour n'afficher que celles non encore terminées :
+        # le queryset ne sert qu'à valider la valeur envoyée, les choix affichés
+        # viennent du cache (conference_choices.py)
+        field = self.fields['conference']
+        field.queryset = open_conferences()
+        choices = open_conference_choices()
+        if use_autocomplete(choices):
+            field.widget = ConferenceAutocompleteWidget(attrs={'class': 'form-control'})
+        else:
+            field.choices = [("", field.empty_label), *choices]
     
     def clean(self):
         cleaned_data = super().clean()
@@ -75,7 +129,7 @@ class SubmissionForm(forms.ModelForm):
             self.instance.user = self.user
         return cleaned_data
 
-class SubmissionUpdateForm(forms.ModelForm):
+class SubmissionUpdateForm(ChunkedUploadFormMixin, forms.ModelForm):
     class Meta:
         model = Submission
         fields = ['title', 'abstract', 'keywords', 'paper']
@@ -99,3 +153,28 @@ class SubmissionUpdateForm(forms.ModelForm):
                 attrs={'accept': '.pdf', 'class': 'form-control'}
             ),
         }
+
+    def __init__(self, *args, **kwargs):
+        # Extraire l'utilisateur des kwargs s'il est passé
+        self.user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+
+
+class CsvImportForm(forms.Form):
+    # Import en masse depuis l'admin (voir imports.py)
+    kind = forms.ChoiceField(
+        label="Données",
+        choices=[("conferences", "Conférences"), ("sessions", "Sessions"), ("users", "Utilisateurs")],
+    )
+    file = forms.FileField(label="Fichier CSV (UTF-8)")
+    partial = forms.BooleanField(label="Enregistrer les lignes valides malgré les erreurs", required=False)
+    dry_run = forms.BooleanField(label="Valider seulement (rien n'est enregistré)", required=False)
+
+    def clean_kind(self):
+        # Import tardif : imports.py charge Sessionapp et Userapp, inutiles aux autres formulaires
+        from .imports import IMPORTERS
+
+        kind = self.cleaned_data["kind"]
+        if kind not in IMPORTERS:
+            raise forms.ValidationError("Type de données inconnu.")
+        return kind
@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# -----------------------------
+# Cache des fragments des pages de conférences
+# -----------------------------
+# La liste et la fiche d'une conférence ne dépendent que des données et du
+# rôle de l'utilisateur (anonyme, participant, membre du comité). Les
+# fragments sont mis en cache avec {% cache %} sous une clé qui contient le
+# rôle et un numéro de version ; changer le numéro suffit à les invalider
+# (les anciennes entrées expirent d'elles-mêmes) :
+#   - version de la liste : à chaque enregistrement/suppression d'une conférence
+#   - version d'une fiche : la conférence ou ses statistiques (stats.py) changent
+# La version de la liste sert aussi au cache des conférences ouvertes du
+# formulaire de soumission (conference_choices.py), celle d'une fiche au
+# programme de la conférence servi par l'API (sessionAppApi/program.py).
+# Les numéros sont changés après validation de la transaction, sinon un
+# lecteur concurrent pourrait mettre en cache l'ancien état sous le nouveau numéro.
+# Les numéros expirent eux aussi (CONFERENCE_VERSION_TIMEOUT) : une fiche
+# inexistante ou supprimée ne laisse pas de clé permanente, et une version
+# expirée est simplement remplacée par un nouveau numéro.
+# En production, CACHES doit pointer sur un cache partagé entre les processus.
+
+LIST_VERSION_KEY = "conferences:fragments:list"
+
+
+def detail_version_key(conference_id):
+    return f"conferences:fragments:detail:{conference_id}"
+
+
+def _version_timeout():
+    return getattr(settings, "CONFERENCE_VERSION_TIMEOUT", 7 * 24 * 3600)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Après une purge ou une expiration, jamais un numéro déjà utilisé
+        cache.add(key, time.time_ns(), _version_timeout())
+        version = cache.get(key)
+    return version
+
+
+def _bump(*keys):
+    stamp = time.time_ns()
+    cache.set_many({key: stamp for key in keys}, _version_timeout())
+
+
+def invalidate_conference_list(conference_id=None):
+    keys = [LIST_VERSION_KEY]
+    if conference_id is not None:
+        keys.append(detail_version_key(conference_id))
+    transaction.on_commit(lambda: _bump(*keys))
+
+
+def invalidate_conference_details(conference_ids):
+    keys = [detail_version_key(pk) for pk in conference_ids]
+    if keys:
+        transaction.on_commit(lambda: _bump(*keys))
+
+
+def list_version():
+    """Numéro de version (horodatage en ns) de la liste des conférences."""
+    return _get_version(LIST_VERSION_KEY)
+
+
+def detail_version(conference_id):
+    """Numéro de version (horodatage en ns) de la fiche ``conference_id``."""
+    return _get_version(detail_version_key(conference_id))
+
+
+def fragment_role(user):
+    if not user.is_authenticated:
+        return "anonymous"
+    return "comitee" if user.role == "comitee" else "participant"
+
+
+def fragment_context(request, conference_id=None):
+    """Variables utilisées par les balises {% cache %} de liste.html et details.html."""
+    return {
+        "fragment_role": fragment_role(request.user),
+        "fragment_version": list_version() if conference_id is None else detail_version(conference_id),
+        "fragment_timeout": getattr(settings, "CONFERENCE_FRAGMENT_TIMEOUT", 24 * 3600),
+    }
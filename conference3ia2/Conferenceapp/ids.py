@@ -0,0 +1,22 @@
+import random
+import re
+import string
+
+from conference3ia2.ids import SortableIdGenerator
+
+
+# -----------------------------
+# Générateurs d'identifiants de soumission
+# -----------------------------
+# Le générateur utilisé est choisi par le réglage SUBMISSION_ID_GENERATOR
+# (chemin pointé vers un callable sans argument), voir models.generate_submission_id.
+
+LEGACY_ID_RE = re.compile(r"^SUB-[A-Z]{8}$")
+
+# SUB- + horodatage + aléa (voir conference3ia2/ids.py)
+sortable_submission_id = SortableIdGenerator(prefix="SUB-")
+
+
+def random_submission_id():
+    """Ancien format : 8 lettres majuscules aléatoires (sans contrôle de collision)."""
+    return "SUB-" + "".join(random.choices(string.ascii_uppercase, k=8))
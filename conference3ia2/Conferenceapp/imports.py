@@ -0,0 +1,275 @@
+import csv
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+from Sessionapp.conflicts import SlotIndex
+from Sessionapp.models import Session
+from Userapp.models import User, generate_user_id
+
+from .fragments import invalidate_conference_list
+from .models import Conference
+from .stats import rebuild_conference_stats
+from . import search
+
+
+# -----------------------------
+# Import en masse depuis un fichier CSV
+# -----------------------------
+# Le fichier est lu en flux, par lots de IMPORT_BATCH_SIZE lignes. Pour chaque
+# lot, les données de référence (conférences citées, utilisateurs existants)
+# sont chargées en une requête ; chaque ligne est ensuite validée comme dans
+# les formulaires (validateurs des champs, Model.clean, verify_email) mais
+# sans les requêtes par ligne (clé étrangère, unicité), puis le lot est inséré
+# par bulk_create. Tout l'import est une transaction : une seule ligne en
+# erreur annule l'ensemble, sauf en mode ``partial`` où seules les lignes
+# valides sont enregistrées. bulk_create ne déclenche pas les signaux : index
+# de recherche, statistiques et caches sont mis à jour à la fin (finish()).
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # (numéro de ligne, message)
+        self.batches = 0
+        self.rolled_back = False
+
+    def add_error(self, line, error):
+        messages = error.messages if isinstance(error, ValidationError) else [str(error)]
+        for message in messages:
+            self.errors.append((line, message))
+
+    def __str__(self):
+        status = "annulé" if self.rolled_back else "enregistré"
+        return f"{self.created} ligne(s) valide(s), {len(self.errors)} erreur(s) en {self.batches} lot(s) : import {status}"
+
+
+class BaseImporter:
+    model = None
+    columns = ()
+    required = ()
+    # Champs non validés ligne par ligne (résolus à partir des données préchargées)
+    validate_exclude = ()
+
+    def __init__(self):
+        self.created = []
+
+    def check_header(self, header):
+        missing = [column for column in self.required if column not in header]
+        if missing:
+            raise ValidationError(f"Colonnes manquantes : {', '.join(missing)}.")
+
+    def prepare(self, rows):
+        """Préchargement des données de référence du lot (une requête par type)."""
+
+    def parse(self, row):
+        values = {}
+        errors = {}
+        for column in self.columns:
+            if column not in row or column in self.validate_exclude:
+                continue
+            field = self.model._meta.get_field(column)
+            raw = (row[column] or "").strip()
+            if raw == "":
+                values[column] = "" if field.empty_strings_allowed and not field.null else None
+                continue
+            try:
+                values[column] = field.to_python(raw)
+            except ValidationError as e:
+                errors[column] = e.messages
+        if errors:
+            raise ValidationError(errors)
+        return values
+
+    def build(self, row):
+        return self.model(**self.parse(row))
+
+    def validate(self, instance):
+        # Comme full_clean(validate_unique=False), mais clean() (qui compare les
+        # dates et les heures) seulement si chaque champ est valide
+        instance.clean_fields(exclude=self.validate_exclude)
+        instance.clean()
+
+    def insert(self, instances):
+        self.created.extend(self.model.objects.bulk_create(instances))
+
+    def finish(self):
+        """Ce que les signaux post_save auraient fait."""
+
+
+class ConferenceImporter(BaseImporter):
+    model = Conference
+    columns = ("name", "theme", "location", "description", "start_date", "end_date", "daily_submission_limit")
+    required = ("name", "theme", "location", "description", "start_date", "end_date")
+
+    def finish(self):
+        if not self.created:
+            return
+        ids = [conference.pk for conference in self.created]
+        search.index_conferences(ids)
+        rebuild_conference_stats(ids)
+        invalidate_conference_list()
+
+
+class SessionImporter(BaseImporter):
+    model = Session
+    columns = ("conference", "title", "topic", "session_day", "start_time", "end_time", "room")
+    required = columns
+    validate_exclude = ("conference",)
+
+    def __init__(self):
+        super().__init__()
+        # Créneaux occupés (sessions enregistrées et lignes déjà validées du fichier)
+        self.slots = SlotIndex()
+        self.loaded_conferences = set()
+
+    def prepare(self, rows):
+        # Conférence désignée par son identifiant ou par son nom (unique dans la base)
+        refs = {(row.get("conference") or "").strip() for _, row in rows}
+        ids = [int(ref) for ref in refs if ref.isdigit()]
+        names = [ref for ref in refs if ref and not ref.isdigit()]
+        self.conferences = {}
+        duplicates = set()
+        for conference in Conference.objects.filter(Q(pk__in=ids) | Q(name__in=names)):
+            self.conferences[str(conference.pk)] = conference
+            if conference.name in self.conferences:
+                duplicates.add(conference.name)
+            self.conferences[conference.name] = conference
+        for name in duplicates:
+            self.conferences[name] = None
+        # Sessions existantes des conférences citées pour la première fois : une requête par lot
+        new_ids = {conference.pk for conference in self.conferences.values() if conference} - self.loaded_conferences
+        if new_ids:
+            self.slots.load(new_ids)
+            self.loaded_conferences |= new_ids
+
+    def build(self, row):
+        ref = (row.get("conference") or "").strip()
+        if ref not in self.conferences:
+            raise ValidationError({"conference": [f"Conférence introuvable : « {ref} »."]})
+        if self.conferences[ref] is None:
+            raise ValidationError({"conference": [f"Plusieurs conférences s'appellent « {ref} » : utilisez l'identifiant."]})
+        session = super().build(row)
+        session.conference = self.conferences[ref]
+        return session
+
+    def validate(self, instance):
+        super().validate(instance)
+        self.slots.check_and_add(instance)
+
+    def finish(self):
+        if self.created:
+            rebuild_conference_stats({session.conference_id for session in self.created})
+
+
+class UserImporter(BaseImporter):
+    model = User
+    columns = ("username", "email", "first_name", "last_name", "affiliation", "nationality", "role")
+    required = ("username", "email", "first_name", "last_name", "affiliation", "nationality")
+    validate_exclude = ("password",)
+
+    def __init__(self):
+        super().__init__()
+        # Doublons à l'intérieur du fichier
+        self.usernames = set()
+        self.emails = set()
+
+    def prepare(self, rows):
+        usernames = {(row.get("username") or "").strip() for _, row in rows}
+        emails = {(row.get("email") or "").strip() for _, row in rows}
+        existing = User.objects.filter(Q(username__in=usernames) | Q(email__in=emails))
+        for username, email in existing.values_list("username", "email"):
+            self.usernames.add(username)
+            self.emails.add(email.lower())
+
+    def check_header(self, header):
+        super().check_header(header)
+        # Pas de mot de passe en clair dans un fichier d'import ; le hacher coûterait
+        # en outre ~100 ms par ligne. Les comptes sont créés sans mot de passe
+        # utilisable, chacun le définit par la réinitialisation par e-mail.
+        if "password" in header:
+            raise ValidationError(
+                "La colonne password n'est pas acceptée : les comptes sont créés sans mot de passe "
+                "(réinitialisation par e-mail)."
+            )
+
+    def build(self, row):
+        user = super().build(row)
+        user.user_id = generate_user_id()
+        user.set_unusable_password()
+        return user
+
+    def validate(self, instance):
+        super().validate(instance)
+        errors = {}
+        if instance.username in self.usernames:
+            errors["username"] = ["Ce nom d'utilisateur existe déjà."]
+        if instance.email.lower() in self.emails:
+            errors["email"] = ["Cette adresse e-mail est déjà utilisée."]
+        if errors:
+            raise ValidationError(errors)
+        self.usernames.add(instance.username)
+        self.emails.add(instance.email.lower())
+
+
+IMPORTERS = {
+    "conferences": ConferenceImporter,
+    "sessions": SessionImporter,
+    "users": UserImporter,
+}
+
+
+def _batches(reader, size):
+    rows = ((reader.line_num, row) for row in reader)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_csv(stream, kind, batch_size=None, partial=False, dry_run=False, progress=None):
+    """
+    Importe le CSV ``stream`` (fichier texte) dans le modèle ``kind``
+    (conferences, sessions, users). Renvoie un ImportReport ;
+    ``progress(report)`` est appelé après chaque lot.
+    """
+    importer = IMPORTERS[kind]()
+    batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 1000)
+    report = ImportReport()
+    reader = csv.DictReader(stream)
+    try:
+        importer.check_header(reader.fieldnames or [])
+    except ValidationError as e:
+        report.add_error(1, e)
+        report.rolled_back = True
+        return report
+
+    with transaction.atomic():
+        for batch in _batches(reader, batch_size):
+            importer.prepare(batch)
+            valid = []
+            for line, row in batch:
+                try:
+                    instance = importer.build(row)
+                    importer.validate(instance)
+                except ValidationError as e:
+                    report.add_error(line, e)
+                    continue
+                valid.append(instance)
+            if not dry_run:
+                importer.insert(valid)
+            report.created += len(valid)
+            report.batches += 1
+            if progress:
+                progress(report)
+
+        if dry_run or (report.errors and not partial):
+            transaction.set_rollback(True)
+            report.rolled_back = True
+        else:
+            importer.finish()
+    return report
@@ -0,0 +1,60 @@
+from django.db.models import Count, Min
+
+from .models import Submission, SubmissionKeyword, normalize_keyword, parse_keywords
+
+
+# -----------------------------
+# Index normalisé des mots-clés
+# -----------------------------
+def sync_submission_keywords(submission):
+    """Met à jour les lignes SubmissionKeyword d'une soumission (écrit seulement la différence)."""
+    wanted = {normalize_keyword(label): label for label in parse_keywords(submission.keywords)}
+    existing = {
+        key: (conference_id, label)
+        for key, conference_id, label in SubmissionKeyword.objects.filter(submission=submission).values_list(
+            "keyword", "conference_id", "label"
+        )
+    }
+
+    removed = set(existing) - set(wanted)
+    if removed:
+        SubmissionKeyword.objects.filter(submission=submission, keyword__in=removed).delete()
+
+    # La soumission a pu changer de conférence
+    if any(conference_id != submission.conference_id for conference_id, _ in existing.values()):
+        SubmissionKeyword.objects.filter(submission=submission).update(conference_id=submission.conference_id)
+
+    # Même mot-clé saisi autrement (casse, accents) : seul le libellé change
+    for key, label in wanted.items():
+        if key in existing and existing[key][1] != label:
+            SubmissionKeyword.objects.filter(submission=submission, keyword=key).update(label=label)
+
+    added = [
+        SubmissionKeyword(
+            submission=submission, conference_id=submission.conference_id, keyword=key, label=label
+        )
+        for key, label in wanted.items()
+        if key not in existing
+    ]
+    if added:
+        SubmissionKeyword.objects.bulk_create(added)
+
+
+def submissions_with_keyword(keyword, queryset=None):
+    """Soumissions portant le mot-clé donné (insensible à la casse et aux accents)."""
+    queryset = Submission.objects.all() if queryset is None else queryset
+    return queryset.filter(keyword_index__keyword=normalize_keyword(keyword))
+
+
+def keyword_facets(conference, limit=None):
+    """
+    Nombre de soumissions par mot-clé pour une conférence, du plus fréquent au
+    moins fréquent : une seule requête GROUP BY sur l'index (conference, keyword).
+    """
+    facets = (
+        SubmissionKeyword.objects.filter(conference=conference)
+        .values("keyword")
+        .annotate(label=Min("label"), count=Count("submission_id"))
+        .order_by("-count", "keyword")
+    )
+    return facets[:limit] if limit else facets
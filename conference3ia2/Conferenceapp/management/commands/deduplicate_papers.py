@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Conferenceapp.models import Submission
+from Conferenceapp.storage import digest_from_name, get_paper_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Déplace les articles existants dans le stockage adressé par contenu : "
+        "un seul fichier par contenu, les copies identiques sont supprimées."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Afficher les changements sans les appliquer.")
+
+    def handle(self, *args, dry_run, **options):
+        storage = get_paper_storage()
+        old_names = set()
+        migrated = 0
+
+        rows = Submission.objects.exclude(paper="").values_list("submission_id", "paper")
+        for submission_id, name in rows.iterator(chunk_size=500):
+            if digest_from_name(name):
+                continue
+            if not storage.exists(name):
+                self.stderr.write(f"{submission_id} : fichier manquant {name}")
+                continue
+            if dry_run:
+                self.stdout.write(f"{submission_id} : {name}")
+                continue
+            with storage.open(name) as content, transaction.atomic():
+                # Le stockage compte la référence de la soumission
+                new_name = storage.save(name, content)
+                # update() plutôt que save() : pas de nouvelle validation ni de signaux
+                Submission.objects.filter(pk=submission_id).update(paper=new_name)
+            self.stdout.write(f"{submission_id} : {name} -> {new_name}")
+            old_names.add(name)
+            migrated += 1
+
+        # Les anciennes copies ne sont supprimées qu'une fois plus aucune soumission ne les utilise
+        still_used = set(Submission.objects.filter(paper__in=old_names).values_list("paper", flat=True))
+        for name in old_names - still_used:
+            storage.delete(name)
+
+        self.stdout.write(self.style.SUCCESS(f"{migrated} article(s) dédupliqué(s)."))
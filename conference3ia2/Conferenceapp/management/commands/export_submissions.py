@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from Conferenceapp import exports
+from Conferenceapp.models import Submission
+
+
+class Command(BaseCommand):
+    help = "Exporte les soumissions (avec conférence et auteur) en CSV ou JSON lines, ligne à ligne."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--conference", type=int, action="append", help="Conférence(s) à exporter (toutes par défaut).")
+        parser.add_argument("--format", dest="fmt", choices=sorted(exports.FORMATS), default="csv")
+        parser.add_argument("--output", help="Fichier de sortie (sortie standard par défaut).")
+
+    def handle(self, *args, conference, fmt, output, **options):
+        queryset = Submission.objects.all()
+        if conference:
+            queryset = queryset.filter(conference_id__in=conference)
+
+        count = 0
+        stream = open(output, "w", encoding="utf-8", newline="") if output else self.stdout
+        try:
+            for line in exports.iter_export(queryset, fmt):
+                if output:
+                    stream.write(line)
+                else:
+                    stream.write(line, ending="")
+                count += 1
+        finally:
+            if output:
+                stream.close()
+        if output:
+            lines = count - 1 if fmt == "csv" else count
+            self.stderr.write(self.style.SUCCESS(f"{lines} soumission(s) exportée(s) dans {output}."))
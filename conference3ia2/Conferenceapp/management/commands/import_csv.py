@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Conferenceapp import imports
+
+
+class Command(BaseCommand):
+    help = "Importe des conférences, sessions ou utilisateurs depuis un fichier CSV (validation et insertion par lots)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(imports.IMPORTERS))
+        parser.add_argument("path", help="Fichier CSV (UTF-8, première ligne : noms des colonnes).")
+        parser.add_argument("--batch-size", type=int, help="Lignes par lot (IMPORT_BATCH_SIZE par défaut).")
+        parser.add_argument("--partial", action="store_true", help="Enregistre les lignes valides malgré les erreurs.")
+        parser.add_argument("--dry-run", action="store_true", help="Valide le fichier sans rien enregistrer.")
+
+    def handle(self, *args, kind, path, batch_size, partial, dry_run, **options):
+        verbosity = options["verbosity"]
+
+        def progress(report):
+            if verbosity > 1:
+                self.stderr.write(f"Lot {report.batches} : {report.created} ligne(s) valide(s), {len(report.errors)} erreur(s)")
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as stream:
+                report = imports.import_csv(
+                    stream, kind, batch_size=batch_size, partial=partial, dry_run=dry_run, progress=progress
+                )
+        except OSError as e:
+            raise CommandError(e)
+
+        for line, message in report.errors:
+            self.stderr.write(f"Ligne {line} : {message}")
+        style = self.style.ERROR if report.errors and report.rolled_back and not dry_run else self.style.SUCCESS
+        self.stdout.write(style(str(report)))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Conferenceapp import search
+from Conferenceapp.ids import LEGACY_ID_RE, sortable_submission_id
+from Conferenceapp.models import Submission
+
+
+class Command(BaseCommand):
+    help = (
+        "Remplace les anciens identifiants de soumission (SUB- + 8 lettres) par des "
+        "identifiants triables dérivés de created_at. Les liens contenant les anciens "
+        "identifiants ne seront plus valides."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Afficher les changements sans les appliquer.")
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        # Tables qui référencent Submission par clé étrangère (mots-clés, historique, ...)
+        relations = [rel for rel in Submission._meta.related_objects if not rel.many_to_many]
+        legacy = [
+            (pk, created_at)
+            for pk, created_at in Submission.objects.order_by("created_at").values_list("submission_id", "created_at")
+            if LEGACY_ID_RE.match(pk)
+        ]
+
+        for start in range(0, len(legacy), batch_size):
+            batch = legacy[start:start + batch_size]
+            with transaction.atomic():
+                for old_id, created_at in batch:
+                    new_id = sortable_submission_id(timestamp=created_at.timestamp())
+                    self.stdout.write(f"{old_id} -> {new_id}")
+                    if dry_run:
+                        continue
+                    for rel in relations:
+                        rel.related_model._base_manager.filter(**{rel.field.attname: old_id}).update(
+                            **{rel.field.attname: new_id}
+                        )
+                    Submission.objects.filter(pk=old_id).update(submission_id=new_id)
+                    # L'index plein texte n'est pas une relation : sa clé suit dans la même transaction
+                    search.rekey_submission(old_id, new_id)
+
+        action = "à migrer" if dry_run else "migrées"
+        self.stdout.write(self.style.SUCCESS(f"{len(legacy)} soumission(s) {action}."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from Conferenceapp.models import Submission
+from Conferenceapp.processing import schedule_paper_processing
+
+
+class Command(BaseCommand):
+    help = "Analyse (texte, pages, vignette) les articles jamais analysés ou en échec, dans ce processus."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Réanalyser tous les articles.")
+
+    def handle(self, *args, **options):
+        submissions = Submission.objects.exclude(paper="").select_related("analysis")
+        if not options["all"]:
+            submissions = submissions.filter(Q(analysis__isnull=True) | ~Q(analysis__status="done"))
+
+        count = 0
+        for submission in submissions.iterator(chunk_size=200):
+            schedule_paper_processing(submission, mode="sync")
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} article(s) analysé(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Conferenceapp.uploads import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Supprime les envois par morceaux abandonnés (lignes ChunkedUpload et fichiers .part)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, help="Délai d'inactivité (CHUNKED_UPLOAD_EXPIRY_HOURS par défaut).")
+
+    def handle(self, *args, hours, **options):
+        count = purge_expired_uploads(hours)
+        self.stdout.write(self.style.SUCCESS(f"{count} envoi(s) abandonné(s) supprimé(s)."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from Conferenceapp.stats import rebuild_conference_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcule les statistiques des conférences (soumissions par état, paiements, sessions par jour)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "conference_ids", nargs="*", type=int, help="Conférences à recalculer (toutes par défaut)."
+        )
+
+    def handle(self, *args, conference_ids, **options):
+        count = rebuild_conference_stats(conference_ids or None)
+        self.stdout.write(self.style.SUCCESS(f"Statistiques recalculées pour {count} conférence(s)."))
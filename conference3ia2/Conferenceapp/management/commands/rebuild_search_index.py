@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from Conferenceapp import search
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index plein texte (FTS5) des conférences et des soumissions."
+
+    def handle(self, *args, **options):
+        if not search.create_index(connection):
+            raise CommandError("FTS5 n'est pas disponible sur cette base : la recherche utilise le repli LIKE.")
+        with transaction.atomic():
+            search.rebuild_index(connection)
+        self.stdout.write(self.style.SUCCESS("Index de recherche reconstruit."))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0003_alter_conference_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conference',
+            index=models.Index(fields=['start_date', 'conference_id'], name='conference_start_id_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.db import migrations, OperationalError
+
+
+# SQL figé ici (et non importé de Conferenceapp.search) : la migration doit
+# produire le même schéma quelle que soit la version du module.
+CREATE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS conference_fts USING fts5("
+    "name, description, location, tokenize='unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS submission_fts USING fts5("
+    "title, keywords, username, abstract, tokenize='unicode61 remove_diacritics 2')",
+    # Rowid de la ligne d'index de chaque soumission (clé primaire textuelle)
+    "CREATE TABLE IF NOT EXISTS submission_fts_key ("
+    "fts_rowid INTEGER PRIMARY KEY, submission_id VARCHAR(30) NOT NULL UNIQUE)",
+]
+DROP_INDEX_SQL = [
+    "DROP TABLE IF EXISTS conference_fts",
+    "DROP TABLE IF EXISTS submission_fts",
+    "DROP TABLE IF EXISTS submission_fts_key",
+]
+
+
+def create_search_index(apps, schema_editor):
+    # Uniquement sur SQLite compilé avec FTS5 ; sinon la recherche reste en LIKE
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    conferences = apps.get_model("Conferenceapp", "Conference")._meta.db_table
+    submissions = apps.get_model("Conferenceapp", "Submission")._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            for sql in CREATE_INDEX_SQL:
+                cursor.execute(sql)
+    except OperationalError:
+        # "no such module: fts5"
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO conference_fts(rowid, name, description, location) "
+            f"SELECT conference_id, name, description, location FROM {conferences}"
+        )
+        cursor.execute(f"INSERT INTO submission_fts_key(submission_id) SELECT submission_id FROM {submissions}")
+        cursor.execute(
+            "INSERT INTO submission_fts(rowid, title, keywords, username, abstract) "
+            f"SELECT k.fts_rowid, s.title, s.keywords, u.username, s.abstract FROM {submissions} s "
+            "JOIN submission_fts_key k ON k.submission_id = s.submission_id "
+            f"JOIN {user_model._meta.db_table} u ON u.{user_model._meta.pk.column} = s.user_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in DROP_INDEX_SQL:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0004_conference_start_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:05
+
+import Conferenceapp.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_keywords(apps, schema_editor):
+    Submission = apps.get_model('Conferenceapp', 'Submission')
+    SubmissionKeyword = apps.get_model('Conferenceapp', 'SubmissionKeyword')
+    batch = []
+    rows = Submission.objects.values_list('submission_id', 'conference_id', 'keywords')
+    for submission_id, conference_id, keywords in rows.iterator(chunk_size=1000):
+        for label in Conferenceapp.models.parse_keywords(keywords):
+            batch.append(SubmissionKeyword(
+                submission_id=submission_id,
+                conference_id=conference_id,
+                keyword=Conferenceapp.models.normalize_keyword(label),
+                label=label,
+            ))
+        if len(batch) >= 1000:
+            SubmissionKeyword.objects.bulk_create(batch)
+            batch = []
+    SubmissionKeyword.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=255)),
+                ('label', models.CharField(max_length=255)),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_index', to='Conferenceapp.conference')),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_index', to='Conferenceapp.submission')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['conference', 'keyword'], name='keyword_conference_idx')],
+                'constraints': [models.UniqueConstraint(fields=('keyword', 'submission'), name='submission_keyword_unique')],
+            },
+        ),
+        migrations.RunPython(index_existing_keywords, migrations.RunPython.noop),
+    ]
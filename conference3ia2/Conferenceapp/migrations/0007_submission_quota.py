@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def count_existing_submissions(apps, schema_editor):
+    Submission = apps.get_model('Conferenceapp', 'Submission')
+    SubmissionQuota = apps.get_model('Conferenceapp', 'SubmissionQuota')
+    # Un compteur par (utilisateur, conférence, jour) et un compteur global par (utilisateur, jour)
+    for fields in (('user_id', 'conference_id', 'submission_date'), ('user_id', 'submission_date')):
+        counts = Submission.objects.values(*fields).annotate(total=models.Count('submission_id')).order_by()
+        SubmissionQuota.objects.bulk_create(
+            SubmissionQuota(
+                user_id=row['user_id'], conference_id=row.get('conference_id'), day=row['submission_date'],
+                count=row['total'],
+            )
+            for row in counts.iterator()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0006_submissionkeyword'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conference',
+            name='daily_submission_limit',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SubmissionQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('conference', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='submission_quotas', to='Conferenceapp.conference')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submission_quotas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'conference', 'day'), name='submission_quota_user_conf_day'), models.UniqueConstraint(condition=models.Q(('conference__isnull', True)), fields=('user', 'day'), name='submission_quota_user_day')],
+            },
+        ),
+        migrations.RunPython(count_existing_submissions, migrations.RunPython.noop),
+    ]
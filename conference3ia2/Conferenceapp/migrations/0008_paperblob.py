@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:09
+
+import Conferenceapp.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0007_submission_quota'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='paper',
+            field=models.FileField(storage=Conferenceapp.storage.get_paper_storage, upload_to='paper/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'], message='Seuls les fichiers PDF sont autorisés.')]),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0009_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperAnalysis',
+            fields=[
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='analysis', serialize=False, to='Conferenceapp.submission')),
+                ('paper', models.CharField(db_index=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('done', 'done'), ('failed', 'failed')], default='pending', max_length=20)),
+                ('pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('text', models.TextField(blank=True)),
+                ('thumbnail', models.FileField(blank=True, upload_to='thumbnails/')),
+                ('error', models.TextField(blank=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
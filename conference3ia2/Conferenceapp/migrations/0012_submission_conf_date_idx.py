@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0011_submissionhistory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['conference', 'submission_date', 'submission_id'], name='submission_conf_date_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+STATUS_FIELDS = {
+    'submitted': 'submitted',
+    'under review': 'under_review',
+    'accepted': 'accepted',
+    'rejected': 'rejected',
+}
+
+
+def compute_existing_stats(apps, schema_editor):
+    Conference = apps.get_model('Conferenceapp', 'Conference')
+    Submission = apps.get_model('Conferenceapp', 'Submission')
+    Session = apps.get_model('Sessionapp', 'Session')
+    ConferenceStats = apps.get_model('Conferenceapp', 'ConferenceStats')
+    ConferenceDayStats = apps.get_model('Conferenceapp', 'ConferenceDayStats')
+
+    counts = {
+        row.pop('conference_id'): row
+        for row in Submission.objects.values('conference_id').annotate(
+            submissions=models.Count('pk'),
+            payed=models.Count('pk', filter=models.Q(payed=True)),
+            **{name: models.Count('pk', filter=models.Q(status=status)) for status, name in STATUS_FIELDS.items()},
+        ).order_by()
+    }
+    per_day = list(
+        Session.objects.values('conference_id', 'session_day').annotate(total=models.Count('pk')).order_by()
+    )
+    sessions = {}
+    for row in per_day:
+        sessions[row['conference_id']] = sessions.get(row['conference_id'], 0) + row['total']
+
+    ConferenceStats.objects.bulk_create(
+        (
+            ConferenceStats(conference_id=pk, sessions=sessions.get(pk, 0), **counts.get(pk, {}))
+            for pk in Conference.objects.values_list('pk', flat=True).iterator()
+        ),
+        batch_size=500,
+    )
+    ConferenceDayStats.objects.bulk_create(
+        (
+            ConferenceDayStats(conference_id=row['conference_id'], day=row['session_day'], sessions=row['total'])
+            for row in per_day
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0012_submission_conf_date_idx'),
+        ('Sessionapp', '0002_alter_session_end_time_alter_session_room_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConferenceStats',
+            fields=[
+                ('conference', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='Conferenceapp.conference')),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('submitted', models.PositiveIntegerField(default=0)),
+                ('under_review', models.PositiveIntegerField(default=0)),
+                ('accepted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('payed', models.PositiveIntegerField(default=0)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConferenceDayStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_stats', to='Conferenceapp.conference')),
+            ],
+            options={
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('conference', 'day'), name='conference_day_stats_unique')],
+            },
+        ),
+        migrations.RunPython(compute_existing_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0013_conference_stats'),
+        ('Sessionapp', '0003_session_room_slot_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='submissions', to='Sessionapp.session'),
+        ),
+    ]
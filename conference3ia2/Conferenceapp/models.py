@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.conf import settings
 from django.core.validators import MinLengthValidator, FileExtensionValidator
 from django.core.exceptions import ValidationError
-import string
-import random
+from django.utils.module_loading import import_string
+import unicodedata
+import uuid
 from datetime import datetime, date
+from .storage import get_paper_storage
 
 # -----------------------------
 # Modèle Conference
@@ -25,9 +28,18 @@ class Conference(models.Model):
     )
     start_date = models.DateField()
     end_date = models.DateField()
+    # Nombre maximal de soumissions à cette conférence par utilisateur et par jour (vide = pas de limite
+    # propre) ; SUBMISSIONS_PER_DAY s'applique toujours, toutes conférences confondues
+    daily_submission_limit = models.PositiveSmallIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Index de la pagination par curseur de la liste des conférences
+            models.Index(fields=["start_date", "conference_id"], name="conference_start_id_idx"),
+        ]
+
     def clean(self):
         if self.start_date and self.end_date and self.start_date > self.end_date:
             raise ValidationError("La date de début ne doit pas être supérieure à la date de fin.")
@@ -39,6 +51,26 @@ class Conference(models.Model):
 # -----------------------------
 # Helpers pour Submission
 # -----------------------------
+def parse_keywords(value):
+    """Découpe la liste de mots-clés séparés par des virgules (sans doublons, ordre conservé)."""
+    keywords_list = []
+    seen = set()
+    for label in (value or "").split(","):
+        label = " ".join(label.split())
+        key = normalize_keyword(label)
+        if key and key not in seen:
+            seen.add(key)
+            keywords_list.append(label)
+    return keywords_list
+
+
+def normalize_keyword(label):
+    """Forme normalisée d'un mot-clé : minuscules, sans accents, espaces réduits."""
+    decomposed = unicodedata.normalize("NFKD", label)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    return " ".join(folded.split())
+
+
 def validate_keywords(value):
     keywords_list = [k.strip() for k in value.split(",") if k.strip()]
     if len(keywords_list) > 10:
@@ -46,9 +78,9 @@ def validate_keywords(value):
 
 
 def generate_submission_id():
-    letters = string.ascii_uppercase
-    random_letters = "".join(random.choices(letters, k=8))
-    return f"SUB-{random_letters}"
+    # Générateur configurable (SUBMISSION_ID_GENERATOR), par défaut des identifiants triables dans le temps
+    generator = getattr(settings, "SUBMISSION_ID_GENERATOR", "Conferenceapp.ids.sortable_submission_id")
+    return import_string(generator)()
 
 
 # -----------------------------
@@ -63,6 +95,7 @@ class Submission(models.Model):
     keywords = models.TextField(validators=[validate_keywords])
     paper = models.FileField(
         upload_to="paper/",
+        storage=get_paper_storage,
         validators=[FileExtensionValidator(allowed_extensions=["pdf"], message="Seuls les fichiers PDF sont autorisés.")]
     )
 
@@ -79,6 +112,16 @@ class Submission(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey("Userapp.User", on_delete=models.CASCADE, related_name="submissions")
     conference = models.ForeignKey("Conferenceapp.Conference", on_delete=models.CASCADE, related_name="submissions")
+    # Session du programme où l'article est présenté (voir Sessionapp/scheduler.py)
+    session = models.ForeignKey(
+        "Sessionapp.Session", on_delete=models.SET_NULL, null=True, blank=True, related_name="submissions"
+    )
+
+    class Meta:
+        indexes = [
+            # Pages de soumissions d'une conférence (admin), triées par date
+            models.Index(fields=["conference", "submission_date", "submission_id"], name="submission_conf_date_idx"),
+        ]
 
     def clean(self):
         # Utiliser la date du jour si submission_date est None
@@ -87,24 +130,204 @@ class Submission(models.Model):
             submission_date = submission_date.date()
 
         # Vérifier que la soumission est avant la conférence
-        if self.conference and self.conference.start_date and submission_date > self.conference.start_date:
+        if self.conference_id and self.conference.start_date and submission_date > self.conference.start_date:
             raise ValidationError("La soumission ne peut être faite que pour des conférences à venir.")
 
-        # Limiter le nombre de soumissions par jour à 3
-        if self.user:
-            from django.db.models import Count
-            count = (
-                Submission.objects.filter(user=self.user, submission_date=submission_date)
-                .exclude(pk=self.pk)
-                .count()
-            )
-            if count >= 3:
-                raise ValidationError("Vous ne pouvez pas soumettre plus de 3 conférences par jour.")
+        # La limite de soumissions par jour est appliquée à l'enregistrement
+        # (compteur atomique, voir quota.py) et non plus par un COUNT ici.
+
+    def save(self, *args, check_quota=True, **kwargs):
+        from .quota import reserve_submission_slot
+        from .storage import collect_blob
+        # Réservation dans le quota du jour, référence vers le fichier (prise par
+        # le stockage) et écriture de la ligne dans la même transaction : si
+        # l'écriture échoue, la réservation et la référence sont annulées avec elle.
+        uploading = not getattr(self.paper, "_committed", True)
+        try:
+            with transaction.atomic():
+                if self._state.adding:
+                    reserve_submission_slot(self.user_id, self.conference, enforce=check_quota)
+                super().save(*args, **kwargs)
+        except BaseException:
+            # Fichier tout juste stocké pour cette soumission : supprimé s'il n'est pas partagé
+            if uploading and self.paper._committed:
+                collect_blob(self.paper.name, self.paper.storage)
+            raise
 
     def __str__(self):
         return f"{self.title} ({self.status})"
 
 
+# -----------------------------
+# Historique des changements d'état des soumissions (voir transitions.py)
+# -----------------------------
+class SubmissionHistory(models.Model):
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="history")
+    field = models.CharField(max_length=50)
+    old_value = models.CharField(max_length=50)
+    new_value = models.CharField(max_length=50)
+    changed_by = models.ForeignKey(
+        "Userapp.User", on_delete=models.SET_NULL, null=True, blank=True, related_name="submission_changes"
+    )
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-changed_at"]
+        indexes = [
+            models.Index(fields=["submission", "changed_at"], name="history_submission_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.submission_id} : {self.field} {self.old_value} -> {self.new_value}"
+
+
+# -----------------------------
+# Fichiers d'articles dédupliqués (voir storage.py)
+# -----------------------------
+class PaperBlob(models.Model):
+    digest = models.CharField(max_length=64, primary_key=True)  # SHA-256 du contenu
+    name = models.CharField(max_length=255)  # chemin dans le stockage
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)  # nombre de soumissions qui l'utilisent
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
+
+# -----------------------------
+# Analyse des articles en tâche de fond (voir processing.py)
+# -----------------------------
+class PaperAnalysis(models.Model):
+    STATUS = [
+        ("pending", "pending"),
+        ("done", "done"),
+        ("failed", "failed"),
+    ]
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, primary_key=True, related_name="analysis")
+    paper = models.CharField(max_length=255, db_index=True)  # fichier analysé (un résultat périmé n'est pas appliqué)
+    status = models.CharField(max_length=20, choices=STATUS, default="pending")
+    pages = models.PositiveIntegerField(null=True, blank=True)
+    text = models.TextField(blank=True)
+    thumbnail = models.FileField(upload_to="thumbnails/", blank=True)
+    error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.submission_id} ({self.status})"
+
+
+# -----------------------------
+# Envoi d'articles par morceaux (voir uploads.py)
+# -----------------------------
+class ChunkedUpload(models.Model):
+    upload_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey("Userapp.User", on_delete=models.CASCADE, related_name="chunked_uploads")
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()  # taille annoncée à l'initialisation
+    offset = models.BigIntegerField(default=0)  # octets reçus jusqu'ici
+    completed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+# -----------------------------
+# Index des mots-clés des soumissions
+# -----------------------------
+class SubmissionKeyword(models.Model):
+    # Une ligne par (soumission, mot-clé), maintenue à l'enregistrement de la soumission
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="keyword_index")
+    # Copie de submission.conference pour compter les facettes sans jointure
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name="keyword_index")
+    keyword = models.CharField(max_length=255)  # forme normalisée (recherche)
+    label = models.CharField(max_length=255)  # forme saisie (affichage)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["keyword", "submission"], name="submission_keyword_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["conference", "keyword"], name="keyword_conference_idx"),
+        ]
+
+    def __str__(self):
+        return self.label
+
+
+# -----------------------------
+# Compteur de soumissions par utilisateur et par jour
+# -----------------------------
+class SubmissionQuota(models.Model):
+    user = models.ForeignKey("Userapp.User", on_delete=models.CASCADE, related_name="submission_quotas")
+    # Vide : compteur global de l'utilisateur pour le jour (voir quota.py)
+    conference = models.ForeignKey(
+        Conference, on_delete=models.CASCADE, null=True, blank=True, related_name="submission_quotas"
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "conference", "day"], name="submission_quota_user_conf_day"),
+            # NULL n'étant jamais égal à NULL, le compteur global a sa propre contrainte
+            models.UniqueConstraint(
+                fields=["user", "day"], condition=models.Q(conference__isnull=True), name="submission_quota_user_day"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.conference_id} - {self.day} : {self.count}"
+
+
+# -----------------------------
+# Statistiques par conférence, tenues à jour incrémentalement (voir stats.py)
+# -----------------------------
+class ConferenceStats(models.Model):
+    conference = models.OneToOneField(Conference, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    submissions = models.PositiveIntegerField(default=0)
+    submitted = models.PositiveIntegerField(default=0)
+    under_review = models.PositiveIntegerField(default=0)
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    payed = models.PositiveIntegerField(default=0)
+    sessions = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def paid_ratio(self):
+        return self.payed / self.submissions if self.submissions else 0
+
+    def by_status(self):
+        return [
+            ("submitted", self.submitted),
+            ("under review", self.under_review),
+            ("accepted", self.accepted),
+            ("rejected", self.rejected),
+        ]
+
+    def __str__(self):
+        return f"{self.conference_id} : {self.submissions} soumission(s), {self.sessions} session(s)"
+
+
+class ConferenceDayStats(models.Model):
+    # Nombre de sessions par jour de conférence
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name="day_stats")
+    day = models.DateField()
+    sessions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(fields=["conference", "day"], name="conference_day_stats_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.conference_id} - {self.day} : {self.sessions}"
+
+
 # -----------------------------
 # Modèle Organizingcommitee
 # -----------------------------
@@ -0,0 +1,109 @@
+import base64
+import json
+
+from django.db.models import Q
+
+
+# -----------------------------
+# Pagination par curseur (keyset)
+# -----------------------------
+class InvalidCursor(ValueError):
+    """Jeton de curseur illisible ou corrompu."""
+
+
+def keyset_filter(fields, values, reverse=False):
+    """
+    Condition « après » (ou « avant » si ``reverse``) la clé ``values`` dans
+    l'ordre ``fields`` : (a > x) OU (a = x ET b > y) OU (a = x ET b = y ET c > z)...
+    """
+    lookup = "lt" if reverse else "gt"
+    condition = Q()
+    for position, field in enumerate(fields):
+        equal = {previous: values[index] for index, previous in enumerate(fields[:position])}
+        condition |= Q(**equal, **{f"{field}__{lookup}": values[position]})
+    return condition
+
+
+class KeysetPage:
+    """Une page de résultats avec les jetons vers la page suivante / précédente."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pagine un queryset sur une clé composite (champ de tri, clé primaire).
+
+    Au lieu d'un OFFSET, chaque page filtre sur la dernière clé vue
+    (``WHERE (a, pk) > (x, y) ORDER BY a, pk LIMIT n``) : avec un index sur
+    ``(a, pk)`` la page N coûte autant que la page 1.
+    """
+
+    def __init__(self, queryset, per_page, ordering=("start_date", "pk")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field, self.tiebreaker = ordering
+        self.pk_name = queryset.model._meta.pk.name if self.tiebreaker == "pk" else self.tiebreaker
+
+    # --- Encodage des jetons ---
+    def encode_cursor(self, obj):
+        value = getattr(obj, self.field)
+        key = [value.isoformat() if hasattr(value, "isoformat") else value, getattr(obj, self.pk_name)]
+        raw = json.dumps(key, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            opts = self.queryset.model._meta
+            return (
+                opts.get_field(self.field).to_python(value),
+                opts.get_field(self.pk_name).to_python(pk),
+            )
+        except Exception as exc:
+            raise InvalidCursor("Curseur de pagination invalide.") from exc
+
+    # --- Construction des pages ---
+    def get_page(self, after=None, before=None):
+        """Renvoie la page qui suit ``after`` ou précède ``before`` (première page par défaut)."""
+        ascending = (self.field, self.pk_name)
+        descending = (f"-{self.field}", f"-{self.pk_name}")
+
+        if before:
+            # On lit à rebours puis on remet les lignes dans l'ordre d'affichage
+            key = self.decode_cursor(before)
+            qs = self.queryset.filter(keyset_filter(ascending, key, reverse=True))
+            rows = list(qs.order_by(*descending)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            previous_cursor = self.encode_cursor(rows[0]) if has_more else None
+            next_cursor = self.encode_cursor(rows[-1]) if rows else None
+            return KeysetPage(rows, next_cursor, previous_cursor)
+
+        qs = self.queryset
+        if after:
+            qs = qs.filter(keyset_filter(ascending, self.decode_cursor(after)))
+        rows = list(qs.order_by(*ascending)[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        next_cursor = self.encode_cursor(rows[-1]) if has_more else None
+        previous_cursor = self.encode_cursor(rows[0]) if after and rows else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
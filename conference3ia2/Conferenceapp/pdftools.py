@@ -0,0 +1,65 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Ce module est exécuté dans les processus de travail (voir processing.py) :
+# il ne doit dépendre ni de Django ni de la base de données.
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf est optionnel, on se rabat sur les outils poppler
+    PdfReader = None
+
+
+class PdfToolsUnavailable(RuntimeError):
+    pass
+
+
+def _run(args, timeout=60):
+    return subprocess.run(args, check=True, capture_output=True, timeout=timeout).stdout
+
+
+def _pages_and_text(path, max_chars):
+    if PdfReader is not None:
+        reader = PdfReader(path)
+        parts, length = [], 0
+        for page in reader.pages:
+            if length >= max_chars:
+                break
+            text = page.extract_text() or ""
+            parts.append(text)
+            length += len(text)
+        return len(reader.pages), "\n".join(parts)[:max_chars]
+
+    if shutil.which("pdfinfo") and shutil.which("pdftotext"):
+        info = _run(["pdfinfo", path]).decode("utf-8", "replace")
+        pages = next(
+            (int(line.split(":", 1)[1]) for line in info.splitlines() if line.startswith("Pages:")), 0
+        )
+        text = _run(["pdftotext", "-enc", "UTF-8", path, "-"]).decode("utf-8", "replace")
+        return pages, text[:max_chars]
+
+    raise PdfToolsUnavailable("Ni pypdf ni poppler (pdfinfo/pdftotext) ne sont installés.")
+
+
+def _thumbnail(path, thumbnail_path, width):
+    if not shutil.which("pdftoppm"):
+        return None
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "page")
+        _run(["pdftoppm", "-png", "-f", "1", "-l", "1", "-singlefile", "-scale-to", str(width), path, prefix])
+        shutil.move(prefix + ".png", thumbnail_path)
+    return thumbnail_path
+
+
+def extract_paper(path, thumbnail_path, max_chars=100_000, thumbnail_width=300):
+    """
+    Analyse un PDF : nombre de pages, texte (tronqué à ``max_chars``) et
+    vignette PNG de la première page écrite dans ``thumbnail_path``.
+    Renvoie un dictionnaire sérialisable (le résultat repasse au processus parent).
+    """
+    pages, text = _pages_and_text(path, max_chars)
+    thumbnail = _thumbnail(path, thumbnail_path, thumbnail_width)
+    return {"pages": pages, "text": text, "thumbnail": thumbnail}
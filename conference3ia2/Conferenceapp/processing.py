@@ -0,0 +1,128 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import PaperAnalysis
+from .pdftools import extract_paper
+from .storage import digest_from_name
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Analyse des articles en tâche de fond
+# -----------------------------
+# À chaque nouvel article, l'extraction (texte, nombre de pages, vignette) est
+# confiée à un pool de processus local, sans broker externe. Les processus de
+# travail ne touchent pas à la base : ils renvoient un résultat que le
+# processus web enregistre dans PaperAnalysis.
+#
+# PAPER_PROCESSING : "pool" (défaut), "sync" (dans la requête, pour le
+# développement) ou "off".
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, "PAPER_PROCESSING_WORKERS", 2),
+                # "spawn" : les processus ne partagent ni threads ni connexions avec le serveur
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def thumbnail_name(submission):
+    key = digest_from_name(submission.paper.name) or submission.pk
+    return f"thumbnails/{key}.png"
+
+
+def schedule_paper_processing(submission, mode=None):
+    mode = mode or getattr(settings, "PAPER_PROCESSING", "pool")
+    if mode == "off" or not submission.paper:
+        return
+    name = submission.paper.name
+    PaperAnalysis.objects.update_or_create(
+        submission_id=submission.pk,
+        defaults={"paper": name, "status": "pending", "error": "", "processed_at": None},
+    )
+    if not submission.paper.storage.exists(name):
+        apply_failure(submission.pk, name, FileNotFoundError(f"Fichier introuvable : {name}"))
+        return
+
+    # Même fichier déjà analysé pour une autre soumission (stockage dédupliqué) : on recopie
+    done = PaperAnalysis.objects.filter(paper=name, status="done").exclude(submission_id=submission.pk).first()
+    if done is not None:
+        apply_result(submission.pk, name, {
+            "pages": done.pages, "text": done.text, "thumbnail": done.thumbnail.name or None,
+        }, absolute=False)
+        return
+
+    args = (
+        submission.paper.path,
+        default_storage.path(thumbnail_name(submission)),
+        getattr(settings, "PAPER_TEXT_MAX_CHARS", 100_000),
+    )
+    if mode == "sync":
+        _run_now(submission.pk, name, args)
+    else:
+        # Après le commit : le fichier et la ligne sont visibles quand le résultat revient
+        transaction.on_commit(lambda: _submit(submission.pk, name, args))
+
+
+def _run_now(pk, name, args):
+    try:
+        apply_result(pk, name, extract_paper(*args))
+    except Exception as exc:
+        apply_failure(pk, name, exc)
+
+
+def _submit(pk, name, args):
+    future = get_executor().submit(extract_paper, *args)
+    future.add_done_callback(lambda f: _on_done(pk, name, f))
+
+
+def _on_done(pk, name, future):
+    # Exécuté dans un thread du pool côté serveur : il utilise sa propre connexion
+    try:
+        try:
+            apply_result(pk, name, future.result())
+        except Exception as exc:
+            apply_failure(pk, name, exc)
+    except Exception:
+        logger.exception("Impossible d'enregistrer l'analyse de %s", pk)
+    finally:
+        connection.close()
+
+
+def apply_result(pk, name, result, absolute=True):
+    thumbnail = result.get("thumbnail") or ""
+    if thumbnail and absolute:
+        thumbnail = os.path.relpath(thumbnail, settings.MEDIA_ROOT).replace(os.sep, "/")
+    # Condition sur paper : si l'article a été remplacé entre-temps, ce résultat est périmé
+    PaperAnalysis.objects.filter(submission_id=pk, paper=name).update(
+        status="done",
+        pages=result.get("pages"),
+        text=result.get("text") or "",
+        thumbnail=thumbnail,
+        error="",
+        processed_at=timezone.now(),
+    )
+
+
+def apply_failure(pk, name, exc):
+    logger.warning("Analyse de l'article %s impossible : %s", name, exc)
+    PaperAnalysis.objects.filter(submission_id=pk, paper=name).update(
+        status="failed", error=str(exc), processed_at=timezone.now()
+    )
@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .models import SubmissionQuota
+
+
+# -----------------------------
+# Quota journalier de soumissions
+# -----------------------------
+# Deux compteurs par soumission :
+#   - (utilisateur, jour), conférence vide : la règle globale SUBMISSIONS_PER_DAY,
+#     toutes conférences confondues ;
+#   - (utilisateur, conférence, jour) : la limite propre à la conférence, si elle en a une.
+# Chaque réservation est un
+#   UPDATE ... SET count = count + 1 WHERE user = ? AND conference ... AND day = ? AND count < limite
+# : la base sérialise les écritures sur la ligne, deux requêtes simultanées
+# ne peuvent donc pas dépasser la limite (contrairement à un COUNT puis INSERT).
+# Les deux UPDATE sont faits dans la même transaction : si la limite de la
+# conférence est atteinte, la place prise dans le quota global est rendue.
+
+class DailyQuotaExceeded(ValidationError):
+    pass
+
+
+def get_daily_limit():
+    """Limite globale par utilisateur et par jour (réglage SUBMISSIONS_PER_DAY)."""
+    return getattr(settings, "SUBMISSIONS_PER_DAY", 3)
+
+
+def _increment(user_id, conference_id, day, limit):
+    rows = SubmissionQuota.objects.filter(user_id=user_id, conference_id=conference_id, day=day)
+    if limit is not None:
+        rows = rows.filter(count__lt=limit)
+    return rows.update(count=F("count") + 1)
+
+
+def _take(user_id, conference_id, day, limit):
+    """Prend une place dans le compteur ``conference_id`` (None = global) ; faux si la limite est atteinte."""
+    if _increment(user_id, conference_id, day, limit):
+        return True
+    # Première soumission du jour : la ligne n'existe pas encore
+    if limit is None or limit > 0:
+        try:
+            with transaction.atomic():
+                SubmissionQuota.objects.create(user_id=user_id, conference_id=conference_id, day=day, count=1)
+            return True
+        except IntegrityError:
+            # Une requête concurrente vient de créer la ligne : on retente l'UPDATE conditionnel
+            return bool(_increment(user_id, conference_id, day, limit))
+    return False
+
+
+def reserve_submission_slot(user_id, conference, day=None, enforce=True):
+    """
+    Consomme une place du quota de ``user_id`` pour ``day`` (aujourd'hui par
+    défaut) : dans le quota global puis dans celui de ``conference``.
+
+    Lève DailyQuotaExceeded si l'une des limites est atteinte. Avec
+    ``enforce=False`` (saisie par le comité dans l'admin) les compteurs sont
+    incrémentés sans contrôle. À appeler dans la transaction qui insère la soumission.
+    """
+    day = day or date.today()
+    limit = get_daily_limit() if enforce else None
+    conference_limit = conference.daily_submission_limit if enforce else None
+
+    # Sans savepoint : l'échec annule la transaction appelante, place globale comprise
+    with transaction.atomic(savepoint=False):
+        # Toujours dans le même ordre (global puis conférence) : pas d'interblocage
+        if not _take(user_id, None, day, limit):
+            raise DailyQuotaExceeded(
+                f"Vous ne pouvez pas soumettre plus de {limit} articles par jour.", code="daily_quota"
+            )
+        if not _take(user_id, conference.pk, day, conference_limit):
+            raise DailyQuotaExceeded(
+                f"Vous ne pouvez pas soumettre plus de {conference_limit} articles par jour à cette conférence.",
+                code="daily_quota",
+            )
+
+
+def release_submission_slot(user_id, conference_id, day):
+    """Rend une place du quota global et de celui de la conférence (suppression d'une soumission)."""
+    SubmissionQuota.objects.filter(
+        Q(conference_id=None) | Q(conference_id=conference_id), user_id=user_id, day=day, count__gt=0
+    ).update(count=F("count") - 1)
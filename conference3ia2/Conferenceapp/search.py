@@ -0,0 +1,280 @@
+import re
+
+from django.db import connection, OperationalError
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+# -----------------------------
+# Recherche plein texte (SQLite FTS5)
+# -----------------------------
+# Les index sont des tables FTS5 "fantômes" tenues à jour par les signaux
+# (voir signals.py). Le rowid de l'index des conférences est conference_id.
+# Les soumissions ont une clé primaire textuelle : la table ordinaire
+# submission_fts_key associe à chacune le rowid de sa ligne d'index
+# (fts_rowid INTEGER PRIMARY KEY, donc stable même après VACUUM ; submission_id
+# UNIQUE, donc indexé). Mises à jour et suppressions passent ainsi par le rowid,
+# sans parcourir l'index.
+
+CONFERENCE_FTS = "conference_fts"
+SUBMISSION_FTS = "submission_fts"
+SUBMISSION_FTS_KEY = "submission_fts_key"
+
+CREATE_INDEX_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {CONFERENCE_FTS} USING fts5("
+    "name, description, location, tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SUBMISSION_FTS} USING fts5("
+    "title, keywords, username, abstract, tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TABLE IF NOT EXISTS {SUBMISSION_FTS_KEY} ("
+    "fts_rowid INTEGER PRIMARY KEY, submission_id VARCHAR(30) NOT NULL UNIQUE)",
+]
+DROP_INDEX_SQL = [
+    f"DROP TABLE IF EXISTS {CONFERENCE_FTS}",
+    f"DROP TABLE IF EXISTS {SUBMISSION_FTS}",
+    f"DROP TABLE IF EXISTS {SUBMISSION_FTS_KEY}",
+]
+
+# Poids bm25 par colonne : un mot du titre compte plus qu'un mot du résumé
+CONFERENCE_WEIGHTS = "10.0, 2.0, 5.0"
+SUBMISSION_WEIGHTS = "10.0, 5.0, 3.0, 1.0"
+
+_available = set()
+
+
+def fts_available(using=connection):
+    """Vrai si la base est SQLite et que les tables FTS5 ont été créées."""
+    if using.vendor != "sqlite":
+        return False
+    if using.alias in _available:
+        return True
+    if CONFERENCE_FTS in using.introspection.table_names():
+        _available.add(using.alias)
+        return True
+    return False
+
+
+def build_match_query(terms):
+    """
+    Transforme la saisie utilisateur en requête MATCH sûre : chaque mot est
+    mis entre guillemets (pas d'opérateurs FTS5 injectés) et recherché en
+    préfixe, les mots étant combinés en ET.
+    """
+    words = re.findall(r"\w+", terms or "")
+    return " ".join(f'"{w}"*' for w in words)
+
+
+# --- Mise à jour de l'index ---
+def index_conference(conference):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {CONFERENCE_FTS} WHERE rowid = %s", [conference.pk])
+        cursor.execute(
+            f"INSERT INTO {CONFERENCE_FTS}(rowid, name, description, location) VALUES (%s, %s, %s, %s)",
+            [conference.pk, conference.name, conference.description, conference.location],
+        )
+
+
+def index_conferences(conference_ids, batch_size=500):
+    """Indexation groupée (insertions par bulk_create, qui ne déclenche pas les signaux)."""
+    if not fts_available():
+        return
+    from .models import Conference
+    conference_ids = list(conference_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(conference_ids), batch_size):
+            ids = conference_ids[start:start + batch_size]
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"DELETE FROM {CONFERENCE_FTS} WHERE rowid IN ({placeholders})", ids)
+            cursor.execute(
+                f"INSERT INTO {CONFERENCE_FTS}(rowid, name, description, location) "
+                f"SELECT conference_id, name, description, location FROM {Conference._meta.db_table} "
+                f"WHERE conference_id IN ({placeholders})",
+                ids,
+            )
+
+
+def unindex_conference(conference):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {CONFERENCE_FTS} WHERE rowid = %s", [conference.pk])
+
+
+def _index_submissions_sql(where=""):
+    """
+    Deux requêtes : rowid attribué aux soumissions qui n'en ont pas encore, puis
+    copie des colonnes dans l'index (``where`` porte sur la soumission ``s``).
+    """
+    from .models import Submission
+    from django.contrib.auth import get_user_model
+    user_model = get_user_model()
+    table = Submission._meta.db_table
+    return [
+        f"INSERT OR IGNORE INTO {SUBMISSION_FTS_KEY}(submission_id) SELECT s.submission_id FROM {table} s {where}",
+        f"INSERT INTO {SUBMISSION_FTS}(rowid, title, keywords, username, abstract) "
+        f"SELECT k.fts_rowid, s.title, s.keywords, u.{user_model.USERNAME_FIELD}, s.abstract "
+        f"FROM {table} s "
+        f"JOIN {SUBMISSION_FTS_KEY} k ON k.submission_id = s.submission_id "
+        f"JOIN {user_model._meta.db_table} u ON u.{user_model._meta.pk.column} = s.user_id {where}",
+    ]
+
+
+def _delete_submission_row(cursor, submission_id):
+    cursor.execute(
+        f"DELETE FROM {SUBMISSION_FTS} WHERE rowid = "
+        f"(SELECT fts_rowid FROM {SUBMISSION_FTS_KEY} WHERE submission_id = %s)",
+        [submission_id],
+    )
+
+
+def index_submission(submission):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        _delete_submission_row(cursor, submission.pk)
+        for sql in _index_submissions_sql("WHERE s.submission_id = %s"):
+            cursor.execute(sql, [submission.pk])
+
+
+def unindex_submission(submission):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        _delete_submission_row(cursor, submission.pk)
+        cursor.execute(f"DELETE FROM {SUBMISSION_FTS_KEY} WHERE submission_id = %s", [submission.pk])
+
+
+def rekey_submission(old_id, new_id):
+    """Identifiant de soumission remplacé : la ligne d'index garde son rowid, seule la clé change."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SUBMISSION_FTS_KEY} SET submission_id = %s WHERE submission_id = %s", [new_id, old_id]
+        )
+
+
+def rename_user(user):
+    """Nom d'utilisateur modifié : mise à jour de la copie portée par l'index des soumissions."""
+    if not fts_available():
+        return
+    from .models import Submission
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SUBMISSION_FTS} SET username = %s WHERE rowid IN ("
+            f"SELECT k.fts_rowid FROM {Submission._meta.db_table} s "
+            f"JOIN {SUBMISSION_FTS_KEY} k ON k.submission_id = s.submission_id WHERE s.user_id = %s)",
+            [user.get_username(), user.pk],
+        )
+
+
+def rebuild_index(using=connection):
+    """Reconstruit entièrement les deux index à partir des tables sources."""
+    from .models import Conference
+    with using.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {CONFERENCE_FTS}")
+        cursor.execute(
+            f"INSERT INTO {CONFERENCE_FTS}(rowid, name, description, location) "
+            f"SELECT conference_id, name, description, location FROM {Conference._meta.db_table}"
+        )
+        cursor.execute(f"DELETE FROM {SUBMISSION_FTS}")
+        cursor.execute(f"DELETE FROM {SUBMISSION_FTS_KEY}")
+        for sql in _index_submissions_sql():
+            cursor.execute(sql)
+
+
+def create_index(using):
+    """Crée les tables FTS5 si SQLite a été compilé avec FTS5 ; renvoie False sinon."""
+    if using.vendor != "sqlite":
+        return False
+    try:
+        with using.cursor() as cursor:
+            for sql in CREATE_INDEX_SQL:
+                cursor.execute(sql)
+    except OperationalError:
+        # "no such module: fts5" : on restera sur le repli LIKE
+        return False
+    return True
+
+
+# --- Requêtes ---
+def _conference_match_sql():
+    return f"SELECT rowid FROM {CONFERENCE_FTS} WHERE {CONFERENCE_FTS} MATCH %s"
+
+
+def _conference_rank_sql():
+    from .models import Conference
+    return (
+        f"SELECT bm25({CONFERENCE_FTS}, {CONFERENCE_WEIGHTS}) FROM {CONFERENCE_FTS} "
+        f"WHERE {CONFERENCE_FTS} MATCH %s AND rowid = {Conference._meta.db_table}.conference_id"
+    )
+
+
+def _submission_match_sql():
+    return (
+        f"SELECT k.submission_id FROM {SUBMISSION_FTS} f JOIN {SUBMISSION_FTS_KEY} k ON k.fts_rowid = f.rowid "
+        f"WHERE f.{SUBMISSION_FTS} MATCH %s"
+    )
+
+
+def _submission_rank_sql():
+    from .models import Submission
+    return (
+        f"SELECT bm25({SUBMISSION_FTS}, {SUBMISSION_WEIGHTS}) FROM {SUBMISSION_FTS} "
+        f"WHERE {SUBMISSION_FTS} MATCH %s AND rowid = "
+        f"(SELECT fts_rowid FROM {SUBMISSION_FTS_KEY} WHERE submission_id = {Submission._meta.db_table}.submission_id)"
+    )
+
+
+def filter_conferences(queryset, terms):
+    """Restreint un queryset de conférences aux correspondances FTS (sans classement)."""
+    return queryset.filter(pk__in=RawSQL(_conference_match_sql(), [build_match_query(terms)]))
+
+
+def filter_submissions(queryset, terms):
+    """Restreint un queryset de soumissions aux correspondances FTS (sans classement)."""
+    return queryset.filter(pk__in=RawSQL(_submission_match_sql(), [build_match_query(terms)]))
+
+
+def search_conferences(terms, queryset=None, limit=50):
+    """Conférences correspondant à ``terms``, classées par pertinence (bm25)."""
+    from .models import Conference
+    queryset = Conference.objects.all() if queryset is None else queryset
+    match = build_match_query(terms)
+    if not match:
+        return queryset.none()
+    if fts_available():
+        return (
+            filter_conferences(queryset, terms)
+            .annotate(rank=RawSQL(_conference_rank_sql(), [match]))
+            .order_by("rank")[:limit]
+        )
+    # Repli pour les autres SGBD : LIKE sur les mêmes colonnes
+    return queryset.filter(_like_filter(terms, ("name", "description", "location")))[:limit]
+
+
+def search_submissions(terms, queryset=None, limit=50):
+    """Soumissions correspondant à ``terms``, classées par pertinence (bm25)."""
+    from .models import Submission
+    queryset = Submission.objects.all() if queryset is None else queryset
+    match = build_match_query(terms)
+    if not match:
+        return queryset.none()
+    if fts_available():
+        return (
+            filter_submissions(queryset, terms)
+            .annotate(rank=RawSQL(_submission_rank_sql(), [match]))
+            .order_by("rank")[:limit]
+        )
+    return queryset.filter(_like_filter(terms, ("title", "keywords", "user__username", "abstract")))[:limit]
+
+
+def _like_filter(terms, fields):
+    query = Q()
+    for word in terms.split():
+        word_query = Q()
+        for field in fields:
+            word_query |= Q(**{f"{field}__icontains": word})
+        query &= word_query
+    return query
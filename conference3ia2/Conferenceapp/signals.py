@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .models import Conference, ConferenceStats, Submission
+from . import search
+from .keywords import sync_submission_keywords
+from .quota import release_submission_slot
+from .storage import acquire_blob, release_blob
+from .processing import schedule_paper_processing
+from .fragments import invalidate_conference_list
+from . import stats
+
+
+# --- Synchronisation de l'index plein texte ---
+@receiver(post_save, sender=Conference)
+def index_conference(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_conference(instance)
+
+
+@receiver(pre_delete, sender=Conference)
+def unindex_conference(sender, instance, **kwargs):
+    search.unindex_conference(instance)
+
+
+@receiver(post_save, sender=Submission)
+def index_submission(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_submission(instance)
+
+
+@receiver(pre_delete, sender=Submission)
+def unindex_submission(sender, instance, **kwargs):
+    search.unindex_submission(instance)
+
+
+# Le nom d'utilisateur est recopié dans l'index des soumissions
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_username(sender, instance, **kwargs):
+    instance._indexed_username = instance.__dict__.get(sender.USERNAME_FIELD)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_renamed_user(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or (update_fields is not None and sender.USERNAME_FIELD not in update_fields):
+        return
+    username = instance.get_username()
+    if username != instance._indexed_username:
+        search.rename_user(instance)
+        instance._indexed_username = username
+
+
+# --- Fragments de pages mis en cache (liste et fiche) ---
+@receiver(post_save, sender=Conference)
+@receiver(post_delete, sender=Conference)
+def invalidate_conference_fragments(sender, instance, **kwargs):
+    invalidate_conference_list(instance.pk)
+
+
+# --- Index des mots-clés ---
+@receiver(post_save, sender=Submission)
+def index_submission_keywords(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_submission_keywords(instance)
+
+
+# --- Quota journalier ---
+@receiver(post_delete, sender=Submission)
+def release_quota(sender, instance, **kwargs):
+    release_submission_slot(instance.user_id, instance.conference_id, instance.submission_date)
+
+
+# --- Références vers les fichiers dédupliqués ---
+@receiver(post_init, sender=Submission)
+def remember_paper(sender, instance, **kwargs):
+    # Lecture directe de __dict__ : ne déclenche pas de requête si le champ est différé
+    value = instance.__dict__.get("paper")
+    instance._stored_paper = getattr(value, "name", value)
+
+
+@receiver(pre_save, sender=Submission)
+def detect_paper_upload(sender, instance, raw=False, **kwargs):
+    # Article en base avant cet enregistrement : les receveurs post_save comparent
+    # à cette valeur, quel que soit leur ordre d'exécution
+    instance._previous_paper = None if instance._state.adding else getattr(instance, "_stored_paper", None)
+    # Fichier pas encore stocké : le stockage prendra lui-même la référence (storage._save)
+    instance._uploading_paper = not raw and not getattr(instance.paper, "_committed", True)
+
+
+def _paper_changed(instance):
+    return instance.paper.name != getattr(instance, "_previous_paper", None)
+
+
+@receiver(post_save, sender=Submission)
+def process_paper(sender, instance, created, raw=False, **kwargs):
+    # Nouvel article : analyse en tâche de fond ; rien à faire (ni requête) s'il est inchangé
+    if not raw and _paper_changed(instance):
+        schedule_paper_processing(instance)
+
+
+@receiver(post_save, sender=Submission)
+def count_paper_reference(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if _paper_changed(instance):
+        if not instance._uploading_paper:
+            acquire_blob(instance.paper.name)
+        release_blob(instance._previous_paper, instance.paper.storage)
+    instance._stored_paper = instance.paper.name
+
+
+@receiver(post_delete, sender=Submission)
+def drop_paper_reference(sender, instance, **kwargs):
+    release_blob(getattr(instance, "_stored_paper", None), instance.paper.storage)
+
+
+# --- Statistiques par conférence (sessions : Sessionapp/signals.py) ---
+@receiver(post_save, sender=Conference)
+def create_conference_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ConferenceStats.objects.get_or_create(conference=instance)
+
+
+@receiver(post_init, sender=Submission)
+def remember_submission_stats(sender, instance, **kwargs):
+    instance._stats_state = stats.stats_state(instance, stats.SUBMISSION_STATS_FIELDS)
+
+
+@receiver(pre_save, sender=Submission)
+def load_submission_stats(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.complete_stats_state(sender, instance, stats.SUBMISSION_STATS_FIELDS)
+
+
+@receiver(post_save, sender=Submission)
+def count_submission(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new = stats.stats_state(instance, stats.SUBMISSION_STATS_FIELDS, None if created else instance._stats_state)
+    stats.record_submission_change(None if created else instance._stats_state, new)
+    instance._stats_state = new
+
+
+@receiver(post_delete, sender=Submission)
+def uncount_submission(sender, instance, **kwargs):
+    if instance._stats_state and None not in instance._stats_state:
+        stats.record_submission_change(instance._stats_state, None)
@@ -0,0 +1,220 @@
+from collections import Counter
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .fragments import invalidate_conference_details
+from .models import Conference, ConferenceDayStats, ConferenceStats, Submission
+
+
+# -----------------------------
+# Statistiques par conférence
+# -----------------------------
+# ConferenceStats (une ligne par conférence) et ConferenceDayStats (sessions
+# par jour) sont tenues à jour par des UPDATE ... SET n = n + delta à chaque
+# enregistrement ou suppression d'une soumission ou d'une session (voir
+# signals.py) et par les changements d'état en masse (transitions.py), qui
+# passent par QuerySet.update() et ne déclenchent donc pas les signaux.
+# Lire les statistiques d'une conférence coûte une ligne, quel que soit le
+# nombre de soumissions. La commande rebuild_conference_stats recalcule tout.
+# Chaque modification invalide la fiche de la conférence mise en cache (fragments.py).
+
+STATUS_FIELDS = {
+    "submitted": "submitted",
+    "under review": "under_review",
+    "accepted": "accepted",
+    "rejected": "rejected",
+}
+
+
+def get_stats(conference):
+    """Statistiques de ``conference`` (une ligne vide non enregistrée si elles n'existent pas)."""
+    try:
+        return conference.stats
+    except ConferenceStats.DoesNotExist:
+        return ConferenceStats(conference=conference)
+
+
+# --- État enregistré des objets comptés ---
+# L'état en base (lu à l'instanciation par un receveur post_init) sert à calculer
+# l'écart au prochain enregistrement ; les champs différés sont relus en pre_save.
+# Les receveurs sont dans Conferenceapp/signals.py (soumissions) et
+# Sessionapp/signals.py (sessions).
+SUBMISSION_STATS_FIELDS = ("conference_id", "status", "payed")
+SESSION_STATS_FIELDS = ("conference_id", "session_day")
+
+
+def stats_state(instance, fields, previous=None):
+    # Un champ différé n'a pas été enregistré : il garde sa valeur précédente
+    previous = previous or (None,) * len(fields)
+    return tuple(instance.__dict__.get(name, old) for name, old in zip(fields, previous))
+
+
+def complete_stats_state(sender, instance, fields):
+    if instance._state.adding or None not in instance._stats_state:
+        return
+    instance._stats_state = sender._default_manager.filter(pk=instance.pk).values_list(*fields).first()
+
+
+# --- Calcul des écarts ---
+def _submission_fields(status=None, payed=False):
+    fields = Counter(submissions=1)
+    if status in STATUS_FIELDS:
+        fields[STATUS_FIELDS[status]] += 1
+    if payed:
+        fields["payed"] += 1
+    return fields
+
+
+def _entry(deltas, conference_id):
+    return deltas.setdefault(conference_id, (Counter(), Counter()))
+
+
+def submission_deltas(old, new):
+    """
+    Écarts entre deux états (conference_id, status, payed) d'une soumission
+    (None : absente), sous la forme {conference_id: (champs, jours)}.
+    """
+    deltas = {}
+    if old is not None:
+        _entry(deltas, old[0])[0].subtract(_submission_fields(old[1], old[2]))
+    if new is not None:
+        _entry(deltas, new[0])[0].update(_submission_fields(new[1], new[2]))
+    return deltas
+
+
+def session_deltas(old, new):
+    """Écarts entre deux états (conference_id, session_day) d'une session."""
+    deltas = {}
+    if old is not None:
+        fields, days = _entry(deltas, old[0])
+        fields["sessions"] -= 1
+        days[old[1]] -= 1
+    if new is not None:
+        fields, days = _entry(deltas, new[0])
+        fields["sessions"] += 1
+        days[new[1]] += 1
+    return deltas
+
+
+# --- Application ---
+def _increments(fields):
+    return {
+        name: F(name) + delta if delta > 0 else Greatest(F(name) + delta, 0)
+        for name, delta in fields.items()
+    }
+
+
+def _bump_day(conference_id, day, delta):
+    rows = ConferenceDayStats.objects.filter(conference_id=conference_id, day=day)
+    if rows.update(**_increments({"sessions": delta})) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ConferenceDayStats.objects.create(conference_id=conference_id, day=day, sessions=delta)
+    except IntegrityError:
+        rows.update(**_increments({"sessions": delta}))
+
+
+def apply_deltas(deltas):
+    """
+    Applique les écarts. À appeler après l'écriture de la ligne source, dans
+    la même transaction : si les statistiques d'une conférence n'existent pas
+    encore, elles sont recalculées (écriture comprise) au lieu d'être incrémentées.
+    """
+    invalidate_conference_details(deltas)
+    for conference_id, (fields, days) in deltas.items():
+        fields = {name: delta for name, delta in fields.items() if delta}
+        days = {day: delta for day, delta in days.items() if delta}
+        if not fields and not days:
+            continue
+        updated = ConferenceStats.objects.filter(conference_id=conference_id).update(
+            updated_at=timezone.now(), **_increments(fields)
+        )
+        if not updated:
+            # Rien à retirer d'une conférence sans statistiques (ou en cours de suppression)
+            if any(delta > 0 for delta in fields.values()) or any(delta > 0 for delta in days.values()):
+                try:
+                    rebuild_conference_stats([conference_id])
+                except IntegrityError:
+                    # Recalcul concurrent déjà enregistré : il compte peut-être déjà cette écriture,
+                    # l'écart restant sera corrigé par rebuild_conference_stats
+                    pass
+            continue
+        for day, delta in days.items():
+            _bump_day(conference_id, day, delta)
+
+
+def record_submission_change(old, new):
+    apply_deltas(submission_deltas(old, new))
+
+
+def record_session_change(old, new):
+    apply_deltas(session_deltas(old, new))
+
+
+def record_bulk_change(field, new_value, rows):
+    """
+    Changement ``field`` -> ``new_value`` fait par QuerySet.update() ;
+    ``rows`` : couples (conference_id, ancienne valeur).
+    """
+    deltas = {}
+    for conference_id, old in rows:
+        fields = _entry(deltas, conference_id)[0]
+        fields.subtract(_submission_fields(**{field: old}))
+        fields.update(_submission_fields(**{field: new_value}))
+    apply_deltas(deltas)
+
+
+# --- Recalcul complet ---
+def rebuild_conference_stats(conference_ids=None):
+    """
+    Recalcule les statistiques à partir des tables sources, pour les
+    conférences ``conference_ids`` ou pour toutes. Renvoie le nombre de conférences traitées.
+    """
+    Session = apps.get_model("Sessionapp", "Session")
+    conferences = Conference.objects.order_by()
+    submissions = Submission.objects.order_by()
+    sessions = Session.objects.order_by()
+    if conference_ids is not None:
+        conferences = conferences.filter(pk__in=conference_ids)
+        submissions = submissions.filter(conference_id__in=conference_ids)
+        sessions = sessions.filter(conference_id__in=conference_ids)
+
+    status_counts = {
+        name: Count("pk", filter=Q(status=status)) for status, name in STATUS_FIELDS.items()
+    }
+    per_conference = {
+        row.pop("conference_id"): row
+        for row in submissions.values("conference_id").annotate(
+            submissions=Count("pk"), payed=Count("pk", filter=Q(payed=True)), **status_counts
+        )
+    }
+    per_day = list(sessions.values("conference_id", "session_day").annotate(total=Count("pk")))
+    session_totals = Counter()
+    for row in per_day:
+        session_totals[row["conference_id"]] += row["total"]
+
+    ids = list(conferences.values_list("pk", flat=True))
+    invalidate_conference_details(ids)
+    with transaction.atomic():
+        ConferenceStats.objects.filter(conference_id__in=ids).delete()
+        ConferenceDayStats.objects.filter(conference_id__in=ids).delete()
+        ConferenceStats.objects.bulk_create(
+            [
+                ConferenceStats(conference_id=pk, sessions=session_totals[pk], **per_conference.get(pk, {}))
+                for pk in ids
+            ],
+            batch_size=500,
+        )
+        ConferenceDayStats.objects.bulk_create(
+            [
+                ConferenceDayStats(conference_id=row["conference_id"], day=row["session_day"], sessions=row["total"])
+                for row in per_day
+            ],
+            batch_size=500,
+        )
+    return len(ids)
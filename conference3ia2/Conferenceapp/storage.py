@@ -0,0 +1,132 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import transaction
+from django.db.models import F
+
+
+# -----------------------------
+# Stockage adressé par contenu des articles
+# -----------------------------
+# Chaque fichier est enregistré une seule fois sous son empreinte SHA-256
+# (paper/sha256/ab/abcdef....pdf). Un ré-envoi du même PDF ne réécrit rien :
+# la soumission pointe simplement sur le fichier existant. Le nombre de
+# soumissions qui référencent un fichier est tenu dans PaperBlob.refcount
+# (pris à l'enregistrement du fichier, rendu par signals.py) et le fichier
+# est supprimé quand il n'est plus utilisé.
+
+DIGEST_RE = re.compile(r"/sha256/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(\.[^/]*)?$")
+
+
+def get_paper_storage():
+    # Appelable référencé par Submission.paper (le backend est choisi dans STORAGES["papers"])
+    return storages["papers"]
+
+
+def digest_from_name(name):
+    """Empreinte contenue dans un nom de fichier du stockage, ou None (ancien fichier)."""
+    match = DIGEST_RE.search("/" + (name or ""))
+    return match.group("digest") if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    chunk_size = 64 * 1024
+
+    def get_available_name(self, name, max_length=None):
+        # Le nom définitif dépend du contenu : pas de suffixe aléatoire
+        return name
+
+    def blob_name(self, directory, digest, extension):
+        return posixpath.join(directory, "sha256", digest[:2], digest + extension)
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        tmp_dir = self.path(posixpath.join(directory, "tmp"))
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        # Copie en flux vers un fichier temporaire en calculant l'empreinte au passage
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=extension)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                if hasattr(content, "seek") and content.seekable():
+                    content.seek(0)
+                for chunk in content.chunks(self.chunk_size):
+                    sha.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            final_name = self.blob_name(directory, sha.hexdigest(), extension)
+            final_path = self.path(final_name)
+            from .models import PaperBlob
+            # La référence est prise dans la transaction de l'enregistrement de la
+            # soumission, sous le verrou de la ligne PaperBlob : une suppression
+            # concurrente (collect_blob) attend ou voit la nouvelle référence.
+            with transaction.atomic():
+                PaperBlob.objects.select_for_update().get_or_create(
+                    digest=sha.hexdigest(), defaults={"name": final_name, "size": size}
+                )
+                PaperBlob.objects.filter(digest=sha.hexdigest()).update(refcount=F("refcount") + 1)
+                if os.path.exists(final_path):
+                    # Contenu déjà stocké : rien à écrire
+                    os.remove(tmp_path)
+                else:
+                    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                    os.replace(tmp_path, final_path)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(final_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return final_name
+
+
+# --- Comptage des références ---
+# Un fichier enregistré par le stockage (_save) compte déjà pour la soumission
+# qui l'enregistre ; acquire_blob sert aux noms affectés sans passer par lui.
+def acquire_blob(name):
+    """Une soumission de plus référence le fichier ``name``."""
+    digest = digest_from_name(name)
+    if digest:
+        from .models import PaperBlob
+        PaperBlob.objects.filter(digest=digest).update(refcount=F("refcount") + 1)
+
+
+def release_blob(name, storage=None):
+    """Une soumission de moins référence ``name`` ; le fichier est supprimé à zéro référence."""
+    digest = digest_from_name(name)
+    if not digest:
+        return
+    from .models import PaperBlob
+    PaperBlob.objects.filter(digest=digest, refcount__gt=0).update(refcount=F("refcount") - 1)
+    if PaperBlob.objects.filter(digest=digest, refcount=0).exists():
+        storage = storage or get_paper_storage()
+        transaction.on_commit(lambda: collect_blob(name, storage))
+
+
+def collect_blob(name, storage=None):
+    """
+    Supprime le fichier ``name`` et sa ligne PaperBlob si plus aucune
+    soumission ne le référence. Le compteur est relu sous verrou : un envoi
+    identique arrivé entre-temps garde le fichier. Sert aussi après l'échec
+    d'un enregistrement (la ligne créée par _save a été annulée avec lui).
+    """
+    digest = digest_from_name(name)
+    if not digest:
+        return
+    from .models import PaperBlob
+    storage = storage or get_paper_storage()
+    with transaction.atomic():
+        blob, _ = PaperBlob.objects.select_for_update().get_or_create(
+            digest=digest, defaults={"name": name, "size": 0}
+        )
+        if blob.refcount == 0:
+            blob.delete()
+            storage.delete(name)
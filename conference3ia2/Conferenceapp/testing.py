@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+from .models import Conference, Submission
+
+
+# -----------------------------
+# Fabriques partagées par les tests des applications
+# -----------------------------
+
+def make_conference(**kwargs):
+    values = {
+        "name": "Conférence test",
+        "theme": "IA",
+        "location": "Tunis",
+        "description": "Une description suffisamment longue pour être valide.",
+        "start_date": date.today() + timedelta(days=30),
+        "end_date": date.today() + timedelta(days=32),
+    }
+    values.update(kwargs)
+    return Conference.objects.create(**values)
+
+
+def make_submission(user, conference, **kwargs):
+    values = {
+        "title": "Soumission",
+        "abstract": "Résumé",
+        "keywords": "ia, test",
+        "paper": "paper/test.pdf",
+        "status": "submitted",
+        "user": user,
+        "conference": conference,
+    }
+    values.update(kwargs)
+    return Submission.objects.create(**values)
@@ -1,3 +1,1152 @@
-from django.test import TestCase
+import csv
+import importlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, IntegrityError, OperationalError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone
+
+from .models import (
+    ChunkedUpload, Conference, ConferenceDayStats, ConferenceStats, Organizingcommitee, PaperAnalysis, PaperBlob,
+    Submission, SubmissionHistory, SubmissionKeyword, SubmissionQuota, generate_submission_id, validate_keywords,
+)
+from .quota import DailyQuotaExceeded, reserve_submission_slot
+from .admin_tools import EstimatedCountPaginator
+from .conference_choices import open_conference_choices, use_autocomplete
+from .forms import ConferenceAutocompleteWidget, SubmissionForm
+from .views import can_download_paper
+from .pagination import InvalidCursor, KeysetPaginator
+from .stats import rebuild_conference_stats
+from .testing import make_conference, make_submission
+from . import exports
+from . import fragments
+from . import imports
+from . import keywords
+from . import processing
+from . import search
+from . import transitions
+from . import uploads
+from Sessionapp.models import Session
+from Userapp.models import User
+
+
+class SubmissionQuotaTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="alice", email="alice@esprit.tn", password="secret")
+        self.conference = make_conference()
+
+    def counts(self):
+        return dict(SubmissionQuota.objects.filter(user=self.user).values_list("conference_id", "count"))
+
+    def test_limit_is_enforced(self):
+        for _ in range(3):
+            make_submission(self.user, self.conference)
+        with self.assertRaises(DailyQuotaExceeded):
+            make_submission(self.user, self.conference)
+        self.assertEqual(Submission.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.counts(), {None: 3, self.conference.pk: 3})
+
+    def test_global_limit_spans_conferences(self):
+        # Une conférence généreuse ne lève pas la règle globale de 3 par jour
+        large = make_conference(daily_submission_limit=10)
+        make_submission(self.user, self.conference)
+        make_submission(self.user, self.conference)
+        make_submission(self.user, large)
+        with self.assertRaises(DailyQuotaExceeded):
+            make_submission(self.user, large)
+        self.assertEqual(self.counts(), {None: 3, self.conference.pk: 2, large.pk: 1})
+
+    def test_limit_per_conference(self):
+        small = make_conference(daily_submission_limit=1)
+        make_submission(self.user, small)
+        with self.assertRaises(DailyQuotaExceeded):
+            make_submission(self.user, small)
+        make_submission(self.user, self.conference)
+        # Le refus de la conférence a rendu la place prise dans le quota global
+        self.assertEqual(self.counts(), {None: 2, small.pk: 1, self.conference.pk: 1})
+
+    @override_settings(SUBMISSIONS_PER_DAY=10)
+    def test_each_conference_counts_its_own_submissions(self):
+        # Deux soumissions ailleurs n'entament pas la limite de 1 ...
+        make_submission(self.user, self.conference)
+        make_submission(self.user, self.conference)
+        small = make_conference(daily_submission_limit=1)
+        make_submission(self.user, small)
+        # ... et une conférence généreuse ne lève pas la limite des autres
+        large = make_conference(daily_submission_limit=20)
+        for _ in range(4):
+            make_submission(self.user, large)
+        with self.assertRaises(DailyQuotaExceeded):
+            make_submission(self.user, small)
+        for _ in range(3):
+            make_submission(self.user, self.conference)
+        # La règle globale s'applique en plus
+        with self.assertRaises(DailyQuotaExceeded):
+            make_submission(self.user, large)
+        self.assertEqual(self.counts(), {None: 10, self.conference.pk: 5, small.pk: 1, large.pk: 4})
+
+    def test_delete_releases_slot(self):
+        submissions = [make_submission(self.user, self.conference) for _ in range(3)]
+        submissions[0].delete()
+        make_submission(self.user, self.conference)
+        self.assertEqual(self.counts(), {None: 3, self.conference.pk: 3})
+
+    def test_reservation_is_two_conditional_updates(self):
+        make_submission(self.user, self.conference)
+        with self.assertNumQueries(2):
+            reserve_submission_slot(self.user.pk, self.conference)
+
+
+class SubmissionQuotaConcurrencyTests(TransactionTestCase):
+    def test_parallel_submits_do_not_overshoot(self):
+        user = User.objects.create_user(username="bob", email="bob@esprit.tn", password="secret")
+        conference = make_conference()
+        workers = 10
+        barrier = threading.Barrier(workers)
+        results = []
+
+        def submit():
+            barrier.wait()
+            try:
+                while True:
+                    try:
+                        make_submission(user, conference)
+                        results.append("ok")
+                        break
+                    except DailyQuotaExceeded:
+                        results.append("refused")
+                        break
+                    except OperationalError:
+                        # Base verrouillée par un autre thread (SQLite) : on retente
+                        continue
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count("ok"), 3)
+        self.assertEqual(results.count("refused"), workers - 3)
+        self.assertEqual(Submission.objects.filter(user=user).count(), 3)
+        self.assertEqual(SubmissionQuota.objects.get(user=user, conference=None).count, 3)
+        self.assertEqual(SubmissionQuota.objects.get(user=user, conference=conference).count, 3)
+
+
+class SubmissionIdTests(TestCase):
+    def test_ids_are_prefixed_unique_and_sorted(self):
+        ids = [generate_submission_id() for _ in range(10000)]
+        self.assertTrue(all(i.startswith("SUB-") and len(i) == 30 for i in ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids, sorted(ids))
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Trois conférences le même jour : l'ordre est départagé par la clé primaire
+        start = date.today() + timedelta(days=5)
+        self.conferences = [
+            make_conference(
+                name=f"Conf {index}", start_date=start + timedelta(days=index // 3), end_date=start + timedelta(days=5)
+            )
+            for index in range(7)
+        ]
+        self.paginator = KeysetPaginator(Conference.objects.all(), 3, ordering=("start_date", "conference_id"))
+
+    def names(self, page):
+        return [conference.name for conference in page]
+
+    def test_cursor_round_trip(self):
+        conference = self.conferences[4]
+        key = self.paginator.decode_cursor(self.paginator.encode_cursor(conference))
+        self.assertEqual(key, (conference.start_date, conference.pk))
+
+    def test_pages_follow_each_other_across_ties(self):
+        seen = []
+        page = self.paginator.get_page()
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(self.names(page))
+            if not page.has_next:
+                break
+            page = self.paginator.get_page(after=page.next_cursor)
+        self.assertEqual(seen, [f"Conf {index}" for index in range(7)])
+        self.assertEqual(len(page), 1)
+
+    def test_previous_page(self):
+        second = self.paginator.get_page(after=self.paginator.get_page().next_cursor)
+        self.assertEqual(self.names(second), ["Conf 3", "Conf 4", "Conf 5"])
+        first = self.paginator.get_page(before=second.previous_cursor)
+        self.assertEqual(self.names(first), ["Conf 0", "Conf 1", "Conf 2"])
+        self.assertFalse(first.has_previous)
+        self.assertEqual(self.names(self.paginator.get_page(after=first.next_cursor)), self.names(second))
+
+    def test_invalid_cursor(self):
+        for token in ("pas-un-jeton", "WyJ4Il0", ""):
+            with self.subTest(token=token), self.assertRaises(InvalidCursor):
+                self.paginator.decode_cursor(token)
+        url = reverse("liste_conferences")
+        self.assertEqual(self.client.get(url, {"after": "pas-un-jeton"}).status_code, 404)
+        self.assertEqual(self.client.get(url, {"before": "WyJ4Il0"}).status_code, 404)
+
+    @override_settings(CONFERENCES_PAGE_SIZE=3)
+    def test_list_view_links_pages(self):
+        response = self.client.get(reverse("liste_conferences"))
+        page = response.context["page"]
+        self.assertContains(response, f"?after={page.next_cursor}")
+        response = self.client.get(reverse("liste_conferences"), {"after": page.next_cursor})
+        self.assertContains(response, "<td>Conf 3</td>")
+        self.assertNotContains(response, "<td>Conf 2</td>")
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20)
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="lina", email="lina@esprit.tn", password="secret")
+        self.conference = make_conference(name="Apprentissage automatique", location="Sousse")
+
+    def titles(self, terms, **kwargs):
+        return [submission.title for submission in search.search_submissions(terms, **kwargs)]
+
+    def names(self, terms):
+        return [conference.name for conference in search.search_conferences(terms)]
+
+    def test_match_query_quotes_every_word(self):
+        self.assertEqual(search.build_match_query('vision "OR profond*'), '"vision"* "OR"* "profond"*')
+        self.assertEqual(search.build_match_query("  -- "), "")
+        self.assertEqual(self.names("--"), [])
+
+    def test_conference_index_follows_signals(self):
+        self.assertEqual(self.names("apprent sousse"), ["Apprentissage automatique"])
+        self.conference.name = "Vision artificielle"
+        self.conference.save()
+        self.assertEqual(self.names("apprentissage"), [])
+        self.assertEqual(self.names("visión"), ["Vision artificielle"])
+        self.conference.delete()
+        self.assertEqual(self.names("vision"), [])
+
+    def test_submission_index_follows_signals_and_ranks_titles_first(self):
+        abstract = make_submission(self.user, self.conference, title="Graphes", abstract="réseaux de neurones")
+        title = make_submission(self.user, self.conference, title="Réseaux de neurones", abstract="graphes")
+        self.assertEqual(self.titles("reseaux"), ["Réseaux de neurones", "Graphes"])
+        self.assertEqual(self.titles("reseaux", queryset=Submission.objects.filter(pk=abstract.pk)), ["Graphes"])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT k.submission_id FROM {search.SUBMISSION_FTS} f "
+                f"JOIN {search.SUBMISSION_FTS_KEY} k ON k.fts_rowid = f.rowid ORDER BY k.submission_id"
+            )
+            self.assertEqual([row[0] for row in cursor.fetchall()], sorted([abstract.pk, title.pk]))
+        title.delete()
+        self.assertEqual(self.titles("reseaux"), ["Graphes"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT submission_id FROM {search.SUBMISSION_FTS_KEY}")
+            self.assertEqual(cursor.fetchall(), [(abstract.pk,)])
+
+    def test_index_writes_go_through_the_rowid(self):
+        submission = make_submission(self.user, self.conference, title="Graphes")
+        with CaptureQueriesContext(connection) as queries:
+            search.index_submission(submission)
+            search.unindex_submission(submission)
+            search.rename_user(self.user)
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query["sql"]
+                if sql.startswith(("DELETE", "UPDATE")) and search.SUBMISSION_FTS + " " in sql:
+                    cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                    plan = [row[-1] for row in cursor.fetchall()]
+                    # « INDEX 0:= » : accès par rowid ; « INDEX 0: » seul serait un parcours complet
+                    self.assertIn(f"SCAN {search.SUBMISSION_FTS} VIRTUAL TABLE INDEX 0:=", plan, sql)
+
+    def test_renaming_a_user_reindexes_the_username(self):
+        make_submission(self.user, self.conference, title="Graphes")
+        self.user.username = "lina_b"
+        self.user.save()
+        self.assertEqual(self.titles("lina_b"), ["Graphes"])
+        self.assertEqual(self.titles("lina"), ["Graphes"])  # préfixe
+        self.assertEqual(self.titles("linab"), [])
+        # Les autres enregistrements (dernière connexion...) ne touchent pas l'index
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=["last_login"])
+
+    def test_rebuild_command(self):
+        make_submission(self.user, self.conference, title="Graphes")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.SUBMISSION_FTS}")
+            cursor.execute(f"DELETE FROM {search.SUBMISSION_FTS_KEY}")
+            cursor.execute(f"DELETE FROM {search.CONFERENCE_FTS}")
+        self.assertEqual(self.titles("graphes"), [])
+        call_command("rebuild_search_index", stdout=io.StringIO())
+        self.assertEqual(self.titles("graphes"), ["Graphes"])
+        self.assertEqual(self.names("sousse"), ["Apprentissage automatique"])
+
+    def test_migrating_ids_keeps_relations_and_index(self):
+        submission = make_submission(self.user, self.conference, submission_id="SUB-ABCDEFGH", title="Graphes")
+        SubmissionHistory.objects.create(submission=submission, field="status", old_value="draft", new_value="submitted")
+        call_command("migrate_submission_ids", stdout=io.StringIO())
+        migrated = Submission.objects.get()
+        self.assertNotEqual(migrated.pk, "SUB-ABCDEFGH")
+        self.assertEqual(SubmissionHistory.objects.get().submission_id, migrated.pk)
+        self.assertEqual(set(SubmissionKeyword.objects.values_list("submission_id", flat=True)), {migrated.pk})
+        self.assertEqual([found.pk for found in search.search_submissions("graphes")], [migrated.pk])
+        migrated.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {search.SUBMISSION_FTS_KEY}")
+            self.assertEqual(cursor.fetchone(), (0,))
+
+    def test_search_view(self):
+        make_submission(self.user, self.conference, title="Graphes")
+        response = self.client.get(reverse("search"), {"q": "graphes"})
+        self.assertNotContains(response, "<td>Graphes</td>")
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("search"), {"q": "graphes"})
+        self.assertContains(response, "<td>Graphes</td>")
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20, KEYWORD_PAGE_SIZE=2)
+class KeywordIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="malik", email="malik@esprit.tn")
+        self.conference = make_conference()
+        self.first = make_submission(self.user, self.conference, keywords="Réseaux, vision")
+        self.second = make_submission(self.user, self.conference, keywords="reseaux, Graphes")
+        self.third = make_submission(self.user, self.conference, keywords="RÉSEAUX")
+        make_submission(self.user, make_conference(name="Autre"), keywords="vision")
+        self.member = User.objects.create_user(username="nadia", email="nadia@esprit.tn")
+        Organizingcommitee.objects.create(
+            user=self.member, conference=self.conference, commitee_role="member", date_joined=date.today()
+        )
+        self.url = reverse("conference_keywords", args=[self.conference.pk])
+
+    def test_facets_and_lookup(self):
+        facets = list(keywords.keyword_facets(self.conference))
+        self.assertEqual([(f["keyword"], f["count"]) for f in facets], [("reseaux", 3), ("graphes", 1), ("vision", 1)])
+        found = keywords.submissions_with_keyword("Vision", Submission.objects.filter(conference=self.conference))
+        self.assertEqual(list(found), [self.first])
+
+    def test_index_follows_edits(self):
+        self.first.keywords = "RESEAUX, Détection"
+        self.first.save()
+        labels = dict(SubmissionKeyword.objects.filter(submission=self.first).values_list("keyword", "label"))
+        self.assertEqual(labels, {"reseaux": "RESEAUX", "detection": "Détection"})
+        self.first.conference = Conference.objects.get(name="Autre")
+        self.first.save()
+        self.assertEqual(
+            set(SubmissionKeyword.objects.filter(submission=self.first).values_list("conference_id", flat=True)),
+            {self.first.conference_id},
+        )
+
+    def test_validation_counts_entries_as_typed(self):
+        with self.assertRaises(ValidationError):
+            validate_keywords(", ".join(["ia"] * 11))
+        validate_keywords(", ".join(f"mot {index}" for index in range(10)))
+
+    def test_endpoint(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.member)
+        facets = self.client.get(self.url).json()["results"]
+        self.assertEqual(facets[0], {"keyword": "reseaux", "label": "RÉSEAUX", "count": 3})
+        self.assertEqual(len(facets), 2)
+
+        page = self.client.get(self.url, {"keyword": "réseaux"}).json()
+        self.assertEqual([row["submission_id"] for row in page["results"]], [self.first.pk, self.second.pk])
+        page = self.client.get(self.url, {"keyword": "réseaux", "after": page["next"]}).json()
+        self.assertEqual(([row["submission_id"] for row in page["results"]], page["next"]), ([self.third.pk], None))
+        self.assertEqual(self.client.get(reverse("conference_keywords", args=[9999])).status_code, 404)
+
+
+class PaperStorageTests(TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, PAPER_PROCESSING="off")
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.user = User.objects.create_user(username="carol", email="carol@esprit.tn", password="secret")
+        self.conference = make_conference()
+
+    def upload(self, data, name="article.pdf"):
+        return make_submission(self.user, self.conference, paper=ContentFile(data, name=name))
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.upload(b"%PDF-1.4 contenu")
+        second = self.upload(b"%PDF-1.4 contenu", name="copie.pdf")
+        self.assertEqual(first.paper.name, second.paper.name)
+        self.assertEqual(PaperBlob.objects.get().refcount, 2)
+
+        path = first.paper.path
+        first.delete()
+        self.assertTrue(os.path.exists(path))
+        second.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(PaperBlob.objects.exists())
+
+    def test_identical_upload_during_release_keeps_the_file(self):
+        first = self.upload(b"%PDF-1.4 contenu")
+        path = first.paper.path
+        with transaction.atomic():
+            first.delete()  # dernière référence : suppression prévue à la validation
+            second = self.upload(b"%PDF-1.4 contenu", name="copie.pdf")
+        self.assertEqual(second.paper.path, path)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(PaperBlob.objects.get().refcount, 1)
+
+    def test_failed_insert_leaves_no_blob_behind(self):
+        shared = self.upload(b"%PDF-1.4 commun")
+        for data in (b"%PDF-1.4 nouveau", b"%PDF-1.4 commun"):
+            duplicate = Submission(
+                submission_id=shared.pk, title="Doublon", abstract="Résumé", keywords="ia", status="submitted",
+                user=self.user, conference=self.conference, paper=ContentFile(data, name="doublon.pdf"),
+            )
+            with self.assertRaises(IntegrityError):
+                duplicate.save()
+        self.assertEqual(list(PaperBlob.objects.values_list("name", "refcount")), [(shared.paper.name, 1)])
+        self.assertTrue(os.path.exists(shared.paper.path))
+        blobs_dir = os.path.dirname(os.path.dirname(shared.paper.path))
+        stored = [name for _, _, files in os.walk(blobs_dir) for name in files]
+        self.assertEqual(stored, [os.path.basename(shared.paper.path)])
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, PAPER_PROCESSING="off")
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.user = User.objects.create_user(username="paula", email="paula@esprit.tn")
+        self.client.force_login(self.user)
+        self.data = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+    def start(self, size=None):
+        response = self.client.post(
+            reverse("upload_init"), {"filename": "article.pdf", "size": size or len(self.data)},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["upload_id"]
+
+    def put(self, upload_id, offset, data):
+        return self.client.put(
+            f"{reverse('upload_chunk', args=[upload_id])}?offset={offset}", data,
+            content_type="application/octet-stream",
+        )
+
+    def test_chunks_resume_and_finalize(self):
+        upload_id = self.start()
+        self.assertEqual(self.put(upload_id, 0, self.data[:400]).json()["offset"], 400)
+        # Morceau rejoué ou sauté : refusé, l'offset courant est rappelé au client
+        for offset in (0, 500):
+            response = self.put(upload_id, offset, self.data[offset:offset + 100])
+            self.assertEqual((response.status_code, response.json()["offset"]), (409, 400))
+        finalize = reverse("upload_finalize", args=[upload_id])
+        self.assertEqual(self.client.post(finalize).status_code, 400)
+
+        self.assertEqual(self.client.get(reverse("upload_chunk", args=[upload_id])).json()["offset"], 400)
+        self.put(upload_id, 400, self.data[400:])
+        self.assertTrue(self.client.post(finalize).json()["completed"])
+        with open(uploads.part_path(ChunkedUpload.objects.get()), "rb") as part:
+            self.assertEqual(part.read(), self.data)
+        self.assertEqual(self.put(upload_id, len(self.data), b"x").status_code, 409)
+
+    def test_finalize_checks_the_content(self):
+        upload_id = self.start(size=8)
+        self.put(upload_id, 0, b"PK\x03\x04 zip")
+        response = self.client.post(reverse("upload_finalize", args=[upload_id]))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("PDF", response.json()["error"])
+
+    def test_concurrent_writes_at_the_same_offset_do_not_interleave(self):
+        upload = uploads.start_upload(self.user, "article.pdf", 8)
+        stale = ChunkedUpload.objects.get(pk=upload.pk)
+        uploads.write_chunk(upload, 0, io.BytesIO(b"AAAA"), 4)
+        with self.assertRaises(ValidationError):
+            uploads.write_chunk(stale, 0, io.BytesIO(b"BBBBBBBB"), 8)
+        with open(uploads.part_path(upload), "rb") as part:
+            self.assertEqual(part.read(), b"AAAA")
+        self.assertEqual(ChunkedUpload.objects.get().offset, 4)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(uploads.part_path(upload)))), [f"{upload.upload_id}.part"])
+
+    def test_submission_form_uses_the_assembled_file(self):
+        conference = make_conference()
+        upload = uploads.start_upload(self.user, "article.pdf", len(self.data))
+        uploads.write_chunk(upload, 0, io.BytesIO(self.data), len(self.data))
+        uploads.finalize_upload(upload)
+        data = {"upload_id": upload.pk, "conference": conference.pk, "keywords": "ia"}
+        form = SubmissionForm(data=data, user=self.user)
+        self.assertFalse(form.is_valid())
+        self.assertIsNone(form.cleaned_data["paper"].file)  # rien d'ouvert pour un formulaire invalide
+
+        data.update(title="Article", abstract="Résumé")
+        response = self.client.post(reverse("submission_add"), data)
+        self.assertEqual(response.status_code, 302)
+        with Submission.objects.get().paper.open("rb") as paper:
+            self.assertEqual(paper.read(), self.data)
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertFalse(os.path.exists(uploads.part_path(upload)))
+
+    def test_purge_removes_abandoned_uploads(self):
+        old = uploads.start_upload(self.user, "ancien.pdf", 10)
+        recent = uploads.start_upload(self.user, "recent.pdf", 10)
+        ChunkedUpload.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(hours=48))
+        directory = os.path.dirname(uploads.part_path(old))
+        orphan = os.path.join(directory, "orphelin.part")
+        open(orphan, "wb").close()
+        os.utime(orphan, (0, 0))
+        out = io.StringIO()
+        call_command("purge_chunked_uploads", stdout=out)
+        self.assertIn("1 envoi(s)", out.getvalue())
+        self.assertEqual(list(ChunkedUpload.objects.values_list("pk", flat=True)), [recent.pk])
+        self.assertEqual(os.listdir(directory), [f"{recent.upload_id}.part"])
+
+
+def fake_extract(path, thumbnail_path, max_chars=100_000):
+    # Remplace pdftools.extract_paper : aucun outil PDF n'est requis pour les tests
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    with open(thumbnail_path, "wb") as thumbnail:
+        thumbnail.write(b"\x89PNG vignette")
+    with open(path, "rb") as paper:
+        return {"pages": 3, "text": paper.read().decode(), "thumbnail": thumbnail_path}
+
+
+@override_settings(SUBMISSIONS_PER_DAY=10)
+class PaperProcessingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, PAPER_PROCESSING="sync")
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        patcher = mock.patch("Conferenceapp.processing.extract_paper", side_effect=fake_extract)
+        self.extract = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username="hugo", email="hugo@esprit.tn")
+        self.conference = make_conference()
+
+    def upload(self, data, name="article.pdf"):
+        return make_submission(self.user, self.conference, paper=ContentFile(data, name=name))
+
+    def test_new_paper_is_analysed(self):
+        submission = self.upload(b"%PDF-1.4 premier")
+        analysis = PaperAnalysis.objects.get(submission=submission)
+        self.assertEqual((analysis.status, analysis.pages, analysis.text), ("done", 3, "%PDF-1.4 premier"))
+        self.assertTrue(analysis.thumbnail.name.startswith("thumbnails/"))
+
+    def test_unchanged_paper_costs_nothing(self):
+        submission = self.upload(b"%PDF-1.4 premier")
+        submission = Submission.objects.get(pk=submission.pk)
+        submission.title = "Nouveau titre"
+        with CaptureQueriesContext(connection) as queries:
+            submission.save()
+        self.assertFalse([q for q in queries if "paperanalysis" in q["sql"].lower()])
+        self.assertEqual(self.extract.call_count, 1)
+
+    def test_replaced_paper_is_analysed_again(self):
+        submission = self.upload(b"%PDF-1.4 premier")
+        old_name = submission.paper.name
+        submission.paper = ContentFile(b"%PDF-1.4 second", name="article.pdf")
+        submission.save()
+        self.assertEqual(self.extract.call_count, 2)
+        analysis = PaperAnalysis.objects.get(submission=submission)
+        self.assertEqual((analysis.paper, analysis.text), (submission.paper.name, "%PDF-1.4 second"))
+        # Résultat tardif de l'ancien fichier : ignoré
+        processing.apply_result(submission.pk, old_name, {"pages": 9, "text": "périmé"}, absolute=False)
+        self.assertEqual(PaperAnalysis.objects.get(submission=submission).pages, 3)
+
+    def test_shared_file_reuses_the_analysis(self):
+        first = self.upload(b"%PDF-1.4 commun")
+        second = self.upload(b"%PDF-1.4 commun", name="copie.pdf")
+        self.assertEqual(self.extract.call_count, 1)
+        self.assertEqual(
+            PaperAnalysis.objects.get(submission=second).thumbnail, PaperAnalysis.objects.get(submission=first).thumbnail
+        )
+
+    def test_missing_file_is_a_failure(self):
+        with self.assertLogs("Conferenceapp.processing", "WARNING"):
+            submission = make_submission(self.user, self.conference, paper="paper/absent.pdf")
+        analysis = PaperAnalysis.objects.get(submission=submission)
+        self.assertEqual(analysis.status, "failed")
+        self.assertIn("introuvable", analysis.error)
+        self.extract.assert_not_called()
+
+    def test_off_skips_everything(self):
+        with override_settings(PAPER_PROCESSING="off"):
+            self.upload(b"%PDF-1.4 premier")
+        self.assertFalse(PaperAnalysis.objects.exists())
+
+    def test_thumbnail_goes_through_the_protected_view(self):
+        submission = self.upload(b"%PDF-1.4 premier")
+        url = reverse("submission_thumbnail", args=[submission.pk])
+        self.assertEqual(self.client.get(url).status_code, 302)  # connexion requise
+        self.client.force_login(User.objects.create_user(username="intrus", email="intrus@esprit.tn"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual((response.status_code, response["Content-Type"]), (200, "image/png"))
+        self.assertEqual(b"".join(response.streaming_content), b"\x89PNG vignette")
+        self.assertContains(self.client.get(reverse("submission_details", args=[submission.pk])), url)
+
+
+class PaperDownloadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.owner = User.objects.create_user(username="ines", email="ines@esprit.tn")
+        self.conference = make_conference()
+        self.data = b"%PDF-1.4 " + b"0123456789" * 10
+        self.submission = make_submission(
+            self.owner, self.conference, title="Mon article", paper=ContentFile(self.data, name="article.pdf")
+        )
+        self.url = reverse("submission_paper", args=[self.submission.pk])
+
+    def test_access_rights(self):
+        member = User.objects.create_user(username="comite", email="comite@esprit.tn")
+        Organizingcommitee.objects.create(
+            user=member, conference=self.conference, commitee_role="member", date_joined=date.today()
+        )
+        stranger = User.objects.create_user(username="autre", email="autre@esprit.tn")
+        self.assertTrue(can_download_paper(self.owner, self.submission))
+        self.assertTrue(can_download_paper(member, self.submission))
+        self.assertFalse(can_download_paper(stranger, self.submission))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)  # anonyme : connexion requise
+        for user, status in ((stranger, 403), (member, 200), (self.owner, 200)):
+            self.client.force_login(user)
+            self.assertEqual(self.client.get(self.url).status_code, status)
+
+    def test_full_download(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(self.url)
+        self.assertEqual(b"".join(response.streaming_content), self.data)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("mon-article.pdf", response["Content-Disposition"])
+
+    def test_ranges(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=9-18")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 9-18/{len(self.data)}")
+        self.assertEqual(b"".join(response.streaming_content), self.data[9:19])
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), self.data[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.data)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.data)}")
+
+        # If-Range périmé : le fichier entier plutôt qu'un morceau d'une autre version
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"autre"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match(self):
+        self.client.force_login(self.owner)
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"autre"').status_code, 200)
+
+    def test_media_is_not_served_directly(self):
+        with override_settings(DEBUG=True):
+            urls = importlib.reload(importlib.import_module("conference3ia2.urls"))
+        self.addCleanup(importlib.reload, urls)
+        for path in (self.submission.paper.name, "thumbnails/vignette.png", "uploads/envoi.part"):
+            with self.assertRaises(Resolver404):
+                resolve(f"/media/{path}", urlconf=urls)
+
+    def test_sendfile_headers(self):
+        self.client.force_login(self.owner)
+        with override_settings(PAPER_SENDFILE="x-accel-redirect", PAPER_SENDFILE_PREFIX="/protected/"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected/" + self.submission.paper.name)
+        self.assertEqual(response.content, b"")
+        with override_settings(PAPER_SENDFILE="x-sendfile"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Sendfile"], self.submission.paper.path)
+        self.assertEqual(response.content, b"")
+
+    def test_missing_file_is_404(self):
+        os.remove(self.submission.paper.path)
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+@override_settings(SUBMISSIONS_PER_DAY=10)
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="dave", email="dave@esprit.tn", password="secret")
+        conference = make_conference()
+        self.submissions = [make_submission(self.user, conference) for _ in range(5)]
+
+    def test_only_allowed_transitions_are_applied_in_batches(self):
+        transitions.transition_status(Submission.objects.filter(pk__in=[s.pk for s in self.submissions[:3]]), "under review")
+        report = transitions.transition_status(Submission.objects.all(), "accepted", user=self.user, batch_size=2)
+
+        self.assertEqual((report.changed, report.skipped, report.batches), (3, 2, 3))
+        self.assertEqual(Submission.objects.filter(status="accepted").count(), 3)
+        self.assertEqual(Submission.objects.filter(status="submitted").count(), 2)
+        history = SubmissionHistory.objects.filter(new_value="accepted")
+        self.assertEqual(history.count(), 3)
+        self.assertTrue(all(h.old_value == "under review" and h.changed_by == self.user for h in history))
+
+    def test_mark_payed_is_idempotent(self):
+        self.assertEqual(transitions.mark_payed(Submission.objects.all()).changed, 5)
+        self.assertEqual(transitions.mark_payed(Submission.objects.all()).changed, 0)
+        self.assertEqual(SubmissionHistory.objects.filter(field="payed").count(), 5)
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20)
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@esprit.tn", password="secret")
+        self.client.force_login(self.admin)
+
+    def add_submissions(self, count):
+        conference = make_conference()
+        author = User.objects.create_user(
+            username=f"auteur{Submission.objects.count()}", email=f"a{Submission.objects.count()}@esprit.tn"
+        )
+        for _ in range(count):
+            make_submission(author, conference)
+        return conference
+
+    def changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("admin:Conferenceapp_submission_changelist"), params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        conference = self.add_submissions(2)
+        baseline = self.changelist_queries()
+        filtered = self.changelist_queries(conference__pk__exact=conference.pk)
+        for _ in range(3):
+            self.add_submissions(5)
+        self.assertEqual(self.changelist_queries(), baseline)
+        self.assertEqual(self.changelist_queries(conference__pk__exact=conference.pk), filtered)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=3)
+    def test_count_is_estimated_above_threshold(self):
+        self.add_submissions(2)
+        self.assertEqual(EstimatedCountPaginator(Submission.objects.order_by("pk"), 10).count, 2)
+        self.add_submissions(4)
+        with self.assertNumQueries(2):
+            count = EstimatedCountPaginator(Submission.objects.order_by("pk"), 10).count
+        self.assertGreaterEqual(count, 6)
+
+
+@override_settings(SUBMISSIONS_PER_DAY=10, ADMIN_INLINE_PAGE_SIZE=2)
+class AdminSubmissionsPanelTests(TestCase):
+    def setUp(self):
+        self.conference = make_conference()
+        author = User.objects.create_user(username="auteur", email="auteur@esprit.tn")
+        self.ids = [make_submission(author, self.conference, title=f"Article {i}").pk for i in range(5)]
+        make_submission(author, make_conference(name="Autre"), title="Ailleurs")
+        self.url = reverse("admin:Conferenceapp_conference_submissions", args=[self.conference.pk])
+
+    def staff(self, *codenames):
+        user = User.objects.create_user(username=f"staff{len(codenames)}", email=f"s{len(codenames)}@esprit.tn")
+        user.is_staff = True
+        user.save()
+        user.user_permissions.set(Permission.objects.filter(codename__in=codenames))
+        return user
+
+    def test_permissions(self):
+        self.assertEqual(self.client.get(self.url).status_code, 302)  # vers la connexion de l'admin
+        self.client.force_login(self.staff())
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.staff("view_conference"))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        missing = reverse("admin:Conferenceapp_conference_submissions", args=[0])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_pages_cover_the_conference_once(self):
+        self.client.force_login(User.objects.create_superuser(username="admin", email="admin@esprit.tn"))
+        seen, url, queries = [], self.url, set()
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            queries.add(len(ctx.captured_queries))
+            page = response.context["page"]
+            seen.extend(submission.pk for submission in page)
+            url = f"{self.url}?after={page.next_cursor}" if page.has_next else None
+        self.assertEqual(seen, sorted(self.ids))
+        self.assertEqual(len(queries), 1)  # même nombre de requêtes à chaque page
+        self.assertNotContains(response, "Ailleurs")
+
+        previous = self.client.get(f"{self.url}?before={page.previous_cursor}").context["page"]
+        self.assertEqual([s.pk for s in previous], sorted(self.ids)[2:4])
+
+    def test_invalid_cursor_is_404(self):
+        self.client.force_login(User.objects.create_superuser(username="admin", email="admin@esprit.tn"))
+        self.assertEqual(self.client.get(self.url, {"after": "pas-un-curseur"}).status_code, 404)
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20)
+class ConferenceStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="erin", email="erin@esprit.tn", password="secret")
+        self.conference = make_conference()
+        self.other = make_conference(name="Autre")
+
+    def snapshot(self):
+        rows = {
+            s.pk: (s.submissions, s.submitted, s.under_review, s.accepted, s.rejected, s.payed, s.sessions)
+            for s in ConferenceStats.objects.all()
+        }
+        days = set(ConferenceDayStats.objects.filter(sessions__gt=0).values_list("conference_id", "day", "sessions"))
+        return rows, days
+
+    def add_session(self, day_offset, **kwargs):
+        values = {
+            "title": "Session", "topic": "IA", "room": "A1", "start_time": "09:00", "end_time": "10:00",
+            "session_day": self.conference.start_date + timedelta(days=day_offset), "conference": self.conference,
+        }
+        values.update(kwargs)
+        return Session.objects.create(**values)
+
+    def test_incremental_stats_match_rebuild(self):
+        submissions = [make_submission(self.user, self.conference) for _ in range(4)]
+        submissions[0].status = "under review"
+        submissions[0].payed = True
+        submissions[0].save()
+        moved = Submission.objects.only("pk", "title").get(pk=submissions[1].pk)
+        moved.conference = self.other
+        moved.save()
+        submissions[2].delete()
+        transitions.transition_status(Submission.objects.filter(pk=submissions[0].pk), "accepted")
+        transitions.mark_payed(Submission.objects.all())
+
+        first = self.add_session(0)
+        self.add_session(0, room="B2")
+        self.add_session(1)
+        first.session_day = self.conference.start_date + timedelta(days=2)
+        first.save()
+
+        stats = ConferenceStats.objects.get(conference=self.conference)
+        self.assertEqual((stats.submissions, stats.accepted, stats.submitted, stats.payed), (2, 1, 1, 2))
+        self.assertEqual(stats.sessions, 3)
+        self.assertEqual(stats.paid_ratio, 1)
+
+        incremental = self.snapshot()
+        rebuild_conference_stats()
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_missing_stats_are_rebuilt_on_write(self):
+        make_submission(self.user, self.conference)
+        ConferenceStats.objects.all().delete()
+        make_submission(self.user, self.conference, payed=True)
+        stats = ConferenceStats.objects.get(conference=self.conference)
+        self.assertEqual((stats.submissions, stats.payed), (2, 1))
+
+    def test_detail_view_reads_precomputed_stats(self):
+        make_submission(self.user, self.conference)
+        self.add_session(0)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("conference_details", args=[self.conference.pk]))
+        self.assertContains(response, "Soumissions : 1")
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20)
+class ConferenceFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.conference = make_conference(name="Apprentissage profond")
+        self.user = User.objects.create_user(username="frank", email="frank@esprit.tn", password="secret")
+
+    def test_anonymous_list_is_served_from_cache(self):
+        url = reverse("liste_conferences")
+        self.assertContains(self.client.get(url), "Apprentissage profond")
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.conference.name = "Vision"
+            self.conference.save()
+        self.assertContains(self.client.get(url), "Vision")
+
+    def test_fragments_are_separated_by_role(self):
+        url = reverse("liste_conferences")
+        self.client.get(url)
+        comitee = User.objects.create_user(username="grace", email="grace@esprit.tn", password="secret", role="comitee")
+        self.client.force_login(comitee)
+        self.assertContains(self.client.get(url), reverse("conference_delete", args=[self.conference.pk]))
+        self.client.force_login(self.user)
+        self.assertNotContains(self.client.get(url), reverse("conference_delete", args=[self.conference.pk]))
+
+    def test_details_follow_statistics(self):
+        url = reverse("conference_details", args=[self.conference.pk])
+        self.assertContains(self.client.get(url), "Soumissions : 0")
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_submission(self.user, self.conference)
+        self.assertContains(self.client.get(url), "Soumissions : 1")
+        self.assertEqual(self.client.get(reverse("conference_details", args=[9999])).status_code, 404)
+
+    @override_settings(CONFERENCE_VERSION_TIMEOUT=60)
+    def test_unknown_conference_leaves_no_permanent_version(self):
+        self.assertEqual(self.client.get(reverse("conference_details", args=[9999])).status_code, 404)
+        key = fragments.detail_version_key(9999)
+        self.assertIsNotNone(cache.get(key))
+        with mock.patch("django.core.cache.backends.locmem.time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get(key))
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="heidi", email="heidi@esprit.tn", password="secret")
+        self.conference = make_conference()
+        self.submission = make_submission(self.user, self.conference)
+        self.client.force_login(self.user)
+
+    def test_submission_detail_answers_304_until_it_changes(self):
+        url = reverse("submission_details", args=[self.submission.pk])
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(3):  # session, utilisateur, agrégat
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.conference.name = "Nouveau nom"
+        self.conference.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_depends_on_user_and_access_is_checked_first(self):
+        url = reverse("submission_details", args=[self.submission.pk])
+        etag = self.client.get(url)["ETag"]
+        other = User.objects.create_user(username="ivan", email="ivan@esprit.tn", password="secret")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+    def test_conference_detail_follows_statistics(self):
+        url = reverse("conference_details", args=[self.conference.pk])
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(2):  # session, utilisateur : validateurs tirés du cache
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_submission(self.user, self.conference)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class OpenConferenceChoicesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.open = make_conference(name="Ouverte")
+        make_conference(name="Terminée", start_date=date.today() - timedelta(days=10), end_date=date.today() - timedelta(days=8))
+
+    def test_choices_are_cached_until_a_conference_changes(self):
+        self.assertIn("Ouverte", SubmissionForm().as_p())
+        with self.assertNumQueries(0):
+            html = SubmissionForm().as_p()
+        self.assertNotIn("Terminée", html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_conference(name="Nouvelle")
+        self.assertIn("Nouvelle", SubmissionForm().as_p())
+
+    def test_bound_form_still_validates_against_open_conferences(self):
+        form = SubmissionForm(data={"conference": self.open.pk})
+        form.is_valid()
+        self.assertNotIn("conference", form.errors)
+        closed = Conference.objects.get(name="Terminée")
+        form = SubmissionForm(data={"conference": closed.pk})
+        form.is_valid()
+        self.assertIn("conference", form.errors)
+
+    @override_settings(OPEN_CONFERENCES_SELECT_LIMIT=0)
+    def test_autocomplete_above_limit(self):
+        self.assertIsInstance(SubmissionForm().fields["conference"].widget, ConferenceAutocompleteWidget)
+        response = self.client.get(reverse("open_conferences"), {"q": "ouv"})
+        self.assertEqual(response.json()["results"], [{"id": self.open.pk, "text": "Ouverte"}])
+        self.assertEqual(len(self.client.get(reverse("open_conferences")).json()["results"]), 1)
+
+    @override_settings(OPEN_CONFERENCES_SELECT_LIMIT=2)
+    def test_cached_choices_are_capped(self):
+        for index in range(5):
+            make_conference(name=f"Ouverte {index}")
+        with CaptureQueriesContext(connection) as queries:
+            choices = open_conference_choices()
+        self.assertEqual(len(choices), 3)  # limite + 1
+        self.assertIn("LIMIT 3", queries[-1]["sql"])
+        self.assertTrue(use_autocomplete(choices))
+        self.assertFalse(use_autocomplete(choices[:2]))
+
+
+@override_settings(SUBMISSIONS_PER_DAY=20, EXPORT_CHUNK_SIZE=2)
+class SubmissionExportTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="judy", email="judy@esprit.tn", first_name="Judy", affiliation="Esprit"
+        )
+        self.conference = make_conference()
+        for index in range(5):
+            make_submission(self.author, self.conference, title=f"Article {index}")
+        make_submission(self.author, make_conference(name="Autre"), title="=HYPERLINK()")
+        self.member = User.objects.create_user(username="kim", email="kim@esprit.tn")
+        Organizingcommitee.objects.create(
+            user=self.member, conference=self.conference, commitee_role="member", date_joined=date.today()
+        )
+        self.url = reverse("conference_submissions_export", args=[self.conference.pk])
+
+    def test_committee_streams_csv_of_its_conference(self):
+        self.client.force_login(self.member)
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+        self.assertEqual([row["title"] for row in rows], [f"Article {index}" for index in range(5)])
+        self.assertEqual({row["affiliation"] for row in rows}, {"Esprit"})
+
+    def test_jsonl_and_access(self):
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.member)
+        response = self.client.get(self.url, {"format": "jsonl"})
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[0]["conference"], "Conférence test")
+
+    def test_csv_cells_are_not_formulas(self):
+        out = io.StringIO()
+        call_command("export_submissions", stdout=out)
+        self.assertIn("'=HYPERLINK()", out.getvalue())
+        for value in ("\t=1+1", "\r=1+1", "-2", "@SUM(A1)"):
+            self.assertEqual(exports._safe_cell(value), "'" + value)
+        self.assertEqual(exports._safe_cell("Titre"), "Titre")
+
+
+class CsvImportTests(TestCase):
+    def _import(self, kind, rows, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return imports.import_csv(io.StringIO("\n".join(rows) + "\n"), kind, **kwargs)
+
+    def test_conferences_are_validated_and_inserted_in_batches(self):
+        description = "Une description suffisamment longue pour être valide."
+        start = date.today() + timedelta(days=10)
+        rows = ["name,theme,location,description,start_date,end_date"] + [
+            f"Conf {index},IA,Tunis,{description},{start},{start + timedelta(days=2)}" for index in range(5)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            report = self._import("conferences", rows, batch_size=2)
+        self.assertEqual((report.created, report.errors, report.batches), (5, [], 3))
+        self.assertEqual(ConferenceStats.objects.filter(conference__name__startswith="Conf ").count(), 5)
+        # Une insertion par lot, index et statistiques en quelques requêtes : rien par ligne
+        self.assertLessEqual(len(queries), 15)
+
+    def test_any_error_rolls_back_unless_partial(self):
+        start = date.today() + timedelta(days=10)
+        description = "Une description suffisamment longue pour être valide."
+        rows = [
+            "name,theme,location,description,start_date,end_date",
+            f"Valide,IA,Tunis,{description},{start},{start}",
+            f"Dates,IA,Tunis,{description},{start},{start - timedelta(days=1)}",
+            f"Thème,XX,Tunis,{description},{start},{start}",
+        ]
+        report = self._import("conferences", rows)
+        self.assertTrue(report.rolled_back)
+        self.assertEqual([line for line, _ in report.errors], [3, 4])
+        self.assertFalse(Conference.objects.exists())
+
+        report = self._import("conferences", rows, partial=True)
+        self.assertFalse(report.rolled_back)
+        self.assertEqual(list(Conference.objects.values_list("name", flat=True)), ["Valide"])
+
+    def test_sessions_reference_conferences_by_id_or_name(self):
+        conference = make_conference(name="Programme")
+        day = conference.start_date
+        rows = [
+            "conference,title,topic,session_day,start_time,end_time,room",
+            f"{conference.pk},Ouverture,IA,{day},09:00,10:00,A1",
+            f"Programme,Atelier,IA,{day},10:00,11:00,A2",
+            f"Inconnue,Atelier,IA,{day},10:00,11:00,A2",
+            f"Programme,Hors dates,IA,{day - timedelta(days=5)},10:00,11:00,A2",
+            f"Programme,Même salle,IA,{day},09:30,10:30,A1",
+        ]
+        report = self._import("sessions", rows, partial=True)
+        self.assertEqual(report.created, 2)
+        self.assertEqual([line for line, _ in report.errors], [4, 5, 6])
+        self.assertEqual(ConferenceStats.objects.get(conference=conference).sessions, 2)
+
+    def test_users_check_email_domain_and_duplicates(self):
+        User.objects.create_user(username="existing", email="existing@esprit.tn")
+        rows = [
+            "username,email,first_name,last_name,affiliation,nationality",
+            "nina,nina@esprit.tn,Nina,Ben,Esprit,TN",
+            "omar,omar@gmail.com,Omar,Ali,Esprit,TN",
+            "existing,other@esprit.tn,Ex,Isting,Esprit,TN",
+            "nina2,NINA@esprit.tn,Nina,Bis,Esprit,TN",
+            "sami,pas-une-adresse,Sami,Ali,Esprit,TN",
+        ]
+        report = self._import("users", rows, partial=True)
+        self.assertEqual(report.created, 1)
+        self.assertEqual(sorted({line for line, _ in report.errors}), [3, 4, 5, 6])
+        nina = User.objects.get(username="nina")
+        self.assertTrue(nina.user_id)
+        self.assertFalse(nina.has_usable_password())
+
+    def test_password_column_is_refused(self):
+        rows = [
+            "username,email,first_name,last_name,affiliation,nationality,password",
+            "nina,nina@esprit.tn,Nina,Ben,Esprit,TN,secret123",
+        ]
+        report = self._import("users", rows)
+        self.assertTrue(report.rolled_back)
+        self.assertIn("password", report.errors[0][1])
+        self.assertFalse(User.objects.filter(username="nina").exists())
+
+    def test_dry_run_and_command(self):
+        path = os.path.join(tempfile.mkdtemp(), "users.csv")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, "w", encoding="utf-8-sig") as stream:
+            stream.write("username,email,first_name,last_name,affiliation,nationality\n")
+            stream.write("paul,paul@tek.tn,Paul,Martin,Tek,FR\n")
+        out = io.StringIO()
+        call_command("import_csv", "users", path, "--dry-run", stdout=out, stderr=io.StringIO())
+        self.assertIn("annulé", out.getvalue())
+        self.assertFalse(User.objects.filter(username="paul").exists())
+        call_command("import_csv", "users", path, stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertTrue(User.objects.filter(username="paul").exists())
+
+    def test_admin_upload(self):
+        admin_user = User.objects.create_superuser(username="root", email="root@esprit.tn", password="secret")
+        self.client.force_login(admin_user)
+        url = reverse("admin:Conferenceapp_conference_import")
+        self.assertContains(self.client.get(reverse("admin:Conferenceapp_conference_changelist")), url)
+        upload = ContentFile(
+            "﻿username,email,first_name,last_name,affiliation,nationality\nrita,rita@tek.tn,Rita,Sy,Tek,SN\n".encode(),
+            name="users.csv",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {"kind": "users", "file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(User.objects.filter(username="rita").exists())
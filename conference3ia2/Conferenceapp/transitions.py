@@ -0,0 +1,100 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Submission, SubmissionHistory
+from . import stats
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Changements d'état en masse
+# -----------------------------
+# Les soumissions sélectionnées sont traitées par lots de taille bornée
+# (parcours par clé primaire, sans OFFSET), chaque lot dans une transaction
+# courte : une sélection de 40 000 lignes ne verrouille jamais toute la table.
+# Chaque changement est tracé dans SubmissionHistory (bulk_create par lot)
+# et répercuté dans les statistiques des conférences (stats.py).
+
+# Transitions autorisées : submitted -> under review -> accepted / rejected
+STATUS_TRANSITIONS = {
+    "submitted": {"under review"},
+    "under review": {"accepted", "rejected"},
+}
+
+
+class TransitionReport:
+    def __init__(self):
+        self.changed = 0
+        self.skipped = 0
+        self.batches = 0
+
+    def __str__(self):
+        return f"{self.changed} modifiée(s), {self.skipped} ignorée(s) en {self.batches} lot(s)"
+
+
+def allowed_sources(new_status):
+    """États à partir desquels on peut passer à ``new_status``."""
+    return [source for source, targets in STATUS_TRANSITIONS.items() if new_status in targets]
+
+
+def _apply_batch(pks, field, new_value, allowed_from, user):
+    with transaction.atomic():
+        rows = Submission.objects.select_for_update().filter(pk__in=pks, **{f"{field}__in": allowed_from})
+        current = list(rows.values_list("pk", field, "conference_id"))
+        if not current:
+            return 0
+        Submission.objects.filter(pk__in=[pk for pk, _, _ in current]).update(
+            **{field: new_value, "updated_at": timezone.now()}
+        )
+        SubmissionHistory.objects.bulk_create([
+            SubmissionHistory(
+                submission_id=pk, field=field, old_value=str(old), new_value=str(new_value), changed_by=user
+            )
+            for pk, old, _ in current
+        ])
+        # update() ne déclenche pas les signaux : statistiques mises à jour ici
+        stats.record_bulk_change(field, new_value, [(conference_id, old) for _, old, conference_id in current])
+        return len(current)
+
+
+def bulk_transition(queryset, field, new_value, allowed_from, user=None, batch_size=None, progress=None):
+    """
+    Passe ``field`` à ``new_value`` pour les soumissions de ``queryset`` dont la
+    valeur actuelle est dans ``allowed_from`` ; les autres sont ignorées.
+    ``progress(report)`` est appelé après chaque lot.
+    """
+    batch_size = batch_size or getattr(settings, "SUBMISSION_BULK_BATCH_SIZE", 500)
+    report = TransitionReport()
+    pks = queryset.order_by().values_list("pk", flat=True)
+    last_pk = None
+    while True:
+        batch_qs = pks.order_by("pk")
+        if last_pk is not None:
+            batch_qs = batch_qs.filter(pk__gt=last_pk)
+        batch = list(batch_qs[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1]
+
+        changed = _apply_batch(batch, field, new_value, allowed_from, user)
+        report.changed += changed
+        report.skipped += len(batch) - changed
+        report.batches += 1
+        logger.info("Changement %s=%s : lot %d, %s", field, new_value, report.batches, report)
+        if progress:
+            progress(report)
+    return report
+
+
+def transition_status(queryset, new_status, user=None, **kwargs):
+    if new_status not in {target for targets in STATUS_TRANSITIONS.values() for target in targets}:
+        raise ValueError(f"Transition vers « {new_status} » non autorisée.")
+    return bulk_transition(queryset, "status", new_status, allowed_sources(new_status), user=user, **kwargs)
+
+
+def mark_payed(queryset, user=None, **kwargs):
+    return bulk_transition(queryset, "payed", True, [False], user=user, **kwargs)
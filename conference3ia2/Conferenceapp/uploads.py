@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ChunkedUpload
+
+
+# -----------------------------
+# Envoi d'articles par morceaux (reprise possible)
+# -----------------------------
+# 1. init     : le client annonce le nom et la taille du fichier
+# 2. chunk    : il envoie les octets à partir de l'offset courant (plusieurs fois)
+# 3. finalize : le fichier assemblé est vérifié (extension, taille)
+# Le fichier reconstitué est ensuite rattaché au formulaire de soumission
+# par son upload_id (voir forms.ChunkedUploadFormMixin).
+# Les morceaux sont écrits directement sur disque, jamais gardés en mémoire :
+# chaque requête reçoit son morceau dans un fichier temporaire, puis l'ajoute
+# au fichier .part sous le verrou de la ligne ChunkedUpload.
+# Les envois abandonnés (sans activité depuis CHUNKED_UPLOAD_EXPIRY_HOURS)
+# sont supprimés par la commande purge_chunked_uploads.
+
+READ_SIZE = 64 * 1024
+
+
+def max_upload_size():
+    return getattr(settings, "PAPER_MAX_UPLOAD_SIZE", 50 * 1024 * 1024)
+
+
+def part_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, "uploads", f"{upload.upload_id}.part")
+
+
+def validate_upload_metadata(filename, size):
+    if not filename.lower().endswith(".pdf"):
+        raise ValidationError("Seuls les fichiers PDF sont autorisés.")
+    if size <= 0 or size > max_upload_size():
+        raise ValidationError(f"La taille du fichier doit être comprise entre 1 et {max_upload_size()} octets.")
+
+
+def start_upload(user, filename, size):
+    filename = os.path.basename(filename)
+    validate_upload_metadata(filename, size)
+    upload = ChunkedUpload.objects.create(user=user, filename=filename, size=size)
+    path = part_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    return upload
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Écrit ``length`` octets lus dans ``stream`` à la position ``offset``.
+
+    Le morceau doit commencer exactement à l'offset déjà reçu : un client qui
+    reprend après une coupure interroge d'abord l'offset courant. Renvoie le
+    nouvel offset.
+    """
+    if upload.completed:
+        raise ValidationError("Cet envoi est déjà finalisé.")
+    if offset != upload.offset:
+        raise ValidationError(f"Offset attendu : {upload.offset}.")
+    if length <= 0 or offset + length > upload.size:
+        raise ValidationError("Le morceau dépasse la taille annoncée.")
+
+    path = part_path(upload)
+    # Réception (lente) hors verrou, dans un fichier propre à la requête
+    fd, chunk_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{upload.upload_id}.", suffix=".chunk")
+    try:
+        written = 0
+        with os.fdopen(fd, "wb") as chunk:
+            while written < length:
+                data = stream.read(min(READ_SIZE, length - written))
+                if not data:
+                    break
+                chunk.write(data)
+                written += len(data)
+
+        # Mise à jour conditionnelle de l'offset, puis ajout au fichier .part dans
+        # la même transaction : la ligne reste verrouillée jusqu'à la fin de l'ajout,
+        # deux envois simultanés du même morceau ne peuvent pas s'entremêler.
+        new_offset = offset + written
+        with transaction.atomic():
+            updated = ChunkedUpload.objects.filter(pk=upload.pk, offset=offset, completed=False).update(
+                offset=new_offset, updated_at=timezone.now()
+            )
+            if not updated:
+                raise ValidationError("Un autre envoi a modifié ce fichier, reprenez à partir de l'offset courant.")
+            with open(path, "r+b") as part, open(chunk_path, "rb") as chunk:
+                part.seek(offset)
+                shutil.copyfileobj(chunk, part, READ_SIZE)
+                part.truncate()
+    finally:
+        os.remove(chunk_path)
+    upload.offset = new_offset
+    return new_offset
+
+
+def finalize_upload(upload):
+    validate_upload_metadata(upload.filename, upload.size)
+    actual = os.path.getsize(part_path(upload))
+    if upload.offset != upload.size or actual != upload.size:
+        raise ValidationError(f"Fichier incomplet : {upload.offset} octets reçus sur {upload.size}.")
+    with open(part_path(upload), "rb") as part:
+        if part.read(5) != b"%PDF-":
+            raise ValidationError("Le fichier envoyé n'est pas un PDF.")
+    upload.completed = True
+    upload.save(update_fields=["completed", "updated_at"])
+    return upload
+
+
+class PartFile(File):
+    """
+    Fichier assemblé d'un envoi, ouvert seulement pendant sa lecture par le
+    stockage : aucun descripteur ne reste ouvert si le formulaire est invalide.
+    """
+
+    def __init__(self, path, name):
+        super().__init__(None, name=name)
+        self.path = path
+
+    @property
+    def size(self):
+        return os.path.getsize(self.path)
+
+    def chunks(self, chunk_size=None):
+        with open(self.path, "rb") as part:
+            yield from File(part).chunks(chunk_size)
+
+    def close(self):
+        pass
+
+
+def open_upload(upload):
+    """Fichier assemblé, prêt à être affecté à Submission.paper (lu en flux par le stockage)."""
+    return PartFile(part_path(upload), name=upload.filename)
+
+
+def discard_upload(upload):
+    try:
+        os.remove(part_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def purge_expired_uploads(hours=None):
+    """
+    Supprime les envois sans activité depuis ``hours`` heures
+    (CHUNKED_UPLOAD_EXPIRY_HOURS par défaut) et les fichiers sans envoi.
+    """
+    hours = hours if hours is not None else getattr(settings, "CHUNKED_UPLOAD_EXPIRY_HOURS", 24)
+    expiry = timedelta(hours=hours)
+    limit = timezone.now() - expiry
+    purged = 0
+    for upload in ChunkedUpload.objects.filter(updated_at__lt=limit).iterator():
+        discard_upload(upload)
+        purged += 1
+
+    # Fichiers orphelins (.part sans ligne, morceaux d'une requête interrompue)
+    directory = os.path.join(settings.MEDIA_ROOT, "uploads")
+    if os.path.isdir(directory):
+        known = {str(pk) for pk in ChunkedUpload.objects.values_list("upload_id", flat=True)}
+        for entry in os.scandir(directory):
+            upload_id = entry.name.split(".", 1)[0]
+            stale = entry.stat().st_mtime < time.time() - expiry.total_seconds()
+            if entry.is_file() and stale and (upload_id not in known or entry.name.endswith(".chunk")):
+                os.remove(entry.path)
+    return purged
@@ -7,9 +7,21 @@ urlpatterns = [
     # Liste des conférences
     path("liste/", ConferenceList.as_view(), name="liste_conferences"),
 
+    # Recherche plein texte
+    path("search/", search_view, name="search"),
+
+    # Conférences ouvertes (saisie semi-automatique du formulaire de soumission)
+    path("open/", open_conferences_view, name="open_conferences"),
+
     # Détails d'une conférence
     path("<int:pk>/", ConferenceDetails.as_view(), name="conference_details"),
 
+    # Mots-clés des soumissions d'une conférence (facettes, recherche par mot-clé)
+    path("<int:pk>/keywords/", conference_keywords, name="conference_keywords"),
+
+    # Export des soumissions d'une conférence (CSV / JSON lines, en flux)
+    path("<int:pk>/submissions/export/", export_submissions, name="conference_submissions_export"),
+
     # Ajouter une nouvelle conférence
     path("add/", ConferenceCreate.as_view(), name="conference_add"),
 
@@ -28,5 +40,14 @@ urlpatterns = [
     
     # Détails d'une soumission
     path("submissions/<str:submission_id>/", DetailSubmission.as_view(), name="submission_details"),
+
+    # Téléchargement de l'article (contrôle d'accès, ETag, Range)
+    path("submissions/<str:submission_id>/paper/", download_paper, name="submission_paper"),
+    path("submissions/<str:submission_id>/thumbnail/", download_thumbnail, name="submission_thumbnail"),
+
+    # Envoi d'articles par morceaux
+    path("uploads/", upload_init, name="upload_init"),
+    path("uploads/<uuid:upload_id>/", upload_chunk, name="upload_chunk"),
+    path("uploads/<uuid:upload_id>/finalize/", upload_finalize, name="upload_finalize"),
 ]
 
@@ -1,25 +1,111 @@
-from django.shortcuts import render
+import json
+
+from django.shortcuts import render, get_object_or_404
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import PermissionDenied
-from .models import Conference, Submission
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_http_methods, require_POST
+from django.utils.functional import SimpleLazyObject
+from django.utils.text import slugify
+from .models import Conference, ConferenceDayStats, Submission, ChunkedUpload, Organizingcommitee, PaperAnalysis
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from .forms import ConferenceForm, SubmissionForm, SubmissionUpdateForm
+from .pagination import KeysetPaginator, InvalidCursor
+from . import search
+from .quota import DailyQuotaExceeded
+from . import uploads
+from .downloads import serve_paper
+from .stats import get_stats
+from .fragments import detail_version, fragment_context
+from .conditional import ConditionalGetMixin, validators_from_stamp
+from .conference_choices import open_conferences_lookup
+from . import exports
+from . import keywords
+
+
+def paginate_conferences(request, queryset):
+    # Pagination par curseur sur (start_date, conference_id) : coût constant quelle que soit la page
+    paginator = KeysetPaginator(
+        queryset, getattr(settings, "CONFERENCES_PAGE_SIZE", 20), ordering=("start_date", "conference_id")
+    )
+    after, before = request.GET.get("after"), request.GET.get("before")
+    try:
+        for token in (after, before):
+            if token:
+                paginator.decode_cursor(token)
+    except InvalidCursor:
+        raise Http404("Page de conférences invalide.")
+    # Page lue au premier accès : aucune requête si le fragment est déjà en cache
+    return SimpleLazyObject(lambda: paginator.get_page(after=after, before=before))
 
 def list_conferences(request):
-    conferences_list = Conference.objects.all()
-    return render(request, "conferences/liste.html", {"liste": conferences_list})
+    page = paginate_conferences(request, Conference.objects.all())
+    context = {"liste": SimpleLazyObject(lambda: page.object_list), "page": page}
+    context.update(fragment_context(request))
+    return render(request, "conferences/liste.html", context)
 
 class ConferenceList(ListView):
     model = Conference
     context_object_name = "liste"
     template_name = "conferences/liste.html"
 
-class ConferenceDetails(DetailView):
+    def get(self, request, *args, **kwargs):
+        self.page = paginate_conferences(request, self.get_queryset())
+        self.object_list = SimpleLazyObject(lambda: self.page.object_list)
+        context = self.get_context_data(page=self.page, **fragment_context(request))
+        return self.render_to_response(context)
+
+    def get_template_names(self):
+        # Celui de ListView inspecte object_list (et lancerait la requête de la page)
+        return [self.template_name]
+
+def search_view(request):
+    # Recherche publique : conférences pour tous, soumissions de l'utilisateur connecté
+    terms = request.GET.get("q", "").strip()
+    conferences, submissions = [], []
+    if terms:
+        conferences = search.search_conferences(terms)
+        if request.user.is_authenticated:
+            submissions = search.search_submissions(
+                terms, Submission.objects.filter(user=request.user).select_related("conference")
+            )
+    return render(request, "conferences/search.html", {
+        "q": terms,
+        "conferences": conferences,
+        "submissions": submissions,
+    })
+
+class ConferenceDetails(ConditionalGetMixin, DetailView):
     model = Conference
     context_object_name = "conference"
     template_name = "conferences/details.html"
 
+    def get_conditional_validators(self):
+        # Le numéro de version de la fiche en cache change avec la conférence et ses
+        # statistiques : validateurs sans requête (voir fragments.py)
+        return validators_from_stamp(detail_version(self.kwargs["pk"]), *self.get_etag_extra())
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("stats")
+
+    def get(self, request, *args, **kwargs):
+        # Conférence lue au premier accès : aucune requête si le fragment est déjà en cache
+        # (une conférence inexistante lève Http404 pendant le rendu)
+        self.object = SimpleLazyObject(self.get_object)
+        context = {
+            "view": self,
+            "object": self.object,
+            "conference": self.object,
+            # Statistiques précalculées (stats.py) : aucune agrégation sur les soumissions
+            "stats": SimpleLazyObject(lambda: get_stats(self.object)),
+            "sessions_per_day": ConferenceDayStats.objects.filter(conference_id=self.kwargs["pk"], sessions__gt=0),
+        }
+        context.update(fragment_context(request, self.kwargs["pk"]))
+        return self.render_to_response(context)
+
 class ConferenceCreate(LoginRequiredMixin, CreateView):
     model = Conference
     template_name = "conferences/form.html"
@@ -64,15 +150,17 @@ class ListSubmissions(LoginRequiredMixin, ListView):
         # Filtrer les soumissions pour l'utilisateur connecté
         return Submission.objects.filter(user=self.request.user).select_related('conference', 'user').order_by('-submission_date')
 
-class DetailSubmission(LoginRequiredMixin, DetailView):
+class DetailSubmission(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     model = Submission
     template_name = "conferences/submissions_details.html"
     context_object_name = "submission"
     pk_url_kwarg = 'submission_id'
+    # Nom de la conférence et résultat de l'analyse affichés sur la page
+    conditional_fields = ("updated_at", "conference__updated_at", "analysis__processed_at")
     
     def get_queryset(self):
         # S'assurer que l'utilisateur ne peut voir que ses propres soumissions
-        return Submission.objects.filter(user=self.request.user).select_related('conference', 'user')
+        return Submission.objects.filter(user=self.request.user).select_related('conference', 'user', 'analysis')
 
 class AddSubmission(LoginRequiredMixin, CreateView):
     model = Submission
@@ -91,7 +179,14 @@ class AddSubmission(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         # Définir le statut par défaut à "submitted"
         form.instance.status = "submitted"
-        return super().form_valid(form)
+        try:
+            response = super().form_valid(form)
+        except DailyQuotaExceeded as e:
+            # Quota du jour atteint : l'insertion a été annulée, on réaffiche le formulaire
+            form.add_error(None, e)
+            return self.form_invalid(form)
+        form.discard_chunked_upload()
+        return response
 
 class UpdateSubmission(LoginRequiredMixin, UpdateView):
     model = Submission
@@ -103,6 +198,17 @@ class UpdateSubmission(LoginRequiredMixin, UpdateView):
     def get_queryset(self):
         # S'assurer que l'utilisateur ne peut modifier que ses propres soumissions
         return Submission.objects.filter(user=self.request.user).select_related('conference', 'user')
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        # L'utilisateur permet de retrouver ses envois par morceaux
+        kwargs['user'] = self.request.user
+        return kwargs
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        form.discard_chunked_upload()
+        return response
     
     def dispatch(self, request, *args, **kwargs):
         # Vérifier le statut avant de permettre la modification
@@ -125,6 +231,132 @@ class UpdateSubmission(LoginRequiredMixin, UpdateView):
         return super().dispatch(request, *args, **kwargs)
 
 
+# --- Téléchargement des articles ---
+def can_download_paper(user, submission):
+    # L'auteur, l'administration et le comité d'organisation de la conférence
+    if user.is_staff or submission.user_id == user.pk:
+        return True
+    return Organizingcommitee.objects.filter(user=user, conference_id=submission.conference_id).exists()
+
+@login_required
+def download_paper(request, submission_id):
+    submission = get_object_or_404(Submission.objects.only("submission_id", "title", "paper", "user_id", "conference_id"), submission_id=submission_id)
+    if not can_download_paper(request.user, submission):
+        raise PermissionDenied("Vous n'avez pas accès à cet article.")
+    if not submission.paper or not submission.paper.storage.exists(submission.paper.name):
+        raise Http404("Aucun fichier disponible.")
+    return serve_paper(request, submission.paper, filename=f"{slugify(submission.title) or submission.pk}.pdf")
+
+@login_required
+def download_thumbnail(request, submission_id):
+    # Vignette de la première page : mêmes droits que l'article
+    submission = get_object_or_404(Submission.objects.only("submission_id", "user_id", "conference_id"), submission_id=submission_id)
+    if not can_download_paper(request.user, submission):
+        raise PermissionDenied("Vous n'avez pas accès à cet article.")
+    analysis = PaperAnalysis.objects.filter(submission_id=submission.pk).only("thumbnail").first()
+    if analysis is None or not analysis.thumbnail or not analysis.thumbnail.storage.exists(analysis.thumbnail.name):
+        raise Http404("Aucune vignette disponible.")
+    return serve_paper(request, analysis.thumbnail, filename=f"{submission.pk}.png", content_type="image/png")
+
+
+# --- Envoi d'articles par morceaux (API JSON) ---
+def _upload_error(error, upload=None, status=400):
+    data = {"error": " ".join(error.messages)}
+    if upload is not None:
+        data["offset"] = upload.offset
+    return JsonResponse(data, status=status)
+
+def _upload_state(upload):
+    return {
+        "upload_id": str(upload.upload_id),
+        "offset": upload.offset,
+        "size": upload.size,
+        "completed": upload.completed,
+    }
+
+def can_export_submissions(user, conference_id):
+    # Administration et comité d'organisation de la conférence
+    return user.is_staff or Organizingcommitee.objects.filter(user=user, conference_id=conference_id).exists()
+
+@login_required
+@require_http_methods(["GET"])
+def export_submissions(request, pk):
+    conference = get_object_or_404(Conference.objects.only("conference_id", "name"), pk=pk)
+    if not can_export_submissions(request.user, conference.pk):
+        raise PermissionDenied("Seul le comité d'organisation peut exporter les soumissions.")
+    fmt = request.GET.get("format", "csv")
+    if fmt not in exports.FORMATS:
+        raise Http404("Format d'export inconnu.")
+    return exports.export_response(
+        Submission.objects.filter(conference=conference), fmt, filename=f"{slugify(conference.name) or conference.pk}-submissions"
+    )
+
+@login_required
+@require_http_methods(["GET"])
+def conference_keywords(request, pk):
+    # Facettes des mots-clés d'une conférence, ou ses soumissions portant ?keyword=
+    # (réservé au comité, comme l'export)
+    conference = get_object_or_404(Conference.objects.only("conference_id"), pk=pk)
+    if not can_export_submissions(request.user, conference.pk):
+        raise PermissionDenied("Seul le comité d'organisation peut consulter les mots-clés des soumissions.")
+    page_size = getattr(settings, "KEYWORD_PAGE_SIZE", 50)
+    keyword = request.GET.get("keyword", "").strip()
+    if not keyword:
+        facets = keywords.keyword_facets(conference, limit=page_size)
+        return JsonResponse({"results": [dict(facet) for facet in facets]})
+    # Pagination par curseur sur la clé primaire (identifiants triables)
+    submissions = keywords.submissions_with_keyword(keyword, Submission.objects.filter(conference=conference))
+    after = request.GET.get("after")
+    if after:
+        submissions = submissions.filter(submission_id__gt=after)
+    rows = list(submissions.order_by("submission_id").values("submission_id", "title", "status")[: page_size + 1])
+    next_cursor = rows[page_size - 1]["submission_id"] if len(rows) > page_size else None
+    return JsonResponse({"results": rows[:page_size], "next": next_cursor})
+
+@require_http_methods(["GET"])
+def open_conferences_view(request):
+    # Saisie semi-automatique du formulaire de soumission (conférences ouvertes)
+    return JsonResponse({"results": open_conferences_lookup(request.GET.get("q", "").strip())})
 
+@login_required
+@require_POST
+def upload_init(request):
+    try:
+        data = json.loads(request.body or b"{}")
+        filename, size = str(data["filename"]), int(data["size"])
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"error": "Paramètres attendus : filename, size."}, status=400)
+    try:
+        upload = uploads.start_upload(request.user, filename, size)
+    except ValidationError as e:
+        return _upload_error(e)
+    return JsonResponse(_upload_state(upload), status=201)
 
+@login_required
+@require_http_methods(["GET", "PUT"])
+def upload_chunk(request, upload_id):
+    upload = get_object_or_404(ChunkedUpload, upload_id=upload_id, user=request.user)
+    if request.method == "GET":
+        # Reprise : le client demande où reprendre
+        return JsonResponse(_upload_state(upload))
+    try:
+        offset = int(request.GET.get("offset", upload.offset))
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return JsonResponse({"error": "offset invalide."}, status=400)
+    try:
+        uploads.write_chunk(upload, offset, request, length)
+    except ValidationError as e:
+        upload.refresh_from_db()
+        return _upload_error(e, upload, status=409)
+    return JsonResponse(_upload_state(upload))
 
+@login_required
+@require_POST
+def upload_finalize(request, upload_id):
+    upload = get_object_or_404(ChunkedUpload, upload_id=upload_id, user=request.user)
+    try:
+        uploads.finalize_upload(upload)
+    except ValidationError as e:
+        return _upload_error(e, upload)
+    return JsonResponse(_upload_state(upload))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SessionappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Sessionapp'
+
+    def ready(self):
+        # Enregistrement des signaux (traces des suppressions, statistiques des sessions)
+        from . import signals  # noqa: F401
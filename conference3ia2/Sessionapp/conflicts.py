@@ -0,0 +1,157 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+
+
+# -----------------------------
+# Conflits de salle
+# -----------------------------
+# Deux sessions sont en conflit si elles ont lieu dans la même salle, le même
+# jour, pour la même conférence, et que leurs créneaux [début, fin) se
+# chevauchent (une session peut commencer à l'heure où la précédente finit).
+#   - à l'enregistrement (Session.save / clean) : une requête servie par
+#     l'index (conference, session_day, room, start_time)
+#   - par lots (import, planification) : SlotIndex, en mémoire
+#   - rapport d'une conférence : find_conflicts, balayage en O(n log n + k)
+#     (k : nombre de conflits)
+
+SLOT_FIELDS = ("conference_id", "session_day", "room", "start_time", "end_time")
+
+
+class RoomConflict(ValidationError):
+    pass
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute + value.second / 60
+
+
+def slot_key(session):
+    return session.conference_id, session.session_day, session.room
+
+
+def conflict_error(session, others):
+    labels = ", ".join(f"« {other.title} » ({other.start_time:%H:%M}-{other.end_time:%H:%M})" for other in others)
+    return RoomConflict(f"La salle {session.room} est déjà occupée le {session.session_day:%d/%m/%Y} : {labels}.")
+
+
+# --- Contrôle à l'enregistrement ---
+def conflicting_sessions(session):
+    """Sessions enregistrées qui chevauchent ``session`` (requête sur l'index de créneaux)."""
+    from .models import Session
+    queryset = Session.objects.filter(
+        conference_id=session.conference_id,
+        session_day=session.session_day,
+        room=session.room,
+        start_time__lt=session.end_time,
+        end_time__gt=session.start_time,
+    ).order_by("start_time")
+    if session.pk is not None:
+        queryset = queryset.exclude(pk=session.pk)
+    return queryset
+
+
+def check_session(session):
+    """Lève RoomConflict si le créneau de ``session`` est déjà occupé."""
+    if None in (session.conference_id, session.session_day, session.room, session.start_time, session.end_time):
+        return
+    others = list(conflicting_sessions(session).only("session_id", "title", "start_time", "end_time")[:5])
+    if others:
+        raise conflict_error(session, others)
+
+
+# --- Contrôle par lots ---
+class SlotIndex:
+    """
+    Créneaux occupés, par (conférence, jour, salle), triés par heure de
+    début. Une recherche coûte O(log n) plus les créneaux qui commencent
+    moins d'une « durée maximale » avant le créneau cherché.
+    """
+
+    def __init__(self, sessions=()):
+        self._slots = defaultdict(list)  # clé -> [(début, fin, n°, session)] triés
+        self._longest = defaultdict(float)
+        self._counter = 0
+        for session in sessions:
+            self.add(session)
+
+    def load(self, conference_ids, exclude=()):
+        """
+        Ajoute les sessions enregistrées des conférences ``conference_ids``
+        (une requête), sauf ``exclude`` (sessions modifiées ou supprimées).
+        """
+        from .models import Session
+        sessions = Session.objects.filter(conference_id__in=conference_ids).only("session_id", "title", *SLOT_FIELDS)
+        if exclude:
+            sessions = sessions.exclude(pk__in=exclude)
+        for session in sessions:
+            self.add(session)
+
+    def add(self, session):
+        start, end = _minutes(session.start_time), _minutes(session.end_time)
+        key = slot_key(session)
+        self._counter += 1
+        insort(self._slots[key], (start, end, self._counter, session))
+        self._longest[key] = max(self._longest[key], end - start)
+
+    def conflicts(self, session):
+        key = slot_key(session)
+        slots = self._slots.get(key)
+        if not slots:
+            return []
+        start, end = _minutes(session.start_time), _minutes(session.end_time)
+        found = []
+        # Créneaux commençant avant la fin de ``session``, parcourus à rebours
+        position = bisect_left(slots, (end,))
+        lowest = start - self._longest[key]
+        while position > 0:
+            position -= 1
+            other_start, other_end, _, other = slots[position]
+            if other_start <= lowest:
+                break
+            if other_end > start and other is not session:
+                found.append(other)
+        found.reverse()
+        return found
+
+    def check_and_add(self, session):
+        """Lève RoomConflict en cas de chevauchement, réserve le créneau sinon."""
+        others = self.conflicts(session)
+        if others:
+            raise conflict_error(session, others)
+        self.add(session)
+
+
+# --- Rapport ---
+def find_conflicts(sessions):
+    """
+    Couples (a, b) de sessions en conflit, a commençant avant b. Tri par
+    salle et heure de début puis balayage avec un tas des heures de fin des
+    sessions en cours : O(n log n + k).
+    """
+    ordered = sorted(sessions, key=lambda s: (slot_key(s), s.start_time, s.end_time, s.pk or 0))
+    pairs = []
+    current_key = None
+    running = []  # tas (fin, n°, session)
+    for number, session in enumerate(ordered):
+        key = slot_key(session)
+        if key != current_key:
+            current_key, running = key, []
+        while running and running[0][0] <= session.start_time:
+            heapq.heappop(running)
+        pairs.extend((other, session) for _, _, other in running)
+        heapq.heappush(running, (session.end_time, number, session))
+    return pairs
+
+
+def conference_conflicts(conference):
+    """Rapport des conflits de salle d'une conférence (une requête, dans l'ordre de l'index)."""
+    from .models import Session
+    sessions = (
+        Session.objects.filter(conference=conference)
+        .order_by("session_day", "room", "start_time")
+        .only("session_id", "title", *SLOT_FIELDS)
+    )
+    return find_conflicts(sessions)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Conferenceapp.models import Conference
+from Sessionapp.conflicts import RoomConflict
+from Sessionapp.scheduler import day_slots, schedule_conference
+
+
+class Command(BaseCommand):
+    help = (
+        "Construit le programme d'une conférence : regroupe les soumissions acceptées par mots-clés "
+        "et crée les sessions sur les créneaux libres (salles et auteurs sans conflit)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("conference_id", type=int)
+        parser.add_argument("--rooms", nargs="+", help="Salles disponibles (PROGRAM_ROOMS par défaut).")
+        parser.add_argument("--papers-per-session", type=int, help="Articles par session (PROGRAM_PAPERS_PER_SESSION).")
+        parser.add_argument("--day-start", help="Début de journée, HH:MM (PROGRAM_DAY_START).")
+        parser.add_argument("--day-end", help="Fin de journée, HH:MM (PROGRAM_DAY_END).")
+        parser.add_argument("--session-minutes", type=int, help="Durée d'une session (PROGRAM_SESSION_MINUTES).")
+        parser.add_argument("--break-minutes", type=int, help="Pause entre deux sessions (PROGRAM_BREAK_MINUTES).")
+        parser.add_argument("--dry-run", action="store_true", help="Affiche le programme sans l'enregistrer.")
+
+    def handle(self, *args, conference_id, dry_run, **options):
+        try:
+            conference = Conference.objects.get(pk=conference_id)
+        except Conference.DoesNotExist:
+            raise CommandError(f"Conférence {conference_id} introuvable.")
+        try:
+            slots = day_slots(options["day_start"], options["day_end"], options["session_minutes"], options["break_minutes"])
+        except ValueError as e:
+            raise CommandError(e)
+
+        try:
+            plan = schedule_conference(
+                conference, dry_run=dry_run, rooms=options["rooms"], papers_per_session=options["papers_per_session"],
+                slots=slots,
+            )
+        except RoomConflict as e:
+            # Session créée pendant le calcul : relancer la commande
+            raise CommandError(" ".join(e.messages))
+        if options["verbosity"] > 1 or dry_run:
+            for session, papers in plan.sessions:
+                self.stdout.write(
+                    f"{session.session_day} {session.start_time:%H:%M}-{session.end_time:%H:%M} "
+                    f"salle {session.room} : {session.title} ({len(papers)} article(s))"
+                )
+        style = self.style.WARNING if plan.unscheduled else self.style.SUCCESS
+        self.stdout.write(style(f"{conference.name} : {plan}{' (simulation)' if dry_run else ''}."))
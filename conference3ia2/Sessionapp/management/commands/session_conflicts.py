@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from Conferenceapp.models import Conference
+from Sessionapp.conflicts import conference_conflicts
+
+
+class Command(BaseCommand):
+    help = "Liste les sessions programmées dans la même salle sur des créneaux qui se chevauchent."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "conference_ids", nargs="*", type=int, help="Conférences à contrôler (toutes par défaut)."
+        )
+
+    def handle(self, *args, conference_ids, **options):
+        conferences = Conference.objects.order_by("start_date").only("conference_id", "name")
+        if conference_ids:
+            conferences = conferences.filter(pk__in=conference_ids)
+
+        total = 0
+        for conference in conferences:
+            for first, second in conference_conflicts(conference):
+                total += 1
+                self.stdout.write(
+                    f"{conference.name} — {first.session_day} salle {first.room} : "
+                    f"« {first.title} » ({first.start_time:%H:%M}-{first.end_time:%H:%M}) / "
+                    f"« {second.title} » ({second.start_time:%H:%M}-{second.end_time:%H:%M})"
+                )
+        style = self.style.WARNING if total else self.style.SUCCESS
+        self.stdout.write(style(f"{total} conflit(s) de salle."))
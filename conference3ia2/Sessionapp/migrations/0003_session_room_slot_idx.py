@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0013_conference_stats'),
+        ('Sessionapp', '0002_alter_session_end_time_alter_session_room_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['conference', 'session_day', 'room', 'start_time'], name='session_room_slot_idx'),
+        ),
+    ]
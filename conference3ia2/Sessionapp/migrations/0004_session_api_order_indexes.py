@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0014_submission_session'),
+        ('Sessionapp', '0003_session_room_slot_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['session_day', 'start_time', 'session_id'], name='session_day_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['conference', 'session_day', 'start_time', 'session_id'], name='session_conf_order_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Conferenceapp', '0014_submission_session'),
+        ('Sessionapp', '0004_session_api_order_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_id', models.IntegerField()),
+                ('conference_id', models.IntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['updated_at', 'session_id'], name='session_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sessiontombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_idx'),
+        ),
+    ]
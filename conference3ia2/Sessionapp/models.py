@@ -1,8 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from Conferenceapp.models import Conference
 
+# Champs dont la modification peut créer un conflit de salle (voir conflicts.py)
+SLOT_UPDATE_FIELDS = {"conference", "conference_id", "session_day", "room", "start_time", "end_time"}
+
 # Create your models here.
 class Session(models.Model):
     session_id=models.AutoField(primary_key=True)
@@ -34,7 +38,59 @@ class Session(models.Model):
                 raise ValidationError(
                     "La date de la session doit être comprise entre les dates de début et de fin de la conférence."
                 )
-    
+
+    def validate_constraints(self, exclude=None):
+        # Salle déjà occupée sur ce créneau (voir conflicts.py), vérifié comme une
+        # contrainte d'exclusion : par full_clean et les ModelForm
+        super().validate_constraints(exclude=exclude)
+        if not (SLOT_UPDATE_FIELDS & set(exclude or ())):
+            from .conflicts import check_session
+            check_session(self)
+
+    def save(self, *args, check_conflicts=True, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields) & SLOT_UPDATE_FIELDS:
+            check_conflicts = False
+        if not check_conflicts:
+            return super().save(*args, **kwargs)
+        from .conflicts import check_session
+        # Contrôle et écriture dans la même transaction ; le verrou sur la
+        # conférence sérialise les réservations concurrentes (sauf SQLite,
+        # où les écritures sont déjà sérialisées)
+        with transaction.atomic():
+            Conference.objects.select_for_update().filter(pk=self.conference_id).exists()
+            check_session(self)
+            super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Recherche des sessions d'une salle qui chevauchent un créneau
+            models.Index(fields=["conference", "session_day", "room", "start_time"], name="session_room_slot_idx"),
+            # Pages de l'API (voir sessionAppApi) : ordre (jour, début, id), avec ou sans conférence
+            models.Index(fields=["session_day", "start_time", "session_id"], name="session_day_order_idx"),
+            models.Index(
+                fields=["conference", "session_day", "start_time", "session_id"], name="session_conf_order_idx"
+            ),
+            # Synchronisation incrémentale (sessionAppApi/sync.py) : modifiées depuis une date
+            models.Index(fields=["updated_at", "session_id"], name="session_updated_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.session_day})"
 
+
+# Trace d'une session supprimée, pour que les clients synchronisés la retirent
+# (voir sessionAppApi/sync.py ; purge : purge_session_tombstones)
+class SessionTombstone(models.Model):
+    session_id = models.IntegerField()
+    # Pas de clé étrangère : la conférence a pu être supprimée avec ses sessions
+    conference_id = models.IntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Session {self.session_id} supprimée le {self.deleted_at:%d/%m/%Y %H:%M}"
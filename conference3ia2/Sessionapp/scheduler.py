@@ -0,0 +1,251 @@
+import heapq
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from Conferenceapp.models import Conference, Submission, normalize_keyword, parse_keywords
+from Conferenceapp.stats import rebuild_conference_stats
+
+from .conflicts import SlotIndex
+from .models import Session
+
+
+# -----------------------------
+# Construction du programme d'une conférence
+# -----------------------------
+# Les soumissions acceptées pas encore programmées sont regroupées en sessions
+# par similarité de mots-clés, puis placées sur les créneaux libres
+# (jour x horaire x salle) sous deux contraintes :
+#   - une salle n'accueille qu'une session à la fois (SlotIndex, sessions
+#     existantes comprises) ;
+#   - un auteur ne présente pas dans deux sessions qui se chevauchent
+#     (SpeakerAgenda, articles déjà programmés compris).
+# Regroupement glouton : chaque session part de l'article restant le plus
+# « central » et s'agrège les articles qui partagent le plus de mots-clés
+# avec elle (poids inverse de la fréquence du mot-clé). Les scores ne sont
+# mis à jour que pour les articles liés par un mot-clé (index inversé, tas à
+# invalidation paresseuse) : quelques secondes pour des milliers d'articles.
+# Le résultat est écrit en une transaction, sous le verrou de la conférence
+# (comme Session.save) et après un nouveau contrôle des salles : bulk_create
+# des sessions puis rattachement des soumissions (Submission.session).
+
+
+class ProgramPlan:
+    def __init__(self, conference):
+        self.conference = conference
+        self.sessions = []  # (Session non enregistrée, [submission_id])
+        self.unscheduled = []  # submission_id sans créneau disponible
+
+    @property
+    def papers(self):
+        return sum(len(papers) for _, papers in self.sessions)
+
+    def __str__(self):
+        text = f"{len(self.sessions)} session(s), {self.papers} article(s) programmé(s)"
+        if self.unscheduled:
+            text += f", {len(self.unscheduled)} sans créneau"
+        return text
+
+
+def _setting(name, default):
+    return getattr(settings, f"PROGRAM_{name}", default)
+
+
+def _as_time(value):
+    return value if isinstance(value, time) else time.fromisoformat(value)
+
+
+def day_slots(day_start=None, day_end=None, session_minutes=None, break_minutes=None):
+    """Horaires (début, fin) des sessions d'une journée."""
+    start = datetime.combine(datetime.min, _as_time(day_start or _setting("DAY_START", "09:00")))
+    end = datetime.combine(datetime.min, _as_time(day_end or _setting("DAY_END", "18:00")))
+    length = timedelta(minutes=session_minutes or _setting("SESSION_MINUTES", 90))
+    pause = timedelta(minutes=_setting("BREAK_MINUTES", 30) if break_minutes is None else break_minutes)
+    slots = []
+    while start + length <= end:
+        slots.append((start.time(), (start + length).time()))
+        start += length + pause
+    return slots
+
+
+# --- Regroupement ---
+def group_papers(papers, capacity):
+    """
+    ``papers`` : [(submission_id, {mot-clé normalisé})]. Renvoie des groupes
+    d'au plus ``capacity`` identifiants, les plus cohérents d'abord.
+    """
+    keywords = dict(papers)
+    postings = defaultdict(list)
+    for pk, words in papers:
+        for word in words:
+            postings[word].append(pk)
+    # Un mot-clé porté par un seul article ne rapproche rien
+    weight = {word: 1 / len(pks) for word, pks in postings.items() if len(pks) > 1}
+
+    # Graines : les articles dont les mots-clés sont les plus partagés
+    centrality = {pk: sum(len(postings[word]) for word in words if word in weight) for pk, words in papers}
+    seeds = sorted(keywords, key=lambda pk: (-centrality[pk], pk))
+    assigned = set()
+    groups = []
+    for seed in seeds:
+        if seed in assigned:
+            continue
+        group = [seed]
+        assigned.add(seed)
+        scores = Counter()
+        heap = []
+        covered = set()
+
+        def absorb(pk):
+            for word in keywords[pk]:
+                if word not in weight or word in covered:
+                    continue
+                covered.add(word)
+                for other in postings[word]:
+                    if other not in assigned:
+                        scores[other] += weight[word]
+                        heapq.heappush(heap, (-scores[other], other))
+
+        absorb(seed)
+        while len(group) < capacity and heap:
+            score, pk = heapq.heappop(heap)
+            if pk in assigned or -score != scores[pk]:
+                continue  # entrée périmée
+            group.append(pk)
+            assigned.add(pk)
+            absorb(pk)
+        groups.append(group)
+
+    # Articles isolés : regroupés entre eux plutôt qu'une session chacun
+    full = [group for group in groups if len(group) > 1]
+    singles = [group[0] for group in groups if len(group) == 1]
+    full.extend(singles[start:start + capacity] for start in range(0, len(singles), capacity))
+    return full
+
+
+def _topic(group, labels):
+    counts = Counter(key for pk in group for key in labels[pk])
+    if not counts:
+        return "Varia"
+    key, _ = min(counts.items(), key=lambda item: (-item[1], item[0]))
+    return next(labels[pk][key] for pk in group if key in labels[pk])
+
+
+# --- Placement ---
+class SpeakerAgenda:
+    """Créneaux [début, fin) où chaque auteur présente déjà, par jour."""
+
+    def __init__(self):
+        self._slots = defaultdict(list)  # (auteur, jour) -> [(début, fin)]
+
+    def load(self, conference):
+        # Articles déjà rattachés à une session de la conférence (une requête)
+        rows = Submission.objects.filter(conference=conference, session__isnull=False).values_list(
+            "user_id", "session__session_day", "session__start_time", "session__end_time"
+        )
+        for user_id, day, start, end in rows:
+            self._slots[user_id, day].append((start, end))
+
+    def is_free(self, speakers, day, start, end):
+        return not any(
+            other_start < end and other_end > start
+            for speaker in speakers
+            for other_start, other_end in self._slots.get((speaker, day), ())
+        )
+
+    def add(self, speakers, day, start, end):
+        for speaker in speakers:
+            self._slots[speaker, day].append((start, end))
+
+
+def build_program(conference, rooms=None, papers_per_session=None, slots=None):
+    """Calcule le programme (rien n'est écrit) ; voir apply_program."""
+    rooms = list(rooms or _setting("ROOMS", ["A1", "A2", "A3"]))
+    capacity = papers_per_session or _setting("PAPERS_PER_SESSION", 4)
+    slots = slots or day_slots()
+    plan = ProgramPlan(conference)
+
+    rows = list(
+        Submission.objects.filter(conference=conference, status="accepted", session__isnull=True)
+        .order_by("submission_id")
+        .values_list("submission_id", "keywords", "user_id")
+    )
+    labels = {}
+    authors = {}
+    for pk, keywords, user_id in rows:
+        labels[pk] = {normalize_keyword(label): label for label in parse_keywords(keywords)}
+        authors[pk] = user_id
+    groups = group_papers([(pk, set(labels[pk])) for pk, *_ in rows], capacity)
+
+    # Créneaux libres, dans l'ordre du programme ; sessions existantes respectées
+    occupied = SlotIndex()
+    occupied.load([conference.pk])
+    length = (conference.end_date - conference.start_date).days + 1
+    days = [conference.start_date + timedelta(days=offset) for offset in range(length)]
+    free = []
+    for day in days:
+        for start, end in slots:
+            for room in rooms:
+                candidate = Session(conference=conference, session_day=day, start_time=start, end_time=end, room=room)
+                if not occupied.conflicts(candidate):
+                    free.append(candidate)
+
+    busy = SpeakerAgenda()
+    busy.load(conference)
+    used = set()
+    first_free = 0
+    for group in sorted(groups, key=len, reverse=True):
+        speakers = {authors[pk] for pk in group}
+        while first_free in used:
+            first_free += 1
+        for index in range(first_free, len(free)):
+            candidate = free[index]
+            moment = (candidate.session_day, candidate.start_time, candidate.end_time)
+            if index in used or not busy.is_free(speakers, *moment):
+                continue
+            used.add(index)
+            busy.add(speakers, *moment)
+            candidate.topic = _topic(group, labels)[:255]
+            plan.sessions.append((candidate, group))
+            break
+        else:
+            plan.unscheduled.extend(group)
+
+    plan.sessions.sort(key=lambda item: (item[0].session_day, item[0].start_time, item[0].room))
+    for number, (session, _) in enumerate(plan.sessions, start=1):
+        session.title = f"Session {number} : {session.topic}"[:255]
+    return plan
+
+
+@transaction.atomic
+def apply_program(plan):
+    """
+    Enregistre les sessions du plan et y rattache les soumissions. Lève
+    RoomConflict (rien n'est écrit) si une salle a été prise depuis build_program.
+    """
+    # Même verrou que Session.save : pas de réservation concurrente pendant l'écriture
+    Conference.objects.select_for_update().filter(pk=plan.conference.pk).exists()
+    occupied = SlotIndex()
+    occupied.load([plan.conference.pk])
+    for session, _ in plan.sessions:
+        occupied.check_and_add(session)
+    sessions = Session.objects.bulk_create([session for session, _ in plan.sessions])
+    now = timezone.now()
+    papers = []
+    for session, (_, group) in zip(sessions, plan.sessions):
+        for pk in group:
+            papers.append(Submission(submission_id=pk, session_id=session.pk, updated_at=now))
+    Submission.objects.bulk_update(papers, ["session", "updated_at"], batch_size=500)
+    # bulk_create ne déclenche pas les signaux : sessions par jour recalculées ici
+    rebuild_conference_stats([plan.conference.pk])
+    return sessions
+
+
+def schedule_conference(conference, dry_run=False, **options):
+    plan = build_program(conference, **options)
+    if not dry_run and plan.sessions:
+        apply_program(plan)
+    return plan
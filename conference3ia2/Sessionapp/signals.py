@@ -0,0 +1,38 @@
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from Conferenceapp import stats
+from .models import Session, SessionTombstone
+
+
+# --- Traces des suppressions (synchronisation incrémentale des clients) ---
+@receiver(post_delete, sender=Session)
+def record_tombstone(sender, instance, **kwargs):
+    SessionTombstone.objects.create(session_id=instance.pk, conference_id=instance.conference_id)
+
+
+# --- Statistiques par conférence (sessions par jour, voir Conferenceapp/stats.py) ---
+@receiver(post_init, sender=Session)
+def remember_session_stats(sender, instance, **kwargs):
+    instance._stats_state = stats.stats_state(instance, stats.SESSION_STATS_FIELDS)
+
+
+@receiver(pre_save, sender=Session)
+def load_session_stats(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.complete_stats_state(sender, instance, stats.SESSION_STATS_FIELDS)
+
+
+@receiver(post_save, sender=Session)
+def count_session(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new = stats.stats_state(instance, stats.SESSION_STATS_FIELDS, None if created else instance._stats_state)
+    stats.record_session_change(None if created else instance._stats_state, new)
+    instance._stats_state = new
+
+
+@receiver(post_delete, sender=Session)
+def uncount_session(sender, instance, **kwargs):
+    if instance._stats_state and None not in instance._stats_state:
+        stats.record_session_change(instance._stats_state, None)
@@ -1,3 +1,154 @@
+import io
+from datetime import date, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from Conferenceapp.models import Conference, Submission
+from Conferenceapp.testing import make_conference
+from .conflicts import RoomConflict, SlotIndex, conference_conflicts, find_conflicts
+from .models import Session
+from .scheduler import apply_program, build_program, day_slots, schedule_conference
+
+
+def slot(conference, start, end, room="A1", day=None, **kwargs):
+    return Session(
+        title=kwargs.pop("title", f"{room} {start}-{end}"),
+        topic="IA",
+        room=room,
+        session_day=day or conference.start_date,
+        start_time=time(*start),
+        end_time=time(*end),
+        conference=conference,
+        **kwargs,
+    )
+
+
+class RoomConflictTests(TestCase):
+    def setUp(self):
+        self.conference = make_conference()
+        self.session = slot(self.conference, (9, 0), (10, 30))
+        self.session.save()
+
+    def test_save_refuses_an_overlapping_slot(self):
+        with self.assertRaises(RoomConflict):
+            slot(self.conference, (10, 0), (11, 0)).save()
+        # Même créneau dans une autre salle, un autre jour, ou juste après : accepté
+        slot(self.conference, (10, 0), (11, 0), room="B2").save()
+        slot(self.conference, (10, 0), (11, 0), day=self.conference.end_date).save()
+        slot(self.conference, (10, 30), (11, 30)).save()
+        # Modifier la session elle-même n'est pas un conflit
+        self.session.title = "Renommée"
+        self.session.save()
+
+    def test_full_clean_reports_the_conflict(self):
+        with self.assertRaises(ValidationError) as raised:
+            slot(self.conference, (8, 0), (12, 0)).full_clean()
+        self.assertIn("A1", " ".join(raised.exception.messages))
+
+    def test_slot_index_matches_brute_force(self):
+        sessions = [
+            slot(self.conference, (hour, minute), (hour + length, minute), room=room)
+            for hour, minute, length, room in [
+                (8, 0, 4, "A1"), (9, 0, 1, "A1"), (10, 30, 1, "A1"), (12, 0, 1, "A1"), (9, 0, 2, "B2"), (13, 0, 1, "A1"),
+            ]
+        ]
+        index = SlotIndex(sessions[:3])
+        probe = slot(self.conference, (11, 0), (12, 30))
+        self.assertEqual(index.conflicts(probe), [sessions[0], sessions[2]])
+        self.assertEqual(index.conflicts(slot(self.conference, (12, 0), (13, 0))), [])
+
+        expected = {
+            (a.title, b.title)
+            for i, a in enumerate(sessions) for b in sessions[i + 1:]
+            if a.room == b.room and a.start_time < b.end_time and b.start_time < a.end_time
+        }
+        found = {tuple(sorted((a.title, b.title))) for a, b in find_conflicts(sessions)}
+        self.assertEqual(found, {tuple(sorted(pair)) for pair in expected})
+
+    def test_conference_report_and_command(self):
+        # Conflit antérieur au contrôle (ou inséré sans passer par save)
+        slot(self.conference, (10, 0), (11, 0), title="Doublon").save(check_conflicts=False)
+        with self.assertNumQueries(1):
+            pairs = conference_conflicts(self.conference)
+        self.assertEqual([(a.pk, b.title) for a, b in pairs], [(self.session.pk, "Doublon")])
+        out = io.StringIO()
+        call_command("session_conflicts", self.conference.pk, stdout=out)
+        self.assertIn("1 conflit(s)", out.getvalue())
+
+
+class ProgramSchedulerTests(TestCase):
+    def setUp(self):
+        from Userapp.models import User
+        self.conference = make_conference(end_date=date.today() + timedelta(days=30))
+        self.authors = [
+            User.objects.create_user(username=f"author{index}", email=f"author{index}@esprit.tn") for index in range(6)
+        ]
+        topics = ["vision, images", "vision, detection", "graphes, reseaux", "réseaux, graphes", "vision", "graphes"]
+        for index, keywords in enumerate(topics * 2):
+            Submission.objects.create(
+                title=f"Article {index}", abstract="Résumé", keywords=keywords, paper="paper/test.pdf",
+                status="accepted", user=self.authors[index % 6], conference=self.conference,
+            )
+        Submission.objects.create(
+            title="Refusé", abstract="Résumé", keywords="vision", paper="paper/test.pdf",
+            status="rejected", user=self.authors[0], conference=self.conference,
+        )
+        # Créneau déjà pris dans la salle A1
+        slot(self.conference, (9, 0), (10, 30), room="A1", title="Ouverture").save()
+
+    def test_groups_by_keywords_without_conflicts(self):
+        plan = schedule_conference(
+            self.conference, rooms=["A1", "A2"], papers_per_session=6,
+            slots=day_slots("09:00", "12:00", 90, 0),
+        )
+        self.assertEqual((len(plan.sessions), plan.papers, plan.unscheduled), (2, 12, []))
+        sessions = Session.objects.filter(conference=self.conference).exclude(title="Ouverture")
+        self.assertEqual(sorted(sessions.values_list("topic", flat=True)), ["graphes", "vision"])
+        for session in sessions:
+            keywords = set(session.submissions.values_list("keywords", flat=True))
+            self.assertEqual(len({"vision" in k for k in keywords}), 1)
+        self.assertEqual(conference_conflicts(self.conference), [])
+        # Un auteur ne présente jamais dans deux sessions simultanées
+        moments = {}
+        for session in sessions.prefetch_related("submissions"):
+            for submission in session.submissions.all():
+                key = (session.session_day, session.start_time, submission.user_id)
+                self.assertEqual(moments.setdefault(key, session.pk), session.pk)
+        self.assertEqual(Conference.objects.get(pk=self.conference.pk).stats.sessions, 3)
+        self.assertFalse(Submission.objects.filter(status="rejected", session__isnull=False).exists())
+
+        # Relancer ne reprogramme pas les articles déjà placés
+        self.assertEqual(schedule_conference(self.conference).papers, 0)
+
+    def test_authors_already_programmed_are_not_double_booked(self):
+        # Un article de author0 est déjà présenté à l'ouverture (09:00-10:30, premier jour)
+        opening = Session.objects.get(title="Ouverture")
+        programmed = Submission.objects.filter(user=self.authors[0], status="accepted").order_by("pk").first()
+        Submission.objects.filter(pk=programmed.pk).update(session=opening)
+        plan = schedule_conference(
+            self.conference, rooms=["A2", "A3"], papers_per_session=6, slots=day_slots("09:30", "12:30", 90, 0),
+        )
+        self.assertEqual((plan.papers, plan.unscheduled), (11, []))
+        authors = dict(Submission.objects.values_list("pk", "user_id"))
+        for session, papers in plan.sessions:
+            overlaps = session.session_day == opening.session_day and session.start_time < opening.end_time
+            if overlaps:
+                self.assertNotIn(self.authors[0].pk, {authors[pk] for pk in papers})
+
+    def test_apply_rechecks_rooms_under_the_lock(self):
+        plan = build_program(self.conference, rooms=["A2"], slots=day_slots("09:00", "12:00", 90, 0))
+        first, _ = plan.sessions[0]
+        # Salle réservée entre le calcul et l'écriture
+        slot(self.conference, (9, 30), (10, 0), room="A2", day=first.session_day, title="Imprévue").save()
+        with self.assertRaises(RoomConflict):
+            apply_program(plan)
+        self.assertEqual(Session.objects.filter(conference=self.conference).count(), 2)
+        self.assertFalse(Submission.objects.filter(session__isnull=False).exists())
+
+    def test_command_dry_run(self):
+        out = io.StringIO()
+        call_command("schedule_program", self.conference.pk, "--rooms", "B1", "--dry-run", stdout=out)
+        self.assertIn("12 article(s) programmé(s) (simulation)", out.getvalue())
+        self.assertFalse(Submission.objects.filter(session__isnull=False).exists())
@@ -3,5 +3,7 @@ from .models import User
 
 
 # Register your models here.
-admin.site.register(User)
-
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    # Nécessaire à la saisie semi-automatique de l'auteur d'une soumission
+    search_fields = ("username", "email", "first_name", "last_name")
@@ -0,0 +1,8 @@
+from conference3ia2.ids import SortableIdGenerator
+
+
+# Identifiants utilisateur : USER + horodatage + aléa (même schéma que les soumissions).
+# Chaque processus produit des identifiants croissants et 80 bits d'aléa séparent
+# les processus : pas de sonde de la table, pas d'espace de valeurs à épuiser.
+# Les anciens identifiants (USER + 4 caractères hexadécimaux) restent valides.
+sortable_user_id = SortableIdGenerator(prefix="USER")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Userapp', '0002_alter_user_email_alter_user_first_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='user_id',
+            field=models.CharField(editable=False, max_length=32, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
@@ -1,16 +1,18 @@
 from django.db import models
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 
 
 # Create your models here.
-import uuid
+from django.utils.module_loading import import_string
 def generate_user_id():
-    return "USER"+uuid.uuid4().hex[:4].upper()
+    # Générateur configurable (USER_ID_GENERATOR) : identifiants uniques sans requête en base
+    return import_string(getattr(settings,"USER_ID_GENERATOR","Userapp.ids.sortable_user_id"))()
 def verify_email(email):
     domaines=["esprit.tn","sesame.com","tek.tn","central.tn"]
-    email_domaine=email.split("@")[1]
+    email_domaine=email.rpartition("@")[2]
     if email_domaine not in domaines:
         raise ValidationError ("l'email est invalide et doit appartenir a un domaine universitaire privé")
     
@@ -19,7 +21,7 @@ name_validator= RegexValidator(
     message="ce champs ne doit contenir que des lettres et des espaces"
 )
 class User(AbstractUser):
-    user_id=models.CharField(max_length=8,primary_key=True,unique=True,editable=False)
+    user_id=models.CharField(max_length=32,primary_key=True,unique=True,editable=False)
     first_name=models.CharField(max_length=255,validators=[name_validator])
     last_name=models.CharField(max_length=255,validators=[name_validator])
     ROLE=[
@@ -35,10 +37,10 @@ class User(AbstractUser):
     updated_at=models.DateTimeField(auto_now=True)  
     def save(self,*args,**kwargs):
         if not self.user_id:
-            newid=generate_user_id()
-            while User.objects.filter(user_id=newid).exists():
-                newid=generate_user_id()
-            self.user_id=newid
+            # Plus de boucle de vérification : le générateur garantit l'unicité.
+            # Clé toute neuve : INSERT direct, sans l'UPDATE d'essai de Django
+            self.user_id=generate_user_id()
+            kwargs.setdefault("force_insert",True)
         super().save(*args,**kwargs)
 
 
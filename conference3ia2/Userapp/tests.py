@@ -1,3 +1,47 @@
-from django.test import TestCase
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
 
-# Create your tests here.
+from .ids import sortable_user_id
+from .models import User
+
+
+class UserIdTests(TestCase):
+    def test_ids_are_prefixed_unique_sorted_and_fit_the_column(self):
+        ids = [sortable_user_id() for _ in range(10000)]
+        self.assertTrue(all(i.startswith("USER") and len(i) == 30 for i in ids))
+        self.assertLessEqual(len(ids[0]), User._meta.pk.max_length)
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids, sorted(ids))
+
+    def test_users_get_an_id_without_querying_the_table(self):
+        user = User(username="olga", email="olga@esprit.tn")
+        with self.assertNumQueries(1):  # l'INSERT seul
+            user.save()
+        self.assertTrue(user.pk.startswith("USER"))
+
+
+class WidenUserIdMigrationTests(TransactionTestCase):
+    before = [("Userapp", "0002_alter_user_email_alter_user_first_name_and_more")]
+    after = [("Userapp", "0003_widen_user_id")]
+
+    def tearDown(self):
+        # Retour au schéma courant pour les tests suivants
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_legacy_ids_survive_and_new_ids_fit(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        old_apps = executor.loader.project_state(self.before).apps
+        old_apps.get_model("Userapp", "User").objects.create(
+            user_id="USER1a2b", username="legacy", email="legacy@esprit.tn"
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        new_apps = executor.loader.project_state(self.after).apps
+        users = new_apps.get_model("Userapp", "User").objects
+        self.assertTrue(users.filter(pk="USER1a2b", username="legacy").exists())
+        users.create(user_id=sortable_user_id(), username="recent", email="recent@esprit.tn")
+        self.assertEqual(users.count(), 2)
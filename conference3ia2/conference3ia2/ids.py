@@ -0,0 +1,60 @@
+import secrets
+import threading
+import time
+
+
+# -----------------------------
+# Identifiants triables dans le temps
+# -----------------------------
+# Partagé par les applications (soumissions dans Conferenceapp/ids.py,
+# utilisateurs dans Userapp/ids.py) : aucune ne dépend ainsi de l'autre.
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+TIME_LENGTH = 10  # 48 bits de millisecondes
+RANDOM_LENGTH = 16  # 80 bits aléatoires
+RANDOM_BITS = 80
+
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(CROCKFORD[index])
+    return "".join(reversed(chars))
+
+
+class SortableIdGenerator:
+    """
+    Identifiants triables dans le temps à la manière des ULID :
+    préfixe + horodatage en millisecondes + 80 bits aléatoires (base32 Crockford).
+
+    Les identifiants d'un même processus sont strictement croissants (dans une
+    même milliseconde la partie aléatoire est incrémentée) ; entre processus,
+    80 bits d'aléa rendent une collision négligeable. Les insertions se font
+    donc en fin d'index de clé primaire, sans contrôle préalable ni nouvel essai.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def __call__(self, timestamp=None):
+        if timestamp is not None:
+            # Horodatage imposé (reprise d'anciens identifiants) : pas de monotonie à garantir
+            ms = int(timestamp * 1000)
+            return self.prefix + _encode(ms, TIME_LENGTH) + _encode(secrets.randbits(RANDOM_BITS), RANDOM_LENGTH)
+
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms <= self._last_ms:
+                # Même milliseconde (ou horloge qui recule) : on prolonge la séquence
+                ms = self._last_ms
+                rand = self._last_random + 1
+                if rand >> RANDOM_BITS:
+                    ms, rand = ms + 1, secrets.randbits(RANDOM_BITS)
+            else:
+                rand = secrets.randbits(RANDOM_BITS)
+            self._last_ms, self._last_random = ms, rand
+        return self.prefix + _encode(ms, TIME_LENGTH) + _encode(rand, RANDOM_LENGTH)
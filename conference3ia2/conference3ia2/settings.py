@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.forms',
     'rest_framework_simplejwt', 
     'rest_framework',
     'Userapp',
@@ -58,6 +59,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'conference3ia2.urls'
 
+# Les gabarits de widgets sont cherchés aussi dans Templates/ (conferences/widgets/)
+FORM_RENDERER = 'django.forms.renderers.TemplatesSetting'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -127,6 +131,19 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Articles PDF : un seul exemplaire par contenu (voir Conferenceapp/storage.py)
+    "papers": {
+        "BACKEND": "Conferenceapp.storage.ContentAddressedStorage",
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -138,6 +155,94 @@ LOGIN_URL = '/user/login/'
 LOGIN_REDIRECT_URL = '/conferences/liste/'
 LOGOUT_REDIRECT_URL = '/user/login/'
 
+# Nombre de conférences par page (pagination par curseur)
+CONFERENCES_PAGE_SIZE = 20
+
+# Nombre maximal de soumissions par utilisateur, par conférence et par jour (modifiable par conférence)
+SUBMISSIONS_PER_DAY = 3
+
+# Générateur des identifiants de soumission (SUB- + horodatage + aléa, triables dans le temps)
+SUBMISSION_ID_GENERATOR = "Conferenceapp.ids.sortable_submission_id"
+
+# Taille maximale d'un article PDF envoyé par morceaux
+PAPER_MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
+# Envois par morceaux sans activité depuis ce délai : supprimés par purge_chunked_uploads
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24
+
+# Analyse des articles (texte, pages, vignette) : "pool", "sync" ou "off"
+PAPER_PROCESSING = "pool"
+PAPER_PROCESSING_WORKERS = 2
+
+# Les tests tournent avec PAPER_PROCESSING = "off" (voir test_runner.py)
+TEST_RUNNER = "conference3ia2.test_runner.TestRunner"
+
+# Envoi des articles délégué au serveur web : None, "x-sendfile" ou "x-accel-redirect"
+# (nginx : location interne PAPER_SENDFILE_PREFIX pointant sur MEDIA_ROOT)
+PAPER_SENDFILE = None
+PAPER_SENDFILE_PREFIX = "/protected-media/"
+
+# Taille des lots pour les changements d'état en masse dans l'admin
+SUBMISSION_BULK_BATCH_SIZE = 500
+
+# Facettes ou soumissions par réponse sur la page des mots-clés d'une conférence
+KEYWORD_PAGE_SIZE = 50
+
+# Lignes lues par paquet lors des exports de soumissions
+EXPORT_CHUNK_SIZE = 2000
+
+# Lignes validées puis insérées par lot lors des imports CSV (voir Conferenceapp/imports.py)
+IMPORT_BATCH_SIZE = 1000
+
+# Sessions par page dans l'API (pagination par curseur, 200 au plus via ?page_size=)
+SESSION_API_PAGE_SIZE = 50
+
+# Éléments acceptés par requête sur sessions/bulk/ (création, modification, suppression)
+SESSION_BULK_MAX_ITEMS = 1000
+
+# Synchronisation incrémentale des sessions (voir sessionAppApi/sync.py) : lignes par
+# réponse, marge pour les transactions lentes, conservation des traces de suppression
+SESSION_SYNC_PAGE_SIZE = 500
+SESSION_SYNC_MARGIN_SECONDS = 30
+SESSION_TOMBSTONE_RETENTION_DAYS = 90
+
+# Construction automatique du programme (voir Sessionapp/scheduler.py) : salles,
+# journée type et nombre d'articles par session
+PROGRAM_ROOMS = ["A1", "A2", "A3"]
+PROGRAM_DAY_START = "09:00"
+PROGRAM_DAY_END = "18:00"
+PROGRAM_SESSION_MINUTES = 90
+PROGRAM_BREAK_MINUTES = 30
+PROGRAM_PAPERS_PER_SESSION = 4
+
+# Nombre de soumissions par page sur la fiche d'une conférence (admin)
+ADMIN_INLINE_PAGE_SIZE = 25
+
+# Listes de l'admin : comptage exact jusqu'à ce nombre de lignes, estimation au-delà
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+# Cache des fragments de la liste et des fiches de conférences (voir Conferenceapp/fragments.py).
+# Cache local au processus en développement ; en production, un cache partagé
+# (Redis, Memcached) pour que l'invalidation touche tous les processus.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+CONFERENCE_FRAGMENT_TIMEOUT = 24 * 3600
+# Durée de vie des numéros de version des fragments (voir Conferenceapp/fragments.py)
+CONFERENCE_VERSION_TIMEOUT = 7 * 24 * 3600
+
+# Durée de vie du programme sérialisé d'une conférence (API, voir sessionAppApi/program.py)
+CONFERENCE_PROGRAM_TIMEOUT = 24 * 3600
+
+# Au-delà de ce nombre de conférences ouvertes, le formulaire de soumission
+# remplace la liste déroulante par une saisie semi-automatique
+OPEN_CONFERENCES_SELECT_LIMIT = 200
+
+# Générateur des identifiants utilisateur (USER + horodatage + aléa)
+USER_ID_GENERATOR = "Userapp.ids.sortable_user_id"
+
 REST_FRAMEWORK = {
 
 'DEFAULT_AUTHENTICATION_CLASSES': (
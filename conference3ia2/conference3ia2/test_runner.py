@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Lanceur des tests du projet : pas d'analyse des articles en tâche de fond
+    (ni processus de travail, ni avertissements faute d'outils PDF).
+    Les tests du pipeline la réactivent avec override_settings.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._paper_processing = settings.PAPER_PROCESSING
+        settings.PAPER_PROCESSING = "off"
+
+    def teardown_test_environment(self, **kwargs):
+        settings.PAPER_PROCESSING = self._paper_processing
+        super().teardown_test_environment(**kwargs)
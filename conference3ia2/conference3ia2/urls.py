@@ -17,8 +17,6 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
-from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -30,6 +28,6 @@ urlpatterns = [
 
 ]
 
-# Configuration pour servir les fichiers médias en développement
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Pas de static(MEDIA_URL) même en développement : MEDIA_ROOT ne contient que
+# des articles (paper/), leurs vignettes (thumbnails/) et des envois en cours
+# (uploads/), servis uniquement par les vues qui contrôlent l'accès.
@@ -0,0 +1,178 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from Conferenceapp.models import Conference
+from Conferenceapp.stats import rebuild_conference_stats
+from Sessionapp.conflicts import SlotIndex
+from Sessionapp.models import Session
+
+from .serializers import SessionSerializer
+
+
+# -----------------------------
+# Écriture en masse des sessions
+# -----------------------------
+# POST sessions/bulk/ {"create": [...], "update": [{"session_id": 3, ...}], "delete": [4, 5]}
+# Tout est validé avant d'écrire : conférences et sessions visées chargées en
+# une requête chacune, conflits de salle contrôlés en mémoire (SlotIndex) sur
+# les sessions existantes et sur le lot lui-même. Au moindre élément invalide,
+# rien n'est écrit et la réponse 400 donne les erreurs élément par élément
+# ({} pour un élément valide). Sinon bulk_create / bulk_update / delete.
+# Contrôles et écritures ont lieu dans une seule transaction, sous le verrou
+# des conférences citées (comme Session.save).
+
+
+class PrefetchedConferenceField(serializers.Field):
+    """Conférence lue dans le dictionnaire préchargé du contexte (aucune requête par élément)."""
+
+    default_error_messages = {
+        "does_not_exist": "Conférence {pk} introuvable.",
+        "incorrect_type": "Identifiant de conférence attendu.",
+    }
+
+    def to_internal_value(self, data):
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type")
+        conference = self.context["conferences"].get(pk)
+        if conference is None:
+            self.fail("does_not_exist", pk=pk)
+        return conference
+
+    def to_representation(self, value):
+        return value.pk
+
+
+class SessionItemSerializer(SessionSerializer):
+    # Conflits de salle contrôlés pour tout le lot (voir bulk_write)
+    conference = PrefetchedConferenceField()
+
+
+class BulkReport:
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.deleted = []
+
+
+def _as_list(payload, key):
+    value = payload.get(key, [])
+    if not isinstance(value, list):
+        raise serializers.ValidationError({key: ["Une liste est attendue."]})
+    return value
+
+
+def _as_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _model_errors(error):
+    return error.message_dict if hasattr(error, "error_dict") else {"non_field_errors": error.messages}
+
+
+def bulk_write(payload):
+    if not isinstance(payload, dict):
+        raise serializers.ValidationError({"non_field_errors": ["Un objet {create, update, delete} est attendu."]})
+    create_items = _as_list(payload, "create")
+    update_items = _as_list(payload, "update")
+    delete_ids = _as_list(payload, "delete")
+    limit = getattr(settings, "SESSION_BULK_MAX_ITEMS", 1000)
+    if len(create_items) + len(update_items) + len(delete_ids) > limit:
+        raise serializers.ValidationError({"non_field_errors": [f"{limit} éléments au plus par requête."]})
+
+    with transaction.atomic():
+        return _bulk_write(create_items, update_items, delete_ids)
+
+
+def _bulk_write(create_items, update_items, delete_ids):
+    # Préchargement : sessions visées, puis toutes les conférences citées, verrouillées
+    # comme dans Session.save : contrôles et écritures ne voient pas de réservation concurrente
+    update_pks = [_as_pk(item.get("session_id")) if isinstance(item, dict) else None for item in update_items]
+    delete_pks = [_as_pk(value) for value in delete_ids]
+    existing = Session.objects.in_bulk([pk for pk in update_pks + delete_pks if pk is not None])
+    # Conférence d'origine de chaque session (une session déplacée compte pour les deux)
+    original_conferences = {session.conference_id for session in existing.values()}
+    conference_ids = set(original_conferences)
+    for item in create_items + update_items:
+        if isinstance(item, dict) and _as_pk(item.get("conference")) is not None:
+            conference_ids.add(_as_pk(item["conference"]))
+    conferences = Conference.objects.select_for_update().order_by("pk").in_bulk(conference_ids)
+    for session in existing.values():
+        session.conference = conferences[session.conference_id]
+    context = {"conferences": conferences}
+
+    slots = SlotIndex()
+    slots.load(list(conferences), exclude=[pk for pk in update_pks + delete_pks if pk is not None])
+    errors = {"create": [], "update": [], "delete": []}
+    updated, deleted = set(), set()
+    to_create, to_update, changed_fields = [], [], set()
+
+    def check(session):
+        try:
+            session.clean()
+            slots.check_and_add(session)
+        except DjangoValidationError as e:
+            return _model_errors(e)
+        return {}
+
+    for item in create_items:
+        serializer = SessionItemSerializer(data=item, context=context)
+        if not serializer.is_valid():
+            errors["create"].append(serializer.errors)
+            continue
+        session = Session(**serializer.validated_data)
+        errors["create"].append(check(session))
+        to_create.append(session)
+
+    for item, pk in zip(update_items, update_pks):
+        session = existing.get(pk)
+        if session is None or pk in updated:
+            message = "Session modifiée deux fois dans la requête." if pk in updated else "Session introuvable."
+            errors["update"].append({"session_id": [message]})
+            continue
+        updated.add(pk)
+        serializer = SessionItemSerializer(session, data=item, partial=True, context=context)
+        if not serializer.is_valid():
+            errors["update"].append(serializer.errors)
+            continue
+        for field, value in serializer.validated_data.items():
+            setattr(session, field, value)
+            changed_fields.add(field)
+        errors["update"].append(check(session))
+        to_update.append(session)
+
+    for pk in delete_pks:
+        if pk not in existing:
+            errors["delete"].append({"session_id": ["Session introuvable."]})
+        elif pk in updated:
+            errors["delete"].append({"session_id": ["Session modifiée et supprimée dans la requête."]})
+        else:
+            deleted.add(pk)
+            errors["delete"].append({})
+
+    if any(error for items in errors.values() for error in items):
+        raise serializers.ValidationError({key: items for key, items in errors.items() if items})
+
+    report = BulkReport()
+    report.created = Session.objects.bulk_create(to_create)
+    if to_update:
+        now = timezone.now()
+        for session in to_update:
+            session.updated_at = now
+        Session.objects.bulk_update(to_update, sorted(changed_fields | {"updated_at"}), batch_size=500)
+    report.updated = to_update
+    report.deleted = sorted(deleted)
+    if deleted:
+        Session.objects.filter(pk__in=deleted).delete()
+    # bulk_create / bulk_update ne déclenchent pas les signaux : statistiques et
+    # caches des conférences d'origine et d'arrivée
+    affected = original_conferences | {session.conference_id for session in to_create + to_update}
+    rebuild_conference_stats(affected)
+    return report
@@ -0,0 +1,39 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+# -----------------------------
+# Filtres de l'API des sessions
+# -----------------------------
+# ?conference=3&session_day=2026-11-17&room=A1&starts_after=09:00&ends_before=12:00
+# day_from / day_to pour une plage de jours. Chaque combinaison est servie
+# par un index composite (voir Sessionapp.models.Session.Meta.indexes).
+
+class SessionFilterBackend(BaseFilterBackend):
+    # paramètre -> (champ, lookup)
+    filters = {
+        "conference": ("conference_id", "exact"),
+        "session_day": ("session_day", "exact"),
+        "day_from": ("session_day", "gte"),
+        "day_to": ("session_day", "lte"),
+        "room": ("room", "exact"),
+        "starts_after": ("start_time", "gte"),
+        "ends_before": ("end_time", "lte"),
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        conditions = {}
+        errors = {}
+        opts = queryset.model._meta
+        for param, (field, lookup) in self.filters.items():
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            try:
+                conditions[f"{field}__{lookup}"] = opts.get_field(field).to_python(value)
+            except DjangoValidationError as e:
+                errors[param] = e.messages
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**conditions)
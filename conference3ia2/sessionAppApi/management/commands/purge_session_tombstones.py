@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from sessionAppApi.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = "Supprime les traces de sessions supprimées plus anciennes que la durée de conservation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Durée de conservation (SESSION_TOMBSTONE_RETENTION_DAYS par défaut).")
+
+    def handle(self, *args, days, **options):
+        count = purge_tombstones(days)
+        self.stdout.write(self.style.SUCCESS(f"{count} trace(s) de suppression purgée(s)."))
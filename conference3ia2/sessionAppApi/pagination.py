@@ -0,0 +1,108 @@
+import base64
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from Conferenceapp.pagination import keyset_filter
+
+
+# -----------------------------
+# Pagination par curseur de l'API
+# -----------------------------
+# Clé composite complète (CursorPagination de DRF ne garde que le premier
+# champ et complète par un OFFSET) : chaque page est un
+# WHERE (jour, début, id) > (...) ORDER BY jour, début, id LIMIT n servi par
+# l'index du même ordre ; la page 1000 coûte autant que la page 1, et les
+# insertions entre deux pages ne décalent ni ne dupliquent aucune ligne.
+
+
+class KeysetCursorPagination(BasePagination):
+    ordering = ("session_day", "start_time", "session_id")
+    page_size_setting = "SESSION_API_PAGE_SIZE"
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+
+    def get_page_size(self, request):
+        default = getattr(settings, self.page_size_setting, 50)
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            return default
+        return min(max(size, 1), self.max_page_size)
+
+    # --- Jetons ---
+    def encode_cursor(self, obj, reverse):
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        raw = json.dumps(["p" if reverse else "n", values], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token, model):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in ("n", "p") or len(values) != len(self.ordering):
+                raise ValueError(direction)
+            opts = model._meta
+            return direction == "p", [opts.get_field(f).to_python(v) for f, v in zip(self.ordering, values)]
+        except Exception:
+            raise NotFound("Curseur de pagination invalide.")
+
+    # --- Pages ---
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        token = request.query_params.get(self.cursor_query_param)
+
+        reverse, key = False, None
+        if token:
+            reverse, key = self.decode_cursor(token, queryset.model)
+        ordering = [f"-{field}" for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if key is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, key, reverse=reverse))
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, key is not None
+        self.next_cursor = self.encode_cursor(rows[-1], False) if has_next and rows else None
+        self.previous_cursor = self.encode_cursor(rows[0], True) if has_previous and rows else None
+        return rows
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self._link(self.next_cursor)
+
+    def get_previous_link(self):
+        return self._link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,61 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+
+from Conferenceapp.fragments import detail_version, detail_version_key
+from Conferenceapp.models import Conference, Submission
+from Sessionapp.models import Session
+
+from .serializers import ProgramConferenceSerializer, ProgramSessionSerializer
+
+
+# -----------------------------
+# Programme d'une conférence (API)
+# -----------------------------
+# La conférence, ses sessions regroupées par jour puis par salle et les
+# articles de chaque session, lus en trois requêtes (prefetch_related) et
+# sérialisés une fois. Le résultat est mis en cache avec le numéro de version
+# de la fiche de la conférence (fragments.py), qui change à chaque écriture
+# d'une conférence, d'une session ou d'une soumission : une seule lecture du
+# cache (get_many du programme et de la version) suffit à servir la réponse.
+
+
+def program_key(conference_id):
+    return f"conferences:program:{conference_id}"
+
+
+def build_program(conference_id):
+    sessions = Session.objects.order_by("session_day", "room", "start_time", "session_id").prefetch_related(
+        Prefetch(
+            "submissions",
+            queryset=Submission.objects.filter(status="accepted").order_by("title").only("submission_id", "title", "session_id"),
+        )
+    )
+    conference = get_object_or_404(Conference.objects.prefetch_related(Prefetch("sessions", queryset=sessions)), pk=conference_id)
+    days = []
+    for day, day_sessions in groupby(conference.sessions.all(), key=lambda session: session.session_day):
+        rooms = [
+            {"room": room, "sessions": ProgramSessionSerializer(list(room_sessions), many=True).data}
+            for room, room_sessions in groupby(day_sessions, key=lambda session: session.room)
+        ]
+        days.append({"day": day.isoformat(), "rooms": rooms})
+    return {**ProgramConferenceSerializer(conference).data, "days": days}
+
+
+def get_program(conference_id):
+    """(programme, version) : depuis le cache si sa version est la version courante."""
+    version_key = detail_version_key(conference_id)
+    cached = cache.get_many([program_key(conference_id), version_key])
+    version = cached.get(version_key)
+    entry = cached.get(program_key(conference_id))
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1], version
+    if version is None:
+        version = detail_version(conference_id)
+    # Version lue avant les données : une écriture concurrente rendra l'entrée périmée, jamais l'inverse
+    program = build_program(conference_id)
+    cache.set(program_key(conference_id), (version, program), getattr(settings, "CONFERENCE_PROGRAM_TIMEOUT", 24 * 3600))
+    return program, version
@@ -1,7 +1,31 @@
 from rest_framework import serializers
+from Conferenceapp.models import Conference, Submission
 from Sessionapp.models import Session
 
 class SessionSerializer(serializers.ModelSerializer):
+    # Conflits de salle : contrôlés une seule fois, par Session.save() sous le
+    # verrou de la conférence ; SessionViewSet traduit RoomConflict en 400
     class Meta:
         model = Session
         fields = '__all__'
+
+
+# --- Programme d'une conférence (lecture seule, voir program.py) ---
+class ProgramPaperSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Submission
+        fields = ["submission_id", "title"]
+
+
+class ProgramSessionSerializer(serializers.ModelSerializer):
+    papers = ProgramPaperSerializer(source="submissions", many=True, read_only=True)
+
+    class Meta:
+        model = Session
+        fields = ["session_id", "title", "topic", "start_time", "end_time", "papers"]
+
+
+class ProgramConferenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Conference
+        fields = ["conference_id", "name", "theme", "location", "start_date", "end_date"]
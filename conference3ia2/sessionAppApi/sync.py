@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import APIException, NotFound
+
+from Conferenceapp.pagination import keyset_filter
+from Sessionapp.models import Session, SessionTombstone
+
+
+# -----------------------------
+# Synchronisation incrémentale des sessions
+# -----------------------------
+# GET sessions/changes/?since=<jeton> renvoie les sessions créées ou modifiées
+# et les identifiants des sessions supprimées (SessionTombstone) depuis le
+# jeton, puis un nouveau jeton. Deux flux parcourus par clé composite
+# (updated_at, id) et (deleted_at, id), servis par leurs index : le volume
+# échangé dépend de ce qui a changé, pas de la taille du programme.
+# Sans jeton : toutes les sessions (synchronisation initiale), et seulement
+# les suppressions à venir.
+# updated_at est fixé avant la validation de la transaction : une écriture
+# lente peut apparaître avec une date déjà dépassée. La position rendue (en fin
+# de flux comme pour un lot tronqué) ne dépasse donc jamais « maintenant -
+# SESSION_SYNC_MARGIN_SECONDS » ; les dernières lignes peuvent être renvoyées
+# deux fois (le client les remplace).
+
+
+class SyncExpired(APIException):
+    status_code = 410
+    default_detail = "Jeton trop ancien (suppressions purgées) : resynchronisation complète nécessaire."
+    default_code = "sync_expired"
+
+
+STREAMS = {
+    # clé du jeton -> (modèle, champ date, identifiant)
+    "s": (Session, "updated_at", "session_id"),
+    "d": (SessionTombstone, "deleted_at", "id"),
+}
+
+
+def encode_token(positions):
+    raw = json.dumps({key: [stamp.isoformat(), pk] for key, (stamp, pk) in positions.items()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {key: (datetime.fromisoformat(raw[key][0]), int(raw[key][1])) for key in STREAMS}
+    except Exception:
+        raise NotFound("Jeton de synchronisation invalide.")
+    if any(timezone.is_naive(stamp) for stamp, _ in positions.values()):
+        raise NotFound("Jeton de synchronisation invalide.")
+    return positions
+
+
+def _read(key, position, limit, conference_id):
+    model, stamp_field, pk_field = STREAMS[key]
+    queryset = model.objects.order_by(stamp_field, pk_field)
+    if conference_id is not None:
+        queryset = queryset.filter(conference_id=conference_id)
+    if position is not None:
+        queryset = queryset.filter(keyset_filter((stamp_field, pk_field), position))
+    rows = list(queryset[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        # Lot tronqué : la suite est lue immédiatement
+        last = rows[-1]
+        return rows, (getattr(last, stamp_field), getattr(last, pk_field)), True
+    return rows, None, False
+
+
+def changes_since(token=None, conference_id=None, limit=None):
+    """
+    (sessions modifiées, identifiants supprimés, nouveau jeton, reste-t-il des changements).
+    """
+    limit = limit or getattr(settings, "SESSION_SYNC_PAGE_SIZE", 500)
+    now = timezone.now()
+    horizon = (now - timedelta(seconds=getattr(settings, "SESSION_SYNC_MARGIN_SECONDS", 30)), 0)
+    if token:
+        positions = decode_token(token)
+        retention = timedelta(days=getattr(settings, "SESSION_TOMBSTONE_RETENTION_DAYS", 90))
+        if positions["d"][0] < now - retention:
+            raise SyncExpired()
+    else:
+        positions = {"s": None, "d": horizon}
+
+    results = {}
+    has_more = False
+    for key in STREAMS:
+        rows, truncated_at, truncated = _read(key, positions[key], limit, conference_id)
+        results[key] = rows
+        # Position jamais au-delà de l'horizon (sans jamais reculer)
+        floor = max(positions[key] or horizon, horizon)
+        if truncated and truncated_at <= floor:
+            positions[key] = truncated_at
+            has_more = True
+        else:
+            # Fin du flux, ou lot tronqué au-delà de l'horizon : la suite (et les
+            # lignes déjà renvoyées) viendra quand l'horizon l'aura dépassée
+            positions[key] = floor
+    deleted = [tombstone.session_id for tombstone in results["d"]]
+    return results["s"], deleted, encode_token(positions), has_more
+
+
+def purge_tombstones(days=None):
+    days = days if days is not None else getattr(settings, "SESSION_TOMBSTONE_RETENTION_DAYS", 90)
+    deleted, _ = SessionTombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
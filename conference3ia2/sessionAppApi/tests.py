@@ -1,3 +1,400 @@
-from django.test import TestCase
+import io
+from unittest import mock
+from datetime import time, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Conferenceapp.models import ConferenceStats, Submission
+from Conferenceapp.testing import make_conference
+from Sessionapp.conflicts import conflicting_sessions
+from Sessionapp.models import Session, SessionTombstone
+from Userapp.models import User
+
+from .sync import decode_token, encode_token
+
+
+def make_session(conference, **kwargs):
+    values = {
+        "title": "Session",
+        "topic": "IA",
+        "room": "A1",
+        "session_day": conference.start_date,
+        "start_time": time(9, 0),
+        "end_time": time(10, 0),
+        "conference": conference,
+    }
+    values.update(kwargs)
+    return Session.objects.create(**values)
+
+
+class SessionConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="api", email="api@esprit.tn"))
+        self.conference = make_conference()
+        self.session = make_session(self.conference)
+
+    def test_list_answers_304_until_a_session_changes(self):
+        url = reverse("session-list")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        make_session(self.conference, title="Nouvelle", room="B2")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # La suppression d'une session existante ne change pas forcément
+        # MAX(updated_at), mais change les lignes de la page
+        etag = response["ETag"]
+        self.session.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @override_settings(SESSION_API_PAGE_SIZE=2)
+    def test_page_validators_cover_the_page_only(self):
+        for index in range(4):
+            make_session(self.conference, title=f"Plus tard {index}", start_time=time(11 + index), end_time=time(12 + index))
+        url = reverse("session-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        # Une seule requête, celle de la page (LIMIT 3) : ni COUNT ni MAX sur toute la sélection
+        self.assertEqual(len(queries), 1)
+        self.assertIn("LIMIT 3", queries[0]["sql"])
+        self.assertNotIn("COUNT(", queries[0]["sql"].upper())
+        etag = response["ETag"]
+
+        # Une session modifiée sur une autre page ne change pas la première
+        Session.objects.filter(title="Plus tard 3").update(title="Modifiée", updated_at=timezone.now())
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Une session de la page, si
+        Session.objects.filter(pk=self.session.pk).update(topic="Autre", updated_at=timezone.now())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # La page suivante a ses propres validateurs
+        next_page = self.client.get(response.json()["next"])
+        self.assertNotEqual(next_page["ETag"], response["ETag"])
+        self.assertEqual(self.client.get(response.json()["next"], HTTP_IF_NONE_MATCH=next_page["ETag"]).status_code, 304)
+
+    def test_retrieve_answers_304(self):
+        url = reverse("session-detail", args=[self.session.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(reverse("session-detail", args=["abc"])).status_code, 404)
+
+
+class SessionRoomConflictApiTests(TestCase):
+    def test_overlapping_session_is_a_400(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="planner", email="planner@esprit.tn"))
+        conference = make_conference()
+        make_session(conference)
+        payload = {
+            "title": "Chevauchement", "topic": "IA", "room": "A1", "session_day": conference.start_date,
+            "start_time": "09:30", "end_time": "10:30", "conference": conference.pk,
+        }
+        response = client.post(reverse("session-list"), payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("room", response.json())
+        payload["room"] = "B2"
+        self.assertEqual(client.post(reverse("session-list"), payload).status_code, 201)
+
+    def test_conflicts_are_checked_once_under_the_lock(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username="planner", email="planner@esprit.tn"))
+        conference = make_conference()
+        session = make_session(conference)
+        other = make_session(conference, room="B2")
+        payload = {
+            "title": "Nouvelle", "topic": "IA", "room": "A1", "session_day": conference.start_date,
+            "start_time": "10:00", "end_time": "11:00", "conference": conference.pk,
+        }
+        with mock.patch("Sessionapp.conflicts.conflicting_sessions", wraps=conflicting_sessions) as lookup:
+            self.assertEqual(client.post(reverse("session-list"), payload).status_code, 201)
+        self.assertEqual(lookup.call_count, 1)
+
+        # Conflit levé par Session.save() (seul contrôle, donc aussi en cas de course) : 400, pas 500
+        url = reverse("session-detail", args=[other.pk])
+        response = client.patch(url, {"room": "A1", "start_time": "09:30", "end_time": "10:30"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(session.title, response.json()["room"][0])
+
+
+class SessionListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="reader", email="reader@esprit.tn"))
+        self.conference = make_conference()
+        self.other = make_conference(name="Autre conférence")
+        self.url = reverse("session-list")
+
+    def add_sessions(self, count, conference=None):
+        conference = conference or self.conference
+        start = Session.objects.filter(conference=conference).count()
+        Session.objects.bulk_create([
+            Session(
+                title=f"Session {index}", topic="IA", room=f"R{index % 7}",
+                session_day=conference.start_date + timedelta(days=index % 3),
+                start_time=time(8 + index % 10, 0), end_time=time(9 + index % 10, 0), conference=conference,
+            )
+            for index in range(start, start + count)
+        ])
+
+    def walk(self, params, page_size):
+        keys = []
+        url, params = self.url, {**params, "page_size": page_size}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            keys.extend((row["session_day"], row["start_time"], row["session_id"]) for row in response.json()["results"])
+            url, params = response.json()["next"], None
+        return keys
+
+    def test_pages_follow_the_composite_order_without_gaps(self):
+        self.add_sessions(40)
+        keys = self.walk({}, 7)
+        self.assertEqual(len(keys), 40)
+        self.assertEqual(keys, sorted(keys))
+
+        # Retour en arrière depuis la deuxième page
+        first = self.client.get(self.url, {"page_size": 7}).json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(self.client.get(second["previous"]).json()["results"], first["results"])
+        self.assertIsNone(first["previous"])
+
+    def test_filters(self):
+        self.add_sessions(30)
+        self.add_sessions(10, conference=self.other)
+        day = self.conference.start_date
+        keys = self.walk({"conference": self.conference.pk, "session_day": day, "starts_after": "10:00"}, 4)
+        expected = Session.objects.filter(conference=self.conference, session_day=day, start_time__gte=time(10))
+        self.assertEqual(sorted(pk for _, _, pk in keys), sorted(expected.values_list("pk", flat=True)))
+        room = self.client.get(self.url, {"room": "R3", "conference": self.other.pk}).json()["results"]
+        self.assertEqual({row["room"] for row in room}, {"R3"})
+        self.assertEqual(self.client.get(self.url, {"session_day": "demain"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 404)
+
+    def test_page_cost_does_not_grow_with_the_table(self):
+        self.add_sessions(20)
+        cursor = self.client.get(self.url, {"page_size": 5}).json()["next"]
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(cursor)
+        self.add_sessions(500)
+        cursor = self.client.get(self.url, {"page_size": 5}).json()["next"]
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(cursor)
+        self.assertEqual(len(response.json()["results"]), 5)
+        self.assertEqual(len(large), len(small))
+        # Pas d'OFFSET : la page est lue à partir de la clé du curseur
+        self.assertFalse(any("OFFSET" in query["sql"] for query in large.captured_queries))
+
+
+class SessionBulkWriteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="tool", email="tool@esprit.tn"))
+        self.conference = make_conference()
+        self.kept = make_session(self.conference, title="Gardée", room="A1")
+        self.moved = make_session(self.conference, title="Déplacée", room="B2")
+        self.dropped = make_session(self.conference, title="Supprimée", room="C3")
+        self.url = reverse("session-bulk")
+
+    def item(self, **kwargs):
+        values = {
+            "title": "Nouvelle", "topic": "IA", "room": "D4", "session_day": str(self.conference.start_date),
+            "start_time": "09:00", "end_time": "10:00", "conference": self.conference.pk,
+        }
+        values.update(kwargs)
+        return values
+
+    def test_bulk_write_in_one_transaction(self):
+        payload = {
+            "create": [self.item(), self.item(title="Libérée", room="C3")] + [
+                self.item(title=f"Lot {hour}", room="E5", start_time=f"{hour}:00", end_time=f"{hour + 1}:00")
+                for hour in range(10, 16)
+            ],
+            "update": [{"session_id": self.moved.pk, "room": "A1", "start_time": "10:00", "end_time": "11:00"}],
+            "delete": [self.dropped.pk],
+        }
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["created"]), 8)
+        self.assertEqual(response.json()["deleted"], [self.dropped.pk])
+        self.moved.refresh_from_db()
+        self.assertEqual((self.moved.room, self.moved.start_time), ("A1", time(10, 0)))
+        self.assertFalse(Session.objects.filter(pk=self.dropped.pk).exists())
+        self.assertEqual(ConferenceStats.objects.get(conference=self.conference).sessions, 10)
+
+    def bulk_queries(self, count):
+        Session.objects.exclude(pk__in=[self.kept.pk, self.moved.pk, self.dropped.pk]).delete()
+        payload = {
+            "create": [self.item(title=f"Lot {index}", room=f"R{index}") for index in range(count)],
+            "update": [{"session_id": self.moved.pk, "title": f"Déplacée {count}"}],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+
+    def test_query_count_does_not_depend_on_the_number_of_items(self):
+        # Validation sans requête par élément : autant de requêtes pour 2 éléments que pour 50
+        self.assertEqual(self.bulk_queries(2), self.bulk_queries(50))
+
+    def test_moved_session_counts_for_both_conferences(self):
+        other = make_conference(name="Arrivée")
+        payload = {"update": [{"session_id": self.moved.pk, "conference": other.pk}]}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(ConferenceStats.objects.get(conference=self.conference).sessions, 2)
+        self.assertEqual(ConferenceStats.objects.get(conference=other).sessions, 1)
+
+    def test_any_invalid_item_writes_nothing(self):
+        payload = {
+            "create": [
+                self.item(),
+                self.item(room="A1"),  # chevauche « Gardée »
+                self.item(room="Z9", conference=999),
+                self.item(room="Y8", start_time="11:00", end_time="10:00"),
+                self.item(room="D4", title="Doublon du lot"),  # chevauche le premier élément
+            ],
+            "update": [{"session_id": 12345, "title": "x"}],
+            "delete": [self.dropped.pk],
+        }
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors["create"][0], {})
+        self.assertTrue(all(errors["create"][1:]))
+        self.assertIn("conference", errors["create"][2])
+        self.assertIn("session_id", errors["update"][0])
+        self.assertEqual(errors["delete"], [{}])
+        self.assertEqual(Session.objects.count(), 3)
+
+
+class ConferenceProgramTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="mobile", email="mobile@esprit.tn")
+        self.client.force_authenticate(self.user)
+        self.conference = make_conference()
+        second_day = self.conference.start_date + timedelta(days=1)
+        self.opening = make_session(self.conference, title="Ouverture", room="A1")
+        make_session(self.conference, title="Vision", room="B2")
+        make_session(self.conference, title="Graphes", room="A1", session_day=second_day)
+        Submission.objects.create(
+            title="Article", abstract="Résumé", keywords="ia", paper="paper/test.pdf", status="accepted",
+            user=self.user, conference=self.conference, session=self.opening,
+        )
+        self.url = reverse("conference-program", args=[self.conference.pk])
+
+    def get(self, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(self.url, **headers)
+
+    def test_program_grouped_by_day_and_room(self):
+        with self.assertNumQueries(3):
+            data = self.get().json()
+        self.assertEqual(data["name"], "Conférence test")
+        self.assertEqual([day["day"] for day in data["days"]], sorted(day["day"] for day in data["days"]))
+        first_day = data["days"][0]
+        self.assertEqual([room["room"] for room in first_day["rooms"]], ["A1", "B2"])
+        self.assertEqual(first_day["rooms"][0]["sessions"][0]["papers"][0]["title"], "Article")
+        self.assertEqual(self.client.get(reverse("conference-program", args=[999])).status_code, 404)
+
+    def test_cached_until_a_session_or_the_conference_changes(self):
+        etag = self.get()["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get().status_code, 200)
+            self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.opening.title = "Séance d'ouverture"
+            self.opening.save()
+        data = self.get().json()
+        self.assertEqual(data["days"][0]["rooms"][0]["sessions"][0]["title"], "Séance d'ouverture")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.conference.location = "Sousse"
+            self.conference.save()
+        self.assertEqual(self.get().json()["location"], "Sousse")
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+@override_settings(SESSION_SYNC_MARGIN_SECONDS=0)
+class SessionSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="sync", email="sync@esprit.tn"))
+        self.conference = make_conference()
+        self.sessions = [make_session(self.conference, title=f"S{index}", room=f"R{index}") for index in range(5)]
+        self.url = reverse("session-changes")
+
+    def sync(self, since=None, **params):
+        changed, deleted = [], []
+        while True:
+            data = self.client.get(self.url, {**params, **({"since": since} if since else {})}).json()
+            changed += [row["session_id"] for row in data["changed"]]
+            deleted += data["deleted"]
+            since = data["since"]
+            if not data["has_more"]:
+                return changed, deleted, since
+
+    def test_only_changes_and_deletions_since_the_token(self):
+        changed, deleted, token = self.sync()
+        self.assertEqual(sorted(changed), sorted(session.pk for session in self.sessions))
+
+        self.sessions[1].title = "Modifiée"
+        self.sessions[1].save()
+        removed = self.sessions[2].pk
+        self.sessions[2].delete()
+        changed, deleted, token = self.sync(token)
+        self.assertEqual((changed, deleted), ([self.sessions[1].pk], [removed]))
+
+        with self.assertNumQueries(2):
+            data = self.client.get(self.url, {"since": token}).json()
+        self.assertEqual((data["changed"], data["deleted"]), ([], []))
+
+    @override_settings(SESSION_SYNC_PAGE_SIZE=2)
+    def test_large_changes_are_split_without_loss(self):
+        hour_ago = timezone.now() - timedelta(hours=1)
+        token = encode_token({"s": (hour_ago - timedelta(minutes=1), 0), "d": (hour_ago - timedelta(minutes=1), 0)})
+        # Modifications hors de la marge : le flux est découpé en lots successifs
+        Session.objects.filter(pk__in=[s.pk for s in self.sessions]).update(updated_at=hour_ago)
+        Session.objects.filter(pk=self.sessions[0].pk).delete()
+        changed, deleted, _ = self.sync(token)
+        self.assertEqual(sorted(changed), sorted(s.pk for s in self.sessions[1:]))
+        self.assertEqual(deleted, [self.sessions[0].pk])
+
+    @override_settings(SESSION_SYNC_PAGE_SIZE=2, SESSION_SYNC_MARGIN_SECONDS=30)
+    def test_truncated_position_does_not_pass_the_horizon(self):
+        # Cinq sessions toutes récentes : le lot est tronqué dans la marge
+        data = self.client.get(self.url).json()
+        self.assertEqual(len(data["changed"]), 2)
+        self.assertFalse(data["has_more"])
+        position = decode_token(data["since"])["s"]
+        self.assertLessEqual(position[0], timezone.now() - timedelta(seconds=30))
+
+        # Écriture lente validée après coup, datée d'avant les lignes déjà lues : pas perdue
+        late = make_session(self.conference, title="Lente", room="Z1")
+        Session.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(seconds=10))
+        with override_settings(SESSION_SYNC_MARGIN_SECONDS=0):
+            changed, _, _ = self.sync(data["since"])
+        self.assertIn(late.pk, changed)
+        self.assertEqual(set(changed), {late.pk, *(s.pk for s in self.sessions)})
+
+    def test_invalid_or_expired_token(self):
+        self.assertEqual(self.client.get(self.url, {"since": "xyz"}).status_code, 404)
+        old = timezone.now() - timedelta(days=365)
+        self.assertEqual(self.client.get(self.url, {"since": encode_token({"s": (old, 0), "d": (old, 0)})}).status_code, 410)
+        self.sessions[0].delete()
+        SessionTombstone.objects.update(deleted_at=old)
+        call_command("purge_session_tombstones", stdout=io.StringIO())
+        self.assertFalse(SessionTombstone.objects.exists())
@@ -1,5 +1,5 @@
 from rest_framework.routers import DefaultRouter
-from .views import SessionViewSet
+from .views import ConferenceProgramView, SessionViewSet
 from django.urls import path, include
 
 router = DefaultRouter()
@@ -7,5 +7,6 @@ router.register('sessions', SessionViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('conferences/<int:pk>/program/', ConferenceProgramView.as_view(), name='conference-program'),
     
 ]
@@ -1,8 +1,81 @@
 from django.shortcuts import render 
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from Conferenceapp.conditional import ConditionalViewSetMixin, ValidatorsMixin, validators_from_stamp
+from Sessionapp.conflicts import RoomConflict
 from Sessionapp.models import Session
+from .bulk import bulk_write
+from .filters import SessionFilterBackend
+from .pagination import KeysetCursorPagination
+from .program import get_program
+from .sync import changes_since
 from .serializers import SessionSerializer
 
-class SessionViewSet(viewsets.ModelViewSet):
-    queryset = Session.objects.all()
+class SessionViewSet(ConditionalViewSetMixin, viewsets.ModelViewSet):
+    # ETag / Last-Modified sur list et retrieve : 304 pour les clients déjà à jour
+    # Filtres côté serveur et pages par curseur ordonnées par (jour, début, id)
+    queryset = Session.objects.order_by("session_day", "start_time", "session_id")
     serializer_class = SessionSerializer
+    filter_backends = [SessionFilterBackend]
+    pagination_class = KeysetCursorPagination
+
+    # Salle déjà occupée : Session.save() contrôle le créneau sous le verrou de la
+    # conférence (une requête) ; le conflit devient un 400, y compris en cas de course
+    def _save(self, serializer):
+        try:
+            serializer.save()
+        except RoomConflict as e:
+            raise ValidationError({"room": e.messages})
+
+    def perform_create(self, serializer):
+        self._save(serializer)
+
+    def perform_update(self, serializer):
+        self._save(serializer)
+
+    # Synchronisation incrémentale : changements depuis le jeton ?since= (voir sync.py)
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        conference = request.query_params.get("conference")
+        try:
+            conference_id = int(conference) if conference else None
+        except ValueError:
+            raise ValidationError({"conference": ["Identifiant de conférence attendu."]})
+        sessions, deleted, token, has_more = changes_since(request.query_params.get("since"), conference_id)
+        return Response({
+            "changed": self.get_serializer(sessions, many=True).data,
+            "deleted": deleted,
+            "since": token,
+            "has_more": has_more,
+        })
+
+    # Création / modification / suppression en masse, en une transaction (voir bulk.py)
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        report = bulk_write(request.data)
+        return Response(
+            {
+                "created": self.get_serializer(report.created, many=True).data,
+                "updated": self.get_serializer(report.updated, many=True).data,
+                "deleted": report.deleted,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ConferenceProgramView(ValidatorsMixin, APIView):
+    # Programme complet (sessions par jour et par salle) servi depuis le cache (voir program.py)
+
+    def get_etag_extra(self):
+        # Même programme pour tous les utilisateurs
+        return [self.request.get_full_path(), self.request.accepted_renderer.format]
+
+    def get(self, request, pk):
+        program, version = get_program(pk)
+        not_modified = self.not_modified_response(request, validators_from_stamp(version, *self.get_etag_extra()))
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(Response(program))